@@ -0,0 +1,161 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Runs the benchmark suite and appends the results as one JSON line to
+# output/history.jsonl. Every case runs seeded in its own process, so the
+# peak resident memory of the case can be measured; the import time of a
+# strategy module is measured in a fresh interpreter. The best of repeats
+# runs counts, which makes the metrics far less noisy. Compare the runs of
+# the history with compare.py.
+#
+# usage: python benchmark.py [quick|full] [label]
+
+from sys import path, argv, executable
+path.append("../../../..")
+
+import sys
+import json
+import socket
+import platform
+from time import time, strftime
+from os import devnull, mkdir
+from os.path import exists, abspath
+from subprocess import check_output, CalledProcessError
+from resource import getrusage, RUSAGE_SELF
+from multiprocessing import Process, Queue
+from numpy import median, diff
+from numpy.random import seed
+
+from evopy.simulators.simulator import Simulator
+from evopy.operators.termination.generations import Generations
+
+from setup import *
+
+IMPORT_REPEATS = 3
+ROOT = abspath("../../../..")
+
+profile = 'quick'
+if len(argv) > 1:
+    profile = argv[1]
+label = profile
+if len(argv) > 2:
+    label = argv[2]
+
+class Timed(object):
+    """ termination which records the time of every generation """
+
+    def __init__(self, termination):
+        self.termination = termination
+        self.times = [time()]
+
+    def terminate(self, best_fitness, generations, simulator = None):
+        self.times.append(time())
+        return self.termination.terminate(best_fitness, generations,\
+            simulator)
+
+def run(strategy, problem, N, lambd, queue):
+    seed(0)
+    optimizer = strategies[strategy][0](N, lambd)
+    termination = Timed(Generations(generations))
+    simulator = Simulator(optimizer, problems[problem](N), termination)
+
+    # the simulator prints every generation
+    stdout, sys.stdout = sys.stdout, open(devnull, "w")
+    try:
+        termination.times = [time()]
+        simulator.simulate()
+    finally:
+        sys.stdout = stdout
+
+    logs = simulator.logger.all()
+    seconds = termination.times[-1] - termination.times[0]
+    evaluations = sum(logs['count_ffc']) + sum(logs['count_cfc'])
+
+    # ru_maxrss is in kilobytes on linux
+    queue.put({\
+        'seconds_per_generation' : median(diff(termination.times)),
+        'evaluations_per_second' : evaluations / seconds,
+        'peak_rss_bytes' : getrusage(RUSAGE_SELF).ru_maxrss * 1024})
+
+def measure(strategy, problem, N, lambd):
+    """ best of repeats runs, each metric on its own """
+    runs = []
+    for i in range(repeats):
+        queue = Queue()
+        process = Process(target = run,\
+            args = (strategy, problem, N, lambd, queue))
+        process.start()
+        runs.append(queue.get())
+        process.join()
+
+    best = lambda metric : max if metrics[metric] else min
+    return dict([(metric, best(metric)([r[metric] for r in runs]))\
+        for metric in runs[0].keys()])
+
+def import_seconds(module):
+    """ fastest of IMPORT_REPEATS imports in a fresh interpreter """
+    code = "import sys, time; sys.path.insert(0, %r); start = time.time();"\
+        " import %s; print time.time() - start" % (ROOT, module)
+    return min([float(check_output([executable, "-c", code]).split()[-1])\
+        for i in range(IMPORT_REPEATS)])
+
+def commit():
+    try:
+        return check_output(["git", "rev-parse", "--short", "HEAD"],\
+            cwd = ROOT).strip()
+    except (CalledProcessError, OSError):
+        return None
+
+dimensions, lambdas = profiles[profile]
+results = []
+
+imported = [strategies[strategy][1] for strategy in sorted(strategies)]
+for module in imported + modules:
+    seconds = import_seconds(module)
+    results.append({'case' : 'import ' + module, 'import_seconds' : seconds})
+    print "import %s: %.3f s" % (module, seconds)
+
+for strategy in sorted(strategies.keys()):
+    for problem in sorted(problems.keys()):
+        for N in dimensions:
+            for lambd in lambdas:
+                result = measure(strategy, problem, N, lambd)
+                result['case'] = "%s %s N=%d lambda=%d" %\
+                    (strategy, problem, N, lambd)
+                results.append(result)
+                print "%s: %.4f s/generation, %.0f evaluations/s, "\
+                    "peak rss %.1f MB" % (result['case'],\
+                    result['seconds_per_generation'],\
+                    result['evaluations_per_second'],\
+                    result['peak_rss_bytes'] / 1e6)
+
+if not exists("output/"):
+    mkdir("output/")
+
+history = open("output/history.jsonl", "a")
+history.write(json.dumps({\
+    'label' : label,
+    'profile' : profile,
+    'time' : strftime("%Y-%m-%d %H:%M:%S"),
+    'commit' : commit(),
+    'host' : socket.gethostname(),
+    'python' : platform.python_version(),
+    'generations' : generations,
+    'results' : results}) + "\n")
+history.close()
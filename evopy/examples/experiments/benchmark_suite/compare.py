@@ -0,0 +1,85 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Compares two runs of output/history.jsonl, the last but one and the last
+# run by default, and flags every metric of a case which is worse by more
+# than the threshold, relative to the baseline. Exits with status 1 if
+# there is a regression, so it can gate a change.
+#
+# usage: python compare.py [threshold [baseline [current]]]
+#        baseline and current are run indices (negative from the end) or
+#        labels, the last run with the label is taken
+
+from sys import path, argv, exit
+path.append("../../../..")
+
+import json
+
+from setup import metrics
+
+threshold = 0.3
+if len(argv) > 1:
+    threshold = float(argv[1])
+
+runs = [json.loads(line) for line in open("output/history.jsonl")\
+    if line.strip()]
+
+def find(run):
+    try:
+        return runs[int(run)]
+    except ValueError:
+        return [r for r in runs if r['label'] == run][-1]
+
+if(len(argv) < 3 and len(runs) < 2):
+    print "at least two runs are needed"
+    exit(0)
+
+baseline = find(argv[2] if len(argv) > 2 else -2)
+current = find(argv[3] if len(argv) > 3 else -1)
+
+def change(metric, old, new):
+    """ relative change, positive if new is worse """
+    if(old == 0):
+        return 0.0
+    relative = (new - old) / float(old)
+    return -relative if metrics[metric] else relative
+
+print "baseline: %s %s (%s), current: %s %s (%s)" %\
+    (baseline['label'], baseline['time'], baseline['commit'],\
+    current['label'], current['time'], current['commit'])
+
+old_cases = dict([(r['case'], r) for r in baseline['results']])
+regressions = 0
+for result in current['results']:
+    old = old_cases.get(result['case'])
+    if(old == None):
+        continue
+    for metric in sorted(metrics.keys()):
+        if(not metric in result or not metric in old):
+            continue
+        worse = change(metric, old[metric], result[metric])
+        flag = ""
+        if(worse > threshold):
+            flag = "REGRESSION"
+            regressions += 1
+        print "%-45s %-24s %12.6g %12.6g %+7.1f%% %s" % (result['case'],\
+            metric, old[metric], result[metric], -100.0 * worse, flag)
+
+print "%d regressions beyond %.0f%%" % (regressions, 100 * threshold)
+exit(1 if regressions > 0 else 0)
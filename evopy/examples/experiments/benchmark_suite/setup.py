@@ -0,0 +1,161 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Cases of the benchmark suite: strategies, problems, dimensions and lambda.
+# Every strategy is built for the dimension N and the offspring number
+# lambd, starting at 10 in every coordinate like the other experiments.
+
+from sys import path
+path.append("../../../..")
+
+from numpy import matrix, ones
+
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.cmaes_svc import CMAESSVC
+from evopy.strategies.cmaes_rsvc import CMAESRSVC
+from evopy.strategies.ori_dses import ORIDSES
+from evopy.strategies.ori_dses_aligned_svc import ORIDSESAlignedSVC
+
+from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
+from evopy.problems.tr_problem import TRProblem
+
+from evopy.metamodel.cma_svc_linear_meta_model import CMASVCLinearMetaModel
+from evopy.metamodel.rsvc_linear_meta_model import RSVCLinearMetaModel
+from evopy.metamodel.dses_svc_linear_meta_model import DSESSVCLinearMetaModel
+from sklearn.cross_validation import KFold
+from evopy.operators.scaling.scaling_standardscore import ScalingStandardscore
+from evopy.metamodel.cv.svc_cv_sklearn_grid_linear import SVCCVSkGridLinear
+
+generations = 20
+sigma = 4.5
+
+# every case runs repeats times, the best run counts
+repeats = 3
+
+# profile: (dimensions, lambdas)
+profiles = {\
+    'quick' : ([2, 10], [20]),
+    'full' : ([2, 10, 100, 1000], [20, 100])}
+
+def mu_of(lambd):
+    return max(2, int(0.15 * lambd))
+
+def start(N):
+    return matrix(10.0 * ones(N))
+
+def get_crossvalidation():
+    return SVCCVSkGridLinear(\
+        C_range = [2 ** i for i in range(-3, 14, 2)],
+        cv_method = KFold(20, 5))
+
+def get_cmaes(N, lambd):
+    return CMAES(\
+        mu = mu_of(lambd),
+        lambd = lambd,
+        xmean = start(N),
+        sigma = sigma)
+
+def get_cmaes_svc(N, lambd):
+    meta_model = CMASVCLinearMetaModel(\
+        window_size = 10,
+        scaling = ScalingStandardscore(),
+        crossvalidation = get_crossvalidation(),
+        repair_mode = 'none')
+
+    return CMAESSVC(\
+        mu = mu_of(lambd),
+        lambd = lambd,
+        xmean = start(N),
+        sigma = sigma,
+        beta = 0.80,
+        meta_model = meta_model)
+
+def get_cmaes_rsvc(N, lambd):
+    meta_model = RSVCLinearMetaModel(\
+        window_size = 10,
+        scaling = ScalingStandardscore(),
+        crossvalidation = get_crossvalidation(),
+        repair_mode = 'none')
+
+    return CMAESRSVC(\
+        mu = mu_of(lambd),
+        lambd = lambd,
+        xmean = start(N),
+        sigma = sigma,
+        beta = 0.80,
+        meta_model = meta_model)
+
+def get_dses(N, lambd):
+    return ORIDSES(\
+        mu = mu_of(lambd),
+        lambd = lambd,
+        theta = 0.3,
+        pi = 15,
+        initial_sigma = matrix(sigma * ones(N)),
+        delta = sigma,
+        tau0 = 0.5,
+        tau1 = 0.6,
+        initial_pos = start(N))
+
+def get_dses_svc(N, lambd):
+    meta_model = DSESSVCLinearMetaModel(\
+        window_size = 10,
+        scaling = ScalingStandardscore(),
+        crossvalidation = get_crossvalidation(),
+        repair_mode = 'none')
+
+    return ORIDSESAlignedSVC(\
+        mu = mu_of(lambd),
+        lambd = lambd,
+        theta = 0.3,
+        pi = 70,
+        initial_sigma = matrix(sigma * ones(N)),
+        delta = sigma,
+        tau0 = 0.5,
+        tau1 = 0.6,
+        initial_pos = start(N),
+        beta = 0.95,
+        meta_model = meta_model)
+
+# name: (factory, module measured by the import time)
+strategies = {\
+    'CMAES' : (get_cmaes, 'evopy.strategies.cmaes'),
+    'CMAESSVC' : (get_cmaes_svc, 'evopy.strategies.cmaes_svc'),
+    'CMAESRSVC' : (get_cmaes_rsvc, 'evopy.strategies.cmaes_rsvc'),
+    'ORIDSES' : (get_dses, 'evopy.strategies.ori_dses'),
+    'ORIDSESAlignedSVC' :\
+        (get_dses_svc, 'evopy.strategies.ori_dses_aligned_svc')}
+
+# further modules measured by the import time, the startup of a sweep
+modules = [\
+    'evopy.simulators.simulator',
+    'evopy.simulators.executor',
+    'evopy.simulators.results',
+    'evopy.external.playdoh']
+
+problems = {\
+    'TR' : TRProblem,
+    'SphereR1' : SphereProblemOriginR1}
+
+# metric: True if larger values are better
+metrics = {\
+    'seconds_per_generation' : False,
+    'evaluations_per_second' : True,
+    'peak_rss_bytes' : False,
+    'import_seconds' : False}
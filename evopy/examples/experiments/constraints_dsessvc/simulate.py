@@ -28,6 +28,7 @@ from evopy.strategies.ori_dses_svc_repair import ORIDSESSVCR
 from evopy.strategies.ori_dses_svc import ORIDSESSVC
 from evopy.strategies.ori_dses import ORIDSES
 from evopy.simulators.simulator import Simulator
+from evopy.simulators.results import Results
 from evopy.external.playdoh import map as pmap
 
 from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
@@ -60,13 +61,14 @@ for problem in problems:
         simulators_op.append(simulator)
     simulators[problem] = simulators_op
 
-simulate = lambda simulator : simulator.simulate()
+compact = Results(['count_cfc'])
+simulate = lambda simulator : compact(simulator)
 
 # run simulators 
 for problem in problems:
-    resulting_simulators = pmap(simulate, simulators[problem])
-    for simulator in resulting_simulators:
-        cfcs[problem].append(simulator.logger.all()['count_cfc'])
+    results = pmap(simulate, simulators[problem])
+    for result in results:
+        cfcs[problem].append(result['count_cfc'])
 
 if not exists("output/"): 
     mkdir("output/")
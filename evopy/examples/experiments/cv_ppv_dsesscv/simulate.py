@@ -28,6 +28,7 @@ from evopy.strategies.ori_dses_svc_repair import ORIDSESSVCR
 from evopy.strategies.ori_dses_svc import ORIDSESSVC
 from evopy.strategies.ori_dses import ORIDSES
 from evopy.simulators.simulator import Simulator
+from evopy.simulators.results import Results
 from evopy.external.playdoh import map as pmap
 
 from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
@@ -60,15 +61,16 @@ for problem in problems:
             simulators_op.append(simulator)
         simulators[problem][optimizer] = simulators_op
 
-simulate = lambda simulator : simulator.simulate()
+compact = Results(['optimizer.ppv', 'optimizer.meta_model.best_acc'])
+simulate = lambda simulator : compact(simulator)
 
 # run simulators 
 for problem in problems:
     for optimizer, simulators_ in simulators[problem].iteritems():
-        resulting_simulators = pmap(simulate, simulators_)
-        for simulator in resulting_simulators:
-            precision = simulator.optimizer.logger.all()['ppv']
-            cv_accuracy = simulator.optimizer.meta_model.logger.all()['best_acc']
+        results = pmap(simulate, simulators_)
+        for result in results:
+            precision = result['optimizer.ppv']
+            cv_accuracy = result['optimizer.meta_model.best_acc']
             precisions[problem][optimizer].append(precision)
             cv_accuracies[problem][optimizer].append(cv_accuracy)
 
@@ -0,0 +1,103 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Memory and time per generation of the dense CMAES, the separable CMAES and
+# LMMAES on the sphere for an increasing number of dimensions. Every run
+# happens in its own process, so its peak resident memory can be measured.
+# The dense CMAES is only run up to DENSE_MAX dimensions, its eigen
+# decomposition takes minutes per generation for 10^4 dimensions.
+#
+# usage: python simulate.py [dimensions ...]
+
+from sys import path, argv
+path.append("../../../..")
+
+import csv
+from time import time
+from resource import getrusage, RUSAGE_SELF
+from multiprocessing import Process, Queue
+from numpy import matrix, ndarray, ones, log
+
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.lm_maes import LMMAES
+
+from os.path import exists
+from os import mkdir
+
+GENERATIONS = 10
+DENSE_MAX = 1000
+DIMENSIONS = [100, 1000, 10000]
+if len(argv) > 1:
+    DIMENSIONS = map(int, argv[1:])
+
+def lambd_of(N):
+    return 4 + int(3 * log(N))
+
+optimizers = {
+    'cmaes' : lambda N :\
+        CMAES(lambd_of(N) / 2, lambd_of(N), matrix(ones(N)), 1.0),
+    'sep-cmaes' : lambda N :\
+        CMAES(lambd_of(N) / 2, lambd_of(N), matrix(ones(N)), 1.0,\
+        separable = True),
+    'lmmaes' : lambda N :\
+        LMMAES(lambd_of(N) / 2, lambd_of(N), matrix(ones(N)), 1.0)}
+
+def state_bytes(optimizer):
+    """ bytes of the numpy arrays held by the optimizer """
+    return sum([v.nbytes for v in optimizer.__dict__.values()\
+        if isinstance(v, ndarray)])
+
+def run(name, N, queue):
+    optimizer = optimizers[name](N)
+    start = time()
+    for generation in range(GENERATIONS):
+        while(not optimizer.tell_feasibility(\
+            [(s, True) for s in optimizer.ask_pending_solutions()])):
+            pass
+        optimizer.tell_fitness([(s, float((s.getA1() ** 2).sum()))\
+            for s in optimizer.ask_valid_solutions()])
+    duration = (time() - start) / GENERATIONS
+
+    # ru_maxrss is in kilobytes on linux
+    rss = getrusage(RUSAGE_SELF).ru_maxrss * 1024
+    queue.put((duration, state_bytes(optimizer), rss,\
+        optimizer.logger.all()['best_fitness'][-1]))
+
+def measure(name, N):
+    queue = Queue()
+    process = Process(target = run, args = (name, N, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+if not exists("output/"):
+    mkdir("output/")
+
+writer = csv.writer(open("output/dimension.csv", "w"))
+writer.writerow(["optimizer", "dimensions", "seconds_per_generation",\
+    "state_bytes", "peak_rss_bytes", "best_fitness"])
+for N in DIMENSIONS:
+    for name in ['cmaes', 'sep-cmaes', 'lmmaes']:
+        if(name == 'cmaes' and N > DENSE_MAX):
+            continue
+        duration, state, rss, best_fitness = measure(name, N)
+        writer.writerow([name, N, duration, state, rss, best_fitness])
+        print "%s N=%d: %.4f s/generation, state %.1f MB, peak rss %.1f MB" %\
+            (name, N, duration, state / 1e6, rss / 1e6)
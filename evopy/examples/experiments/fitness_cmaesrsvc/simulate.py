@@ -25,6 +25,7 @@ from copy import deepcopy
 from numpy import matrix, log10
 
 from evopy.simulators.simulator import Simulator
+from evopy.simulators.results import Results
 from evopy.operators.termination.or_combinator import ORCombinator
 from evopy.operators.termination.accuracy import Accuracy
 from evopy.operators.termination.generations import Generations
@@ -45,14 +46,15 @@ for problem in problems:
             simulators_op.append(simulator)
         simulators[problem][optimizer] = simulators_op
 
-simulate = lambda simulator : simulator.simulate()
+compact = Results(['optimizer.best_fitness'])
+simulate = lambda simulator : compact(simulator)
 
 # run simulators 
 for problem in problems:
     for optimizer, simulators_ in simulators[problem].iteritems():
-        resulting_simulators = pmap(simulate, simulators_)
-        for simulator in resulting_simulators:
-            fitness = simulator.optimizer.logger.all()['best_fitness']
+        results = pmap(simulate, simulators_)
+        for result in results:
+            fitness = result['optimizer.best_fitness']
             fitnesses[problem][optimizer].append(fitness)
 
 if not exists("output/"): 
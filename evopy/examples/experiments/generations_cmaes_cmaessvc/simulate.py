@@ -25,6 +25,7 @@ from copy import deepcopy
 from numpy import matrix, log10
 
 from evopy.simulators.simulator import Simulator
+from evopy.simulators.results import Results
 from evopy.operators.termination.or_combinator import ORCombinator
 from evopy.operators.termination.accuracy import Accuracy
 from evopy.operators.termination.generations import Generations
@@ -47,14 +48,15 @@ for problem in problems:
             simulators_op.append(simulator)
         simulators[problem][optimizer] = simulators_op
 
-simulate = lambda simulator : simulator.simulate()
+compact = Results(['generations'])
+simulate = lambda simulator : compact(simulator)
 
 # run simulators 
 for problem in problems:
     for optimizer, simulators_ in simulators[problem].iteritems():
-        resulting_simulators = pmap(simulate, simulators_)
-        for simulator in resulting_simulators:
-            generation = simulator.logger.all()['generations']
+        results = pmap(simulate, simulators_)
+        for result in results:
+            generation = result['generations']
             generations[problem][optimizer].append(generation)
 
 if not exists("output/"): 
@@ -0,0 +1,79 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Wall time of a sweep of independent Simulators run serially, with
+# playdoh's map, and with the thread, fork and auto modes of Executor.
+# The jobs are the DSES and the DSES with SVC meta model on TR.
+#
+# usage: python executors.py [runs [generations]]
+
+from sys import path, argv
+path.append("../../../..")
+
+import sys
+import csv
+from time import time
+from os import devnull
+
+from evopy.simulators.simulator import Simulator
+from evopy.simulators.executor import Executor
+from evopy.external.playdoh import map as pmap
+from evopy.problems.tr_problem import TRProblem
+from evopy.operators.termination.generations import Generations
+
+from setup import get_method_TR, get_method_TR_svc
+
+RUNS = 8
+GENERATIONS = 20
+if len(argv) > 1:
+    RUNS = int(argv[1])
+if len(argv) > 2:
+    GENERATIONS = int(argv[2])
+
+def simulators():
+    return [Simulator(optimizer(), TRProblem(), Generations(GENERATIONS))\
+        for optimizer in [get_method_TR, get_method_TR_svc] * (RUNS / 2)]
+
+def simulate(simulator):
+    return simulator.simulate()
+
+executors = [\
+    ('serial', lambda jobs : map(simulate, jobs)),
+    ('playdoh', lambda jobs : pmap(simulate, jobs)),
+    ('thread', lambda jobs : Executor('thread').map(simulate, jobs)),
+    ('fork', lambda jobs : Executor('fork').map(simulate, jobs)),
+    ('auto', lambda jobs : Executor('auto').map(simulate, jobs))]
+
+writer = csv.writer(open("output/executors.csv", "w"))
+writer.writerow(["executor", "runs", "generations", "seconds"])
+for name, run in executors:
+    jobs = simulators()
+
+    # the simulators print every generation
+    stdout, sys.stdout = sys.stdout, open(devnull, "w")
+    try:
+        start = time()
+        results = run(jobs)
+        duration = time() - start
+    finally:
+        sys.stdout = stdout
+
+    assert all([r._generations >= GENERATIONS for r in results])
+    writer.writerow([name, RUNS, GENERATIONS, duration])
+    print "%-8s %d runs: %.2f s" % (name, RUNS, duration)
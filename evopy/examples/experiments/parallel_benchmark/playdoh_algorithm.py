@@ -0,0 +1,75 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Fitness evaluations per second of an evopy strategy running as a playdoh
+# optimization algorithm, for an increasing number of nodes on a local
+# server. The fitness function sleeps to emulate an expensive evaluation.
+
+from sys import path, argv
+path.append("../../../..")
+
+import csv
+from time import time, sleep
+from multiprocessing import Process
+from numpy import array
+
+from evopy.external.playdoh import minimize, open_server, close_servers
+from evopy.simulators.strategy_algorithm import StrategyAlgorithm
+from evopy.problems.tr_problem import TRProblem
+
+from setup import get_method_TR
+
+PORT = 2720
+ITERATIONS = 10
+NODES = [1, 2, 4]
+if len(argv) > 1:
+    NODES = map(int, argv[1:])
+
+def fitness(x, delay = 0.01):
+    sleep(delay * x.shape[1])
+    return (x ** 2).sum(axis = 0)
+
+def throughput(nodes):
+    server = Process(target = open_server, args = (PORT, nodes, 0))
+    server.start()
+    sleep(1.0)
+
+    machines = [('localhost', PORT)]
+    start = time()
+    result = minimize(fitness,
+        popsize = 100,
+        maxiter = ITERATIONS,
+        algorithm = StrategyAlgorithm,
+        optparams = {'strategy' : get_method_TR(), 'problem' : TRProblem()},
+        initrange = array([[-10.0, 10.0], [-10.0, 10.0]]),
+        machines = machines,
+        returninfo = True)
+    duration = time() - start
+
+    close_servers(machines)
+    server.join()
+    return result.info['count_ffc'] / duration, result.best_fit
+
+writer = csv.writer(open("output/playdoh_algorithm.csv", "w"))
+writer.writerow(["nodes", "evaluations_per_second", "best_fitness"])
+for nodes in NODES:
+    evaluations, best_fitness = throughput(nodes)
+    writer.writerow([nodes, evaluations, best_fitness])
+    print "nodes %d: %.1f evaluations/s, best fitness %f" %\
+        (nodes, evaluations, best_fitness)
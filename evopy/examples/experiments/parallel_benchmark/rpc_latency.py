@@ -0,0 +1,73 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Latency of many small playdoh map calls against an already running local
+# server, with and without the persistent connection pool.
+
+from sys import path, argv
+path.append("../../../..")
+
+import csv
+from time import time, sleep
+from multiprocessing import Process
+from numpy import array, median
+
+from evopy.external.playdoh import map as pmap
+from evopy.external.playdoh import open_server, close_servers
+from evopy.external.playdoh.baserpc import CONNECTIONS
+
+PORT = 2719
+CALLS = 50
+if len(argv) > 1:
+    CALLS = int(argv[1])
+
+def square(x):
+    return x * x
+
+def latencies(calls):
+    machines = [('localhost', PORT)]
+    pmap(square, [0], machines = machines)
+    times = []
+    for i in range(calls):
+        start = time()
+        pmap(square, [i], machines = machines)
+        times.append(time() - start)
+    return array(times)
+
+server = Process(target = open_server, args = (PORT, 1, 0))
+server.start()
+sleep(1.0)
+
+results = {}
+for pooled in [False, True]:
+    CONNECTIONS.enabled = pooled
+    CONNECTIONS.clear()
+    results[pooled] = latencies(CALLS)
+
+close_servers([('localhost', PORT)])
+server.join()
+
+writer = csv.writer(open("output/rpc_latency.csv", "w"))
+writer.writerow(["pooled", "mean", "median", "min", "max"])
+for pooled in [False, True]:
+    times = results[pooled]
+    row = [pooled, times.mean(), median(times), times.min(), times.max()]
+    writer.writerow(row)
+    print "pooled=%-5s mean %.4fs median %.4fs min %.4fs max %.4fs" %\
+        tuple(row)
@@ -0,0 +1,138 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+# Convergence of CMAES, the separable CMAES and CMAESSVC on the bundled
+# problems with a float64 and a float32 Simulator. Both precisions run with
+# the same seeds, the generations until the accuracy is reached, the best
+# fitness and the pickled size of the logged optimizer state are compared.
+#
+# usage: python simulate.py [samples]
+
+import sys
+from sys import path, argv
+path.append("../../../..")
+
+import csv
+from cPickle import dumps
+from numpy import matrix, float32, float64, median
+from numpy.random import seed
+
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.cmaes_svc import CMAESSVC
+from evopy.simulators.simulator import Simulator
+
+from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
+from evopy.problems.sphere_problem_origin_r2 import SphereProblemOriginR2
+from evopy.problems.schwefels_problem_26 import SchwefelsProblem26
+from evopy.problems.tr_problem import TRProblem
+
+from evopy.metamodel.cma_svc_linear_meta_model import CMASVCLinearMetaModel
+from sklearn.cross_validation import KFold
+from evopy.operators.scaling.scaling_standardscore import ScalingStandardscore
+from evopy.metamodel.cv.svc_cv_sklearn_grid_linear import SVCCVSkGridLinear
+
+from evopy.operators.termination.or_combinator import ORCombinator
+from evopy.operators.termination.accuracy import Accuracy
+from evopy.operators.termination.generations import Generations
+
+from os.path import exists
+from os import mkdir, devnull
+
+samples = 10
+if len(argv) > 1:
+    samples = int(argv[1])
+
+accuracy = 10**(-12)
+max_generations = 500
+
+# initial xmean and sigma of the problems
+starts = {\
+    TRProblem: (matrix([[10.0, 10.0]]), 4.5),
+    SphereProblemOriginR1: (matrix([[10.0, 10.0]]), 5.0),
+    SphereProblemOriginR2: (matrix([[10.0, 10.0]]), 5.0),
+    SchwefelsProblem26: (matrix([[100.0, 100.0]]), 36.0)}
+
+def get_cmaes(xmean, sigma):
+    return CMAES(mu = 15, lambd = 100, xmean = xmean, sigma = sigma)
+
+def get_sep_cmaes(xmean, sigma):
+    return CMAES(mu = 15, lambd = 100, xmean = xmean, sigma = sigma,\
+        separable = True)
+
+def get_cmaes_svc(xmean, sigma):
+    sklearn_cv = SVCCVSkGridLinear(\
+        C_range = [2 ** i for i in range(-3, 14, 2)],
+        cv_method = KFold(20, 5))
+
+    meta_model = CMASVCLinearMetaModel(\
+        window_size = 10,
+        scaling = ScalingStandardscore(),
+        crossvalidation = sklearn_cv,
+        repair_mode = 'none')
+
+    return CMAESSVC(mu = 15, lambd = 100, xmean = xmean, sigma = sigma,\
+        beta = 0.80, meta_model = meta_model)
+
+optimizers = [get_cmaes, get_sep_cmaes, get_cmaes_svc]
+dtypes = [float64, float32]
+
+def run(problem, optimizer, dtype, sample):
+    seed(sample)
+    xmean, sigma = starts[problem]
+    termination = ORCombinator([\
+        Accuracy(problem().optimum_fitness(), accuracy),
+        Generations(max_generations)])
+
+    simulator = Simulator(optimizer(xmean.copy(), sigma), problem(),\
+        termination, dtype = dtype)
+
+    # the simulator prints every generation
+    stdout, sys.stdout = sys.stdout, open(devnull, "w")
+    try:
+        simulator.simulate()
+    finally:
+        sys.stdout = stdout
+
+    logs = simulator.optimizer.logger.all()
+    return simulator.logger.all()['generations'][-1],\
+        min(logs['best_fitness']), len(dumps(logs, 2))
+
+if not exists("output/"):
+    mkdir("output/")
+
+writer = csv.writer(open("output/precision.csv", "w"))
+writer.writerow(["problem", "optimizer", "dtype", "sample", "generations",\
+    "best_fitness", "logged_bytes"])
+
+for problem in starts.keys():
+    for optimizer in optimizers:
+        for dtype in dtypes:
+            results = []
+            for sample in range(samples):
+                result = run(problem, optimizer, dtype, sample)
+                writer.writerow([problem.description_short, optimizer.__name__,\
+                    dtype.__name__, sample] + list(result))
+                results.append(result)
+
+            generations, best_fitnesses, logged = zip(*results)
+            print "%s %s %s: median generations %d, worst error %.3e, "\
+                "logged %.1f kB" % (problem.description_short,\
+                optimizer.__name__, dtype.__name__, median(generations),\
+                max(best_fitnesses) - problem().optimum_fitness(),\
+                median(logged) / 1e3)
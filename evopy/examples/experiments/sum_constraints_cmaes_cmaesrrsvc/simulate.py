@@ -29,6 +29,7 @@ from evopy.strategies.ori_dses_svc import ORIDSESSVC
 from evopy.strategies.ori_dses import ORIDSES
 
 from evopy.simulators.simulator import Simulator
+from evopy.simulators.results import Results
 from evopy.external.playdoh import map as pmap
 
 from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
@@ -63,14 +64,15 @@ for problem in problems:
             simulators_op.append(simulator)
         simulators[problem][optimizer] = simulators_op
 
-simulate = lambda simulator : simulator.simulate()
+compact = Results(['count_cfc'])
+simulate = lambda simulator : compact(simulator)
 
 # run simulators 
 for problem in problems:
     for optimizer, simulators_ in simulators[problem].iteritems():
-        resulting_simulators = map(simulate, simulators_)
-        for simulator in resulting_simulators:
-            cfc = sum(simulator.logger.all()['count_cfc'])
+        results = map(simulate, simulators_)
+        for result in results:
+            cfc = sum(result['count_cfc'])
             cfcs[problem][optimizer].append(cfc)
  
 if not exists("output/"): 
@@ -7,6 +7,7 @@ from gputools import *
 from baserpc import *
 from rpc import *
 from pool import *
+from threadlimits import *
 from filetransfer import *
 from asyncjobhandler import *
 from interface import *
@@ -6,12 +6,14 @@ from gputools import *
 from pool import *
 from rpc import *
 from resources import *
+from filetransfer import MissingFile, forget_sent_files
 from numpy import sum
 import cPickle
 import os
 import os.path
 import time
-import hashlib
+import itertools
+import math
 import random
 import traceback
 
@@ -19,6 +21,57 @@ import traceback
 __all__ = ['Job', 'JobRun', 'AsyncJobHandler', 'submit_jobs']
 
 
+# job identifiers are unique within a client session
+SESSION = "%d-%06x" % (os.getpid(), random.randint(0, 0xffffff))
+JOBCOUNTER = itertools.count()
+
+# with chunksize='auto', targeted duration of a chunk of tasks (in s)
+CHUNK_DURATION = 1.
+
+# mean duration of one task measured during the previous maps, per function
+TASK_DURATIONS = {}
+
+
+def get_result_status(result):
+    """
+    Status of a job which returned result: 'crashed' if it raised,
+    'finished' otherwise. For a chunk, the list of the statuses of its
+    tasks.
+    """
+    if isinstance(result, ChunkResult):
+        return [get_result_status(r) for r in result.results]
+    if isinstance(result, Exception):
+        return 'crashed'
+    return 'finished'
+
+
+def evaluate_function(function, args, kwds):
+    """
+    Evaluates the function on the given arguments. If an exception occurs,
+    returns the Exception object with its traceback as an extra attribute.
+    """
+    try:
+        return function(*args, **kwds)
+    except Exception as inst:
+        # add the traceback to the exception
+        msg = traceback.format_exc()
+        inst.traceback = msg
+        log_warn("An exception has occurred in %s, print exc.traceback \
+where exc is the Exception object returned by playdoh.map" %
+            function.__name__)
+        return inst
+
+
+class ChunkResult(object):
+    """
+    Results of a chunk of tasks evaluated by a single job, with the
+    duration of every task.
+    """
+    def __init__(self, results, durations):
+        self.results = results
+        self.durations = durations
+
+
 class Job(object):
     jobdir = JOBDIR
 
@@ -41,23 +94,25 @@ class Job(object):
         self.kwds = kwds
         self.result = None
         self.status = 'queued'
+        # if True, the evaluated job is recorded on the disk
+        self.persistent = False
+        # list of (args, kwds) when the job evaluates a chunk of tasks
+        self.items = None
+
+    def get_size(self):
+        """
+        Number of tasks evaluated by the job.
+        """
+        if self.items is None:
+            return 1
+        return len(self.items)
+    size = property(get_size)
 
     def compute_id(self):
         """
         Computes a unique identifier of the job.
         """
-        m = hashlib.sha1()
-        pid = os.getpid()  # current process id
-#        t = int(time.time() * 10000) % 1000000  # time
-        s = str(self.function)  # function name
-        s += cPickle.dumps(self.args, -1)  # args dump
-        s += cPickle.dumps(self.kwds, -1)  # args dump
-        m.update(str(random.random()))  # random number
-        m.update(str(pid))
-        m
-        m.update(s)
-        hash = m.hexdigest()
-        self._id = hash
+        self._id = "%s-%d" % (SESSION, JOBCOUNTER.next())
         return self._id
 
     def get_id(self):
@@ -74,19 +129,30 @@ class Job(object):
         """
         Evaluates the function on the given arguments.
         """
-        try:
-            self.status = 'processing'
-            self.result = self.function(*self.args, **self.kwds)
-            self.status = 'finished'
-        except Exception as inst:
-            # add the traceback to the exception
-            msg = traceback.format_exc()
-            inst.traceback = msg
-            log_warn("An exception has occurred in %s, print exc.traceback \
-where exc is the Exception object returned by playdoh.map" %
-                self.function.__name__)
-            self.result = inst
+        self.status = 'processing'
+        if self.items is not None:
+            return self.evaluate_chunk()
+        self.result = evaluate_function(self.function, self.args, self.kwds)
+        if isinstance(self.result, Exception):
             self.status = 'crashed'
+        else:
+            self.status = 'finished'
+        return self.result
+
+    def evaluate_chunk(self):
+        """
+        Evaluates the function on every (args, kwds) item of the chunk.
+        Exceptions are captured per item.
+        """
+        results, durations = [], []
+        for args, kwds in self.items:
+            if 'shared_data' in self.kwds:
+                kwds = dict(kwds, shared_data=self.kwds['shared_data'])
+            t0 = time.time()
+            results.append(evaluate_function(self.function, args, kwds))
+            durations.append(time.time() - t0)
+        self.result = ChunkResult(results, durations)
+        self.status = get_result_status(self.result)
         return self.result
 
     def record(self):
@@ -95,7 +161,7 @@ where exc is the Exception object returned by playdoh.map" %
         """
         if not os.path.exists(self.jobdir):
             log_debug("creating '%s' folder for code pickling" % self.jobdir)
-            os.mkdir(self.jobdir)
+            create_user_dirs()
         log_debug("writing '%s'" % self.filename)
 
         # delete shared data before pickling
@@ -146,6 +212,8 @@ where exc is the Exception object returned by playdoh.map" %
         """
         Erases all Job objects stored in the filesystem.
         """
+        if not os.path.exists(Job.jobdir):
+            return
         files = os.listdir(Job.jobdir)
         log_debug("erasing all files in '%s'" % Job.jobdir)
         [os.remove(os.path.join(Job.jobdir, filename)) for filename in files]
@@ -159,7 +227,10 @@ def eval_job(job, shared_data={}):
     if len(shared_data) > 0:
         job.kwds['shared_data'] = shared_data
     result = job.evaluate()
-    job.record()
+    # the result goes back through the worker pipe anyway, only write it
+    # on the disk when asked for
+    if job.persistent:
+        job.record()
     return result
 
 
@@ -248,13 +319,20 @@ class AsyncJobHandler(object):
         else:
             statuss = []
             for id in job_ids:
+                if id in self.jobs and self.cpool is not None:
+                    # the pool task status is the job status, a finished
+                    # task may have returned an exception
+                    pool_id = self.jobs[id].pool_id
+                    status = self.cpool.get_status([pool_id])[0]
+                    if status == 'finished':
+                        status = get_result_status(
+                            self.cpool.results[pool_id])
+                    statuss.append(status)
+                    continue
                 job = Job.load(id)
                 if job is not None:
                     log_debug("job file '%s' found" % id)
                     status = job.status
-                elif id in self.jobs.keys():
-                    log_debug("job file '%s' not found" % id)
-                    status = self.jobs[id].status
                 else:
                     log_warn("job '%s' not found" % id)
                     status = None
@@ -268,6 +346,11 @@ class AsyncJobHandler(object):
         else:
             results = []
             for id in job_ids:
+                if id in self.jobs and self.cpool is not None:
+                    # results came back through the worker pipes
+                    pool_id = self.jobs[id].pool_id
+                    results.append(self.cpool.get_results([pool_id])[0])
+                    continue
                 job = Job.load(id)
                 if job is not None:
                     result = job.result
@@ -294,7 +377,12 @@ class AsyncJobHandler(object):
 
     def erase(self, job_ids):
         log_debug("Erasing job results")
-        [Job.erase(id) for id in job_ids]
+        for id in job_ids:
+            job = self.jobs.pop(id, None)
+            if job is not None and self.cpool is not None:
+                self.cpool.release_tasks([job.pool_id])
+            if os.path.exists(os.path.join(Job.jobdir, id + '.pkl')):
+                Job.erase(id)
 
     def close(self):
         if hasattr(self, 'cpool'):
@@ -327,13 +415,14 @@ class JobRun(object):
         in that case it must
         be a list of job identifiers.
     """
-    def __init__(self, type, jobs, machines=[]):
+    def __init__(self, type, jobs, machines=[], function=None):
         self.type = type
         self.jobs = jobs
         self.machines = machines  # list of Machine object
         self._machines = [m.to_tuple() for m in self.machines]
         self.local = None
         self.jobids = None
+        self.function = function
 
     def set_local(self, v):
         self.local = v
@@ -354,6 +443,33 @@ class JobRun(object):
         [lists2.extend(l) for l in lists]
         return lists2
 
+    def get_job_sizes(self, ids):
+        """
+        Returns the number of tasks of every job in ids (list of lists of
+        job identifiers, one list per machine).
+        """
+        sizes = dict(zip(self.concatenate(self.jobids),
+                         [job.size for job in self.jobs]))
+        return [sizes[id] for id in self.concatenate(ids)]
+
+    def unpack(self, results, sizes):
+        """
+        Unpacks the results of chunked jobs into one result per task, in
+        order, and records the measured task duration.
+        """
+        unpacked, durations = [], []
+        for result, size in zip(results, sizes):
+            if isinstance(result, ChunkResult):
+                unpacked.extend(result.results)
+                durations.extend(result.durations)
+            else:
+                # the whole job failed or was not chunked
+                unpacked.extend([result] * size)
+        key = getattr(self.function, 'codekey', None)
+        if key is not None and len(durations) > 0:
+            TASK_DURATIONS[key] = sum(durations) / len(durations)
+        return unpacked
+
     def get_status(self):
         GC.set(self.get_machines(), handler_class=AsyncJobHandler)
         disconnect = GC.connect()
@@ -363,7 +479,11 @@ class JobRun(object):
         if disconnect:
             GC.disconnect()
 
-        return self.concatenate(status)
+        status = self.concatenate(status)
+        # one status per task, finished chunks have one per task already
+        return self.concatenate([s if isinstance(s, list) else [s] * size
+                                 for s, size in
+                                 zip(status, self.get_job_sizes(self.jobids))])
 
     def get_results(self, ids=None):
         if ids is None:
@@ -385,7 +505,12 @@ class JobRun(object):
 #        clients.erase(self.jobids)
 #        clients.disconnect()
 
-        results = self.concatenate(results)
+        results = self.unpack(self.concatenate(results),
+                              self.get_job_sizes(ids))
+        # files the servers reported missing are sent again by the next map
+        for result in results:
+            if isinstance(result, MissingFile):
+                forget_sent_files(result.filename)
         if self.local:
             close_servers(self.get_machines())
         return results
@@ -403,11 +528,11 @@ class JobRun(object):
                                                     nmachines, plural)
 
 
-def create_jobs(fun, argss, kwdss):
+def create_items(argss, kwdss):
     """
-    Create Job objects
+    Returns the list of (args, kwds) of every task
     """
-    jobs = []
+    items = []
     k = len(argss)  # number of non-named arguments
     keys = kwdss.keys()  # keyword arguments
 
@@ -418,8 +543,51 @@ def create_jobs(fun, argss, kwdss):
             kwds = dict([(key, kwdss[key][i]) for key in keys])
         except:
             break
-        jobs.append(Job(fun, *args, **kwds))
+        items.append((args, kwds))
         i += 1
+    return items
+
+
+def get_chunksize(fun, ntasks, units, chunksize=1):
+    """
+    Returns the number of tasks per job. With chunksize='auto', the
+    chunks last about CHUNK_DURATION seconds according to the task duration
+    measured during the previous maps of the same function, or there are
+    4 chunks per unit if the function has never been mapped.
+    """
+    if chunksize != 'auto':
+        return max(1, int(chunksize))
+    units = max(1, min(units, ntasks))
+    duration = TASK_DURATIONS.get(getattr(fun, 'codekey', None), None)
+    if duration is None:
+        chunksize = int(math.ceil(float(ntasks) / (4 * units)))
+    elif duration > 0:
+        chunksize = int(CHUNK_DURATION / duration)
+    else:
+        chunksize = ntasks
+    # keep every unit busy
+    chunksize = min(chunksize, int(math.ceil(float(ntasks) / units)))
+    return max(1, chunksize)
+
+
+def create_jobs(fun, argss, kwdss, persistent=False, chunksize=1,
+                measure=False):
+    """
+    Create Job objects. With measure, single tasks are chunks as well, so
+    their durations are measured.
+    """
+    jobs = []
+    items = create_items(argss, kwdss)
+    if chunksize == 1 and not measure:
+        for args, kwds in items:
+            jobs.append(Job(fun, *args, **kwds))
+    else:
+        for i in xrange(0, len(items), chunksize):
+            job = Job(fun)
+            job.items = items[i:i + chunksize]
+            jobs.append(job)
+    for job in jobs:
+        job.persistent = persistent
     return jobs
 
 
@@ -458,6 +626,8 @@ def submit_jobs(fun,
                 shared_data={},
                 local=None,
                 do_redirect=None,
+                persistent=False,
+                chunksize=1,
                 argss=[],
                 kwdss={}):
     """
@@ -465,11 +635,19 @@ def submit_jobs(fun,
     """
     machines = allocation.machines
 
+    # groups several tasks per job
+    ntasks = len(create_items(argss, kwdss))
+    # the durations of 'auto' chunks are measured for the next maps
+    measure = chunksize == 'auto'
+    chunksize = get_chunksize(fun, ntasks, allocation.total_units, chunksize)
+    if chunksize > 1:
+        log_debug("Submitting %d tasks in chunks of %d" % (ntasks, chunksize))
+
     # creates Job objects
-    jobs = create_jobs(fun, argss, kwdss)
+    jobs = create_jobs(fun, argss, kwdss, persistent, chunksize, measure)
 
     # creates a JobRun object
-    myjobs = JobRun(unit_type, jobs, machines)
+    myjobs = JobRun(unit_type, jobs, machines, fun)
 
     # splits jobs
     sjobs = split_jobs(jobs, machines, allocation)
@@ -12,6 +12,7 @@ import time
 from Queue import Queue
 
 __all__ = ['DEFAULT_PORT', 'BaseRpcServer', 'BaseRpcClient', 'BaseRpcClients',
+           'ConnectionPool', 'CONNECTIONS',
            'open_base_server', 'close_base_servers',
            'open_restart_server', 'restart'
 #           'DistantException'
@@ -88,6 +89,8 @@ class BaseRpcServer(object):
         self.temp_result = None
         self.wait_before_accept = False
         self.acceptqueue = Queue()
+        self.listener = None
+        self.connections = set([])
 
     def serve(self, conn, client):
         # called in a new thread
@@ -102,7 +105,10 @@ class BaseRpcServer(object):
             procedure = conn.recv()
             log_debug("server: procedure '%s' received" % procedure)
 
-            if procedure == 'keep_connection':
+            if procedure is None and conn.broken:
+                log_debug("server: connection lost")
+                break
+            elif procedure == 'keep_connection':
                 keep_connection = True
                 continue  # immediately waits for a procedure
             elif procedure == 'close_connection':
@@ -112,6 +118,7 @@ class BaseRpcServer(object):
                 log_debug("server: shutdown signal received")
                 keep_connection = False
                 self.bool_shutdown = True
+                self.listener.wake()
                 break  # closes the connection immediately
             elif procedure == 'get_temp_result':
                 log_debug("sending temp result")
@@ -157,6 +164,7 @@ class BaseRpcServer(object):
                 keep_connection = False
 
         if conn is not None:
+            self.connections.discard(conn)
             conn.close()
             conn = None
         log_debug("server: connection closed")
@@ -164,16 +172,22 @@ class BaseRpcServer(object):
     def listen(self):
         """
         Listens to incoming connections and create one handler for each
-        new connection.
+        new connection. The same socket is used for the whole lifetime of the
+        server, and accepting blocks until a client connects or the server is
+        shut down.
         """
-        conn = None
         threads = []
-        index = 0
 
         # Initializing
         log_debug("Initializing server with IP %s on port %d" % (LOCAL_IP,
                                                                  self.port))
         self.initialize()
+
+        try:
+            self.listener = ConnectionListener(self.address)
+        except:
+            log_warn("server: unable to listen on port %d" % self.address[1])
+            self.bool_shutdown = True
 
         while not self.bool_shutdown:
             try:
@@ -184,24 +198,32 @@ class BaseRpcServer(object):
 #                    time.sleep(USERPREF['wait_before_accept'])
                     self.acceptqueue.get()
                     log_debug("I can accept now!")
-                conn, client = accept(self.address)  # accepts an incoming
-                                                     # connection
-                log_debug("Server established a connection with client %s on \
-                           port %d" % (client, self.address[1]))
+                conn, client = self.listener.accept()  # accepts an incoming
+                                                       # connection
             except:
                 log_warn("server: connection NOT established, closing now")
                 break
+            if conn is None:
+                # woken up by the shutdown procedure
+                break
+            log_debug("Server established a connection with client %s on \
+                       port %d" % (client, self.address[1]))
 
+            # clients may keep their connection open between two calls, so
+            # serving threads must not prevent the server from exiting
+            self.connections.add(conn)
             thread = threading.Thread(target=self.serve, args=(conn, client))
+            thread.daemon = True
             thread.start()
+            threads = [t for t in threads if t.is_alive()]
             threads.append(thread)
-            index += 1
-            time.sleep(.1)
 
-        # Closes the connection at the end of the server lifetime
-        if conn is not None:
-            conn.close()
-            conn = None
+        if self.listener is not None:
+            self.listener.close()
+
+        # Closes the connections kept open by the clients
+        for conn in list(self.connections):
+            conn.shutdown()
 
         # closing
         log_debug("Closing server")
@@ -222,6 +244,99 @@ class BaseRpcServer(object):
         log_warn("server: 'shutdown' method not implemented")
 
 
+class ConnectionPool(object):
+    """
+    Idle connections to the servers, shared by all the clients of the process
+    so that successive calls to the same server do not pay the connection
+    setup again. Pooled connections are kept open on the server side
+    ('keep_connection') and are checked before being reused. Several
+    connections can be pooled for one server, one for each concurrent call.
+
+    Set ``enabled`` to False to open a new connection for each call.
+    """
+    def __init__(self, idle_timeout=60.):
+        self.enabled = True
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.idle = {}  # address => list of (release time, Connection)
+        self.cleared = {}  # address => time of the last call to clear
+
+    def check_process(self):
+        # connections inherited from the parent process belong to the parent
+        if os.getpid() != self.pid:
+            self.pid = os.getpid()
+            self.lock = threading.Lock()
+            self.idle = {}
+            self.cleared = {}
+
+    def is_valid(self, address, conn):
+        # connections opened before the server was closed are not reused
+        cleared = max(self.cleared.get(address, 0), self.cleared.get(None, 0))
+        return conn.is_alive() and conn.created > cleared
+
+    def get(self, address, trials=None):
+        """
+        Returns a connection to address and whether it has been reused.
+        """
+        self.check_process()
+        if self.enabled:
+            self.lock.acquire()
+            try:
+                conns = self.idle.get(address, [])
+                while len(conns) > 0:
+                    t, conn = conns.pop()
+                    if (time.time() - t < self.idle_timeout and
+                            self.is_valid(address, conn)):
+                        log_debug("client: reusing connection to %s" %
+                                  str(address))
+                        return conn, True
+                    conn.close()
+            finally:
+                self.lock.release()
+        conn = connect(address, trials)
+        if conn is not None:
+            conn.created = time.time()
+            if self.enabled:
+                conn.send('keep_connection')
+        return conn, False
+
+    def release(self, address, conn):
+        """
+        Puts an idle connection back in the pool, or closes it.
+        """
+        self.check_process()
+        if not self.enabled or not self.is_valid(address, conn):
+            conn.close()
+            return
+        self.lock.acquire()
+        try:
+            self.idle.setdefault(address, []).append((time.time(), conn))
+        finally:
+            self.lock.release()
+
+    def clear(self, address=None):
+        """
+        Closes the idle connections to address, or to all servers. The
+        connections currently in use will not be reused either.
+        """
+        self.check_process()
+        self.lock.acquire()
+        try:
+            self.cleared[address] = time.time()
+            if address is None:
+                addresses = self.idle.keys()
+            else:
+                addresses = [address]
+            for address in addresses:
+                for t, conn in self.idle.pop(address, []):
+                    conn.close()
+        finally:
+            self.lock.release()
+
+CONNECTIONS = ConnectionPool()
+
+
 class BaseRpcClient(object):
     """
     RPC Client constructor.
@@ -237,21 +352,30 @@ class BaseRpcClient(object):
             port = DEFAULT_PORT
         self.port = port
         self.keep_connection = False
+        self.reused = False
 
     def open_connection(self, trials=None):
         log_debug("client: connecting to '%s' on port %d" % (self.server,
                                                              self.port))
         try:
-            self.conn = connect((self.server, self.port), trials)
+            self.conn, self.reused = CONNECTIONS.get((self.server, self.port),
+                                                     trials)
         except:
             log_warn("Error when connecting to '%s' on port %d" % (self.server,
                                                                    self.port))
             self.conn = None
 
-    def close_connection(self):
+    def close_connection(self, reuse=True):
+        """
+        Closes the connection, or gives it back to the connection pool
+        if ``reuse`` is True and pooling is enabled.
+        """
         log_debug("client: closing connection")
         if self.conn is not None:
-            self.conn.close()
+            if reuse:
+                CONNECTIONS.release((self.server, self.port), self.conn)
+            else:
+                self.conn.close()
         self.conn = None
 
     def is_connected(self):
@@ -271,6 +395,7 @@ class BaseRpcClient(object):
         except:
             log_warn("client: connection lost while sending the procedure,\
                       connecting again...")
+            self.close_connection(reuse=False)
             self.open_connection()
             self.conn.send(procedure)
 
@@ -279,7 +404,7 @@ class BaseRpcClient(object):
         if (hasattr(procedure, 'close_connection_temp') and
                 procedure.close_connection_temp):
             log_debug("closing the connection while processing the procedure")
-            self.close_connection()
+            self.close_connection(reuse=False)
             log_debug("waiting...")
             time.sleep(.5)
             log_debug("opening the connection again")
@@ -288,7 +413,7 @@ class BaseRpcClient(object):
             log_debug("receiving temp result")
             result = self.conn.recv()
             log_debug("temp result received! closing connection")
-            self.close_connection()
+            self.close_connection(reuse=False)
             log_debug("connection closed()")
         else:
             log_debug("client: receiving result")
@@ -299,6 +424,13 @@ class BaseRpcClient(object):
                           connecting again...")
                 self.open_connection()
                 result = self.conn.recv()
+
+            # a pooled connection lost after the procedure has been sent:
+            # the server may have processed it, so it is not sent again
+            if self.conn.broken and self.reused:
+                self.close_connection(reuse=False)
+                raise Exception("client: pooled connection to '%s' lost, \
+the procedure may have been processed" % self.server)
 
             if not self.keep_connection:
                 self.close_connection()
@@ -321,12 +453,13 @@ class BaseRpcClient(object):
     def connect(self, trials=None):
         self.keep_connection = True
         self.open_connection(trials)
-        if self.conn is not None:
+        # pooled connections are already kept by the server
+        if self.conn is not None and not CONNECTIONS.enabled:
             self.conn.send('keep_connection')
 
     def disconnect(self):
         self.keep_connection = False
-        if self.conn is not None:
+        if self.conn is not None and not CONNECTIONS.enabled:
             self.conn.send('close_connection')
         self.close_connection()
 
@@ -338,7 +471,8 @@ class BaseRpcClient(object):
             self.open_connection()
         log_debug("client: sending the shutdown signal")
         self.conn.send('shutdown')
-        self.close_connection()
+        self.close_connection(reuse=False)
+        CONNECTIONS.clear((self.server, self.port))
 
 
 class BaseRpcClients(object):
@@ -1,15 +1,20 @@
 import os.path
 
-# creates the user directory
+# the user directory, created on first use by create_user_dirs
 BASEDIR = os.path.join(os.path.realpath(os.path.expanduser('~')), '.playdoh')
 CACHEDIR = os.path.join(BASEDIR, 'cache')
 JOBDIR = os.path.join(BASEDIR, 'jobs')
 
-if not os.path.exists(BASEDIR):
-    os.mkdir(BASEDIR)
 
-if not os.path.exists(CACHEDIR):
-    os.mkdir(CACHEDIR)
-
-if not os.path.exists(JOBDIR):
-    os.mkdir(JOBDIR)
+def create_user_dirs():
+    """
+    Creates the user, cache and job directories if they do not exist.
+    """
+    for dirname in [BASEDIR, CACHEDIR, JOBDIR]:
+        if not os.path.exists(dirname):
+            try:
+                os.mkdir(dirname)
+            except OSError:
+                # created by another process
+                if not os.path.isdir(dirname):
+                    raise
@@ -9,11 +9,21 @@ import sys
 import cPickle
 import imp
 import hashlib
-from cloudpickle import dumps, dump
+import marshal
+import copy
+import types
+import pickle
+import weakref
+import errno
+from cloudpickle import dumps, dump, islambda, CloudPickler
 
 
 SYSPATH = sys.path[:]
 
+# pickled functions and classes of this session, object => PicklableClass,
+# the entries go away with the functions and classes
+PICKLED = weakref.WeakKeyDictionary()
+
 
 __all__ = ['PicklableClass', 'pickle_class', 'send_dependencies', 'dump']
 
@@ -43,6 +53,8 @@ class PicklableClass(object):
 #        sha.update(str(random.random())) # HACK to avoid conflicts between
 #        local and remote scripts
         self.hash = sha.hexdigest()
+        # identifies the code across maps, e.g. for its task durations
+        self.codekey = get_code_key(myclass, self.source)
         self.isfunction = inspect.isfunction(myclass)
         if self.isfunction:
             self.arglist = inspect.getargspec(myclass)[0]
@@ -67,6 +79,12 @@ class PicklableClass(object):
         """
         loadedmodules = {}
         for m in self.codedependencies:
+            filename = os.path.join(self.distant_dir, m)
+            if not os.path.exists(filename):
+                # e.g. the cache of the server has been cleared, the client
+                # sends the file again with the next map
+                raise MissingFile(errno.ENOENT, "missing code dependency",
+                                  filename)
             name = m
             name = name.replace('.py', '')
             name = name.replace('//', '.')
@@ -114,8 +132,98 @@ def get_dependencies(myclass, dirname=None):
     return filelist
 
 
+def pickled_by_value(obj):
+    """
+    True if cloudpickle pickles the function or class obj with its code
+    rather than as a reference to its module: lambdas, and what is
+    defined in __main__, at the prompt or is not an attribute of its
+    module.
+    """
+    if inspect.isfunction(obj):
+        if islambda(obj) or obj.func_code.co_filename == '<stdin>':
+            return True
+        modname = pickle.whichmodule(obj, obj.__name__)
+    else:
+        modname = getattr(obj, '__module__', None)
+    if modname is None or modname == '__main__':
+        return True
+    module = sys.modules.get(modname)
+    return getattr(module, obj.__name__, None) is not obj
+
+
+def captures_globals(fun):
+    """
+    True if the function reads globals which are not modules, cloudpickle
+    pickles their current values with the function.
+    """
+    names = CloudPickler.extract_code_globals(fun.func_code)
+    for const in fun.func_code.co_consts:
+        if type(const) is types.CodeType:
+            names = names.union(CloudPickler.extract_code_globals(const))
+    return any([not inspect.ismodule(fun.func_globals[name])
+                for name in names if name in fun.func_globals])
+
+
+def get_code_key(myclass, source):
+    """
+    Identifies a function or class across pickles by its module, name and
+    a hash of its bytecode or source. Returns None without source code
+    (prompt, built at runtime, C callables), unrelated code would share
+    the key.
+    """
+    if not source:
+        return None
+    sha = hashlib.sha1()
+    if inspect.isfunction(myclass):
+        # lambdas on the same line share their source
+        sha.update(marshal.dumps(myclass.func_code))
+    else:
+        sha.update(source)
+    return (getattr(myclass, '__module__', None), myclass.__name__,
+            sha.hexdigest())
+
+
+def get_pickle_key(myclass):
+    """
+    Returns what must not change for a pickled function or class to be
+    reused, or None if it must be pickled each time: closures, and
+    functions or classes pickled by value which read globals, whose
+    captured values may have changed.
+    """
+    if inspect.isfunction(myclass):
+        if myclass.func_closure is not None:
+            return None
+        if pickled_by_value(myclass) and captures_globals(myclass):
+            return None
+        return (myclass.func_code, myclass.func_defaults)
+    if inspect.isclass(myclass):
+        if pickled_by_value(myclass) and\
+                any([captures_globals(value)
+                     for value in myclass.__dict__.values()
+                     if inspect.isfunction(value)]):
+            return None
+        return myclass.__dict__.items()
+    return None
+
+
 def pickle_class(myclass):
-    return PicklableClass(myclass)
+    try:
+        key = get_pickle_key(myclass)
+    except Exception:
+        key = None
+    if key is None:
+        return PicklableClass(myclass)
+    if myclass in PICKLED and PICKLED[myclass][0] == key:
+        pklclass = PICKLED[myclass][1]
+    else:
+        pklclass = PicklableClass(myclass)
+        try:
+            PICKLED[myclass] = (key, pklclass)
+        except TypeError:
+            # no weak reference to builtins, they are not cached
+            pass
+    # the code dependencies are set on a copy
+    return copy.copy(pklclass)
 
 
 def send_dependencies(servers, myclass, dependencies=[]):
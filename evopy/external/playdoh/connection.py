@@ -13,7 +13,7 @@ except:
     LOCAL_IP = '127.0.0.1'
 
 
-__all__ = ['accept', 'connect', 'LOCAL_IP']
+__all__ = ['accept', 'connect', 'ConnectionListener', 'LOCAL_IP']
 
 
 class Connection(object):
@@ -28,6 +28,9 @@ class Connection(object):
         self.chunked = chunked
         self.compressed = compressed
         self.BUFSIZE = BUFSIZE
+        # True when the other end closed the connection
+        self.broken = False
+        set_keepalive(conn)
 
     def send(self, obj):
         s = cPickle.dumps(obj, -1)
@@ -39,19 +42,122 @@ class Connection(object):
             try:
                 s = self.conn.recv()
                 break
+            except EOFError:
+                log_debug("Connection closed by the other end")
+                self.broken = True
+                return None
             except Exception as e:
                 log_warn("Connection error (%d/%d): %s" %
                     (i + 1, trials, str(e)))
                 time.sleep(.1 * 2 ** i)
                 if i == trials - 1:
+                    self.broken = True
                     return None
         return cPickle.loads(s)
+
+    def is_alive(self):
+        """
+        Checks that an idle connection can still be used: nothing must be
+        waiting to be read on it, otherwise the other end closed it.
+        """
+        if self.conn is None or self.broken:
+            return False
+        try:
+            return not self.conn.poll()
+        except Exception:
+            return False
 
     def close(self):
         if self.conn is not None:
             self.conn.close()
             self.conn = None
 
+    def shutdown(self):
+        """
+        Closes the connection even if the socket is shared with child
+        processes, so that the other end is notified.
+        """
+        try:
+            sock = socket.fromfd(self.conn.fileno(), socket.AF_INET,
+                                 socket.SOCK_STREAM)
+            sock.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+        self.close()
+
+
+def set_keepalive(conn):
+    """
+    Enables TCP keepalive on the socket of a connection so that dead peers
+    are detected on long-lived connections.
+    """
+    try:
+        sock = socket.fromfd(conn.fileno(), socket.AF_INET,
+                             socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except Exception:
+        pass
+
+
+class ConnectionListener(object):
+    """
+    Listens to incoming connections on the same socket for the whole lifetime
+    of a server. ``accept`` blocks until a client connects, ``wake`` unblocks
+    it from another thread.
+    """
+    # longest wait after a failed accept before giving up, in seconds
+    max_delay = 5.
+
+    def __init__(self, address):
+        self.address = address
+        self.listener = Listener(address, authkey=USERPREF['authkey'])
+        self.woken = False
+
+    def accept(self):
+        """
+        Accept a connection and return a Connection object and the client IP,
+        or (None, None) if the listener has been woken up. Other errors
+        than a wrong authentication key are retried with a growing delay
+        and raised if they persist.
+        """
+        delay = .1
+        while True:
+            try:
+                conn = self.listener.accept()
+                break
+            except AuthenticationError:
+                if self.woken:
+                    return None, None
+                log_warn("The authentication key is not correct")
+            except Exception as e:
+                if self.woken:
+                    return None, None
+                if delay > self.max_delay:
+                    raise
+                log_warn("Unable to accept a connection (%s), retrying in \
+%.1f s" % (str(e), delay))
+                time.sleep(delay)
+                delay *= 2
+        if self.woken:
+            conn.close()
+            return None, None
+        client = self.listener.last_accepted
+        return Connection(conn), client[0]
+
+    def wake(self):
+        self.woken = True
+        ip, port = self.address
+        if ip in ('', '0.0.0.0'):
+            ip = '127.0.0.1'
+        try:
+            sock = socket.create_connection((ip, port))
+            sock.close()
+        except Exception:
+            log_debug("Unable to wake the listener up")
+
+    def close(self):
+        self.listener.close()
+
 
 def accept(address):
     """
@@ -7,6 +7,34 @@ from cache import *
 import os.path
 import shutil
 import base64
+import hashlib
+
+
+# directory where the server keeps one copy of every file it received,
+# named after the hash of its content
+OBJECTDIR = os.path.join(CACHEDIR, 'objects')
+
+# client side, filename => (mtime, size, hash)
+FILEHASHES = {}
+
+# client side, (machine, to_filename, hash) already present on the server
+SENTFILES = set([])
+
+
+class MissingFile(IOError):
+    """
+    Raised by a server which misses a file the client has sent, e.g. after
+    its cache has been cleared or it has been restarted.
+    """
+    pass
+
+
+def forget_sent_files(filename):
+    """
+    Forgets that filename has been sent, it is sent again next time.
+    """
+    for sent in [sent for sent in SENTFILES if sent[1] == filename]:
+        SENTFILES.discard(sent)
 
 
 def readbinary(filename):
@@ -32,33 +60,90 @@ def writebinary(filename, data_base64):
     return
 
 
+def hash_data(data):
+    """
+    Returns the SHA1 hash of a string.
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+def hash_file(filename):
+    """
+    Returns the SHA1 hash of the content of a file. Hashes are cached
+    as long as the modification time and the size of the file do not change.
+    """
+    stat = os.stat(filename)
+    key = (stat.st_mtime, stat.st_size)
+    if filename in FILEHASHES and FILEHASHES[filename][0] == key:
+        return FILEHASHES[filename][1]
+    binfile = open(filename, 'rb')
+    hash = hash_data(binfile.read())
+    binfile.close()
+    FILEHASHES[filename] = (key, hash)
+    return hash
+
+
+def makedirs(dirname):
+    if not os.path.exists(dirname):
+        try:
+            log_debug("server: creating '%s' folder" % dirname)
+            os.makedirs(dirname)
+        except:
+            log_warn("server: error while creating '%s'" % dirname)
+
+
 class FileTransferHandler(object):
 #    basedir = os.path.realpath(os.path.dirname(__file__)) # module dir
     basedir = BASEDIR  # user dir
 
-    def save_files(self, files, filenames):
+    objectdir = OBJECTDIR
+
+    def save_files(self, files, filenames, hashes=None):
         """
-        Saves files on the disk.
+        Saves files on the disk. If the hashes of the files are given,
+        a copy of each file is also kept in the object store so that
+        it does not need to be sent again.
         """
-        for file, filename in zip(files, filenames):
+        if hashes is None:
+            hashes = [None] * len(files)
+        for file, filename, hash in zip(files, filenames, hashes):
             # real path to the file on the server
             filename = os.path.realpath(os.path.join(self.basedir, filename))
 
-            # folder on the server
-            dirname = os.path.dirname(filename)
-
             # creates the folder if needed
-            if not os.path.exists(dirname):
-                try:
-                    log_debug("server: creating '%s' folder" % dirname)
-                    os.mkdir(dirname)
-                except:
-                    log_warn("server: error while creating '%s'" % dirname)
+            makedirs(os.path.dirname(filename))
 
             log_debug("server: writing '%s'" % filename)
             writebinary(filename, file)
+
+            if hash is not None:
+                makedirs(self.objectdir)
+                object = os.path.join(self.objectdir, hash)
+                if not os.path.exists(object):
+                    shutil.copyfile(filename, object)
         return True
 
+    def get_missing_files(self, hashes, filenames):
+        """
+        Returns the hashes of the files which must be sent. Files whose
+        content is already in the object store are copied to their
+        destination without any transfer.
+        """
+        missing = []
+        for hash, filename in zip(hashes, filenames):
+            filename = os.path.realpath(os.path.join(self.basedir, filename))
+            if os.path.exists(filename) and \
+                    hash_data(open(filename, 'rb').read()) == hash:
+                continue
+            object = os.path.join(self.objectdir, hash)
+            if os.path.exists(object):
+                log_debug("server: copying '%s' from the cache" % filename)
+                makedirs(os.path.dirname(filename))
+                shutil.copyfile(object, filename)
+                continue
+            missing.append(hash)
+        return missing
+
     def erase_files(self, filenames=None, dirs=None):
         if filenames is None:
             filenames = []
@@ -80,7 +165,13 @@ class FileTransferHandler(object):
         return True
 
 
-def send_files(machines, from_filenames, to_filenames=None, to_dir=None):
+def send_files(machines, from_filenames, to_filenames=None, to_dir=None,
+               cache=True):
+    """
+    Sends files to the machines. With ``cache=True``, the machines are first
+    asked which files they do not have yet, based on the hash of their
+    content, and only those files are sent.
+    """
     if type(machines) is str:
         machines = [machines]
     if type(from_filenames) is str:
@@ -100,12 +191,55 @@ def send_files(machines, from_filenames, to_filenames=None, to_dir=None):
             to_filenames = [os.path.join(to_dir,
                                          os.path.relpath(file, basedir))
                                          for file in from_filenames]
-    files = [readbinary(filename) for filename in from_filenames]
 
-    GC.set(machines, handler_class=FileTransferHandler, handler_id="savefiles")
+    if not cache:
+        files = [readbinary(filename) for filename in from_filenames]
+        GC.set(machines, handler_class=FileTransferHandler,
+               handler_id="savefiles")
+        disconnect = GC.connect()
+        result = GC.save_files([files] * len(machines),
+                               [to_filenames] * len(machines))
+        GC.delete_handler()
+        GC.set(machines)  # forget the handler_class/id
+        if disconnect:
+            GC.disconnect()
+        return result
+
+    hashes = [hash_file(filename) for filename in from_filenames]
+
+    # files already known to be on each machine during this session
+    indices = [[i for i in xrange(len(hashes))
+                if (machine, to_filenames[i], hashes[i]) not in SENTFILES]
+                for machine in machines]
+    if sum(len(ind) for ind in indices) == 0:
+        log_debug("All files are already on the machines")
+        return [True] * len(machines)
+
+    GC.set(machines, handler_class=FileTransferHandler,
+           handler_id="savefiles")
     disconnect = GC.connect()
-    result = GC.save_files([files] * len(machines),
-                           [to_filenames] * len(machines))
+    missing = GC.get_missing_files(
+                        [[hashes[i] for i in ind] for ind in indices],
+                        [[to_filenames[i] for i in ind] for ind in indices])
+
+    # reads each missing file once even if several machines need it
+    data = {}
+    files, filenames, hashes_ = [], [], []
+    for ind, miss in zip(indices, missing):
+        miss = set(miss)
+        ind = [i for i in ind if hashes[i] in miss]
+        for i in ind:
+            if i not in data:
+                data[i] = readbinary(from_filenames[i])
+        files.append([data[i] for i in ind])
+        filenames.append([to_filenames[i] for i in ind])
+        hashes_.append([hashes[i] for i in ind])
+    log_debug("Sending %d file(s), %d already cached" % (len(data),
+                                                    len(hashes) - len(data)))
+    result = GC.save_files(files, filenames, hashes_)
+    for machine, ind in zip(machines, indices):
+        SENTFILES.update([(machine, to_filenames[i], hashes[i])
+                          for i in ind])
     GC.delete_handler()
     GC.set(machines)  # forget the handler_class/id
 
@@ -50,6 +50,8 @@ def map_async(fun, *argss, **kwdss):
     total_units = kwdss.pop('total_units', None)
     codedependencies = kwdss.pop('codedependencies', None)
     disconnect = kwdss.pop('disconnect', True)
+    persistent = kwdss.pop('persistent', False)
+    chunksize = kwdss.pop('chunksize', 1)
 
     if not inspect.isfunction(fun):
         raise Exception("The first argument of 'map' must be a valid \
@@ -84,6 +86,8 @@ def map_async(fun, *argss, **kwdss):
                          unit_type=allocation.unit_type,
                          do_redirect=do_redirect,
                          local=local,
+                         persistent=persistent,
+                         chunksize=chunksize,
                          shared_data=shared_data)
 
     if disconnect:
@@ -157,6 +161,21 @@ def map(*args, **kwds):
         to the directory where the function's module is defined.
 
         .. seealso:: User guide for :ref:`code_transport`.
+
+    ``persistent=False``
+        Results are sent back to the client through the worker pipes and
+        kept in memory on the server until they are retrieved. Set
+        ``persistent`` to True to also record every finished job (with its
+        arguments and result) on the server disk, in ``~/.playdoh/jobs``.
+
+    ``chunksize=1``
+        Number of arguments evaluated one after the other by a single
+        worker task. Grouping many short jobs saves the per-task pickling,
+        status tracking and pipe round trips. With ``chunksize='auto'``,
+        chunks are sized to last about ``CHUNK_DURATION`` seconds from the
+        task duration measured in the previous maps of the same function.
+        Results are unpacked in order and exceptions are still returned
+        per argument.
     """
     kwds['disconnect'] = False
     myjobs = map_async(*args, **kwds)
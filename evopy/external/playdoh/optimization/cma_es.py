@@ -7,7 +7,7 @@ from numpy import zeros, ones, array, \
 inf, tile, maximum, minimum, argsort, \
 argmin, floor, where, unique, squeeze, mod
 from numpy.random import seed
-from scipy import linalg
+from numpy import linalg
 import os
 from time import time
 
@@ -360,6 +360,8 @@ class Optimization(ParallelTask):
 #            for group, engine in self.engines.iteritems():
 #                engine.pre_fitness()
             self.engine.pre_fitness()
+            # the engine may have changed the particles to evaluate
+            self.X = self.engine.X
 
             # evaluates the fitness
 #            log_debug("Get fitness")
@@ -373,7 +375,7 @@ class Optimization(ParallelTask):
             # post-fitness
 #            for group, engine in self.engines.iteritems():
 #                fitness=engine.post_fitness(fitness_split[group])
-            self.engine.post_fitness(fitness)
+            fitness = self.engine.post_fitness(fitness)
 
             # iterate the algorithm on each group
 #            new_X_split = {}
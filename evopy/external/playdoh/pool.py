@@ -4,6 +4,7 @@ the number of CPUs to use.
 """
 from gputools import *
 from debugtools import *
+from threadlimits import *
 import multiprocessing
 import threading
 import sys
@@ -14,6 +15,9 @@ import ctypes
 import numpy
 import traceback
 import cPickle
+import cStringIO
+import tempfile
+import glob
 import zlib
 import math
 from multiprocessing import Process, Pipe, sharedctypes, Lock
@@ -34,53 +38,192 @@ def get_cpu_count():
     return multiprocessing.cpu_count()
 
 
+# arrays larger than this (in bytes) are sent through shared memory
+SHARED_ARRAY_THRESHOLD = 65536
+
+# directory backing the shared memory segments, tmpfs when available
+if os.path.isdir('/dev/shm'):
+    SHMDIR = '/dev/shm'
+else:
+    SHMDIR = tempfile.gettempdir()
+
+
+def _is_shareable(obj):
+    """
+    Returns True if obj is a NumPy array which can be sent as a raw buffer.
+    """
+    return (type(obj) is numpy.ndarray or type(obj) is numpy.matrix) and \
+        not obj.dtype.hasobject and obj.nbytes >= SHARED_ARRAY_THRESHOLD
+
+
+def get_segment_prefix(pid=None):
+    """
+    Prefix of the shared memory files created by the process pid.
+    """
+    if pid is None:
+        pid = os.getpid()
+    return 'playdoh-%d-' % pid
+
+
+def dump_shared_array(v):
+    """
+    Copies the array buffer into a memory-mapped file and returns a header
+    which allows to map it again with ``load_shared_array``.
+    """
+    if v.flags.f_contiguous and not v.flags.c_contiguous:
+        order = 'F'
+    else:
+        order = 'C'
+    fd, filename = tempfile.mkstemp(prefix=get_segment_prefix(), dir=SHMDIR)
+    try:
+        os.ftruncate(fd, v.nbytes)
+        m = numpy.memmap(filename, dtype=v.dtype, mode='r+', shape=v.shape,
+                         order=order)
+        m[...] = v
+        m.flush()
+        del m
+    finally:
+        os.close(fd)
+    return ('ndarray', filename, v.dtype.str, v.shape, order,
+            type(v) is numpy.matrix)
+
+
+def load_shared_array(header):
+    """
+    Maps the memory-mapped file described by header without copying it.
+    The file is unlinked right away, the mapping stays valid until the array
+    is garbage collected.
+    """
+    _, filename, dtype, shape, order, ismatrix = header
+    m = numpy.memmap(filename, dtype=numpy.dtype(dtype), mode='r+',
+                     shape=shape, order=order)
+    try:
+        os.remove(filename)
+    except OSError:
+        log_warn("unable to remove shared memory file <%s>" % filename)
+    if ismatrix:
+        return m.view(numpy.matrix)
+    return m.view(numpy.ndarray)
+
+
+def unlink_segments(filenames):
+    """
+    Unlinks the shared memory files which were not loaded, a message which
+    was dropped would leak them until reboot. Returns their number.
+    """
+    count = 0
+    for filename in filenames:
+        try:
+            os.remove(filename)
+            count += 1
+        except OSError:
+            # loaded and unlinked by the receiver
+            pass
+    if count > 0:
+        log_debug("unlinked %d shared memory file(s)" % count)
+    return count
+
+
+def release_process_segments(pids):
+    """
+    Unlinks the shared memory files left by the processes pids, which must
+    have exited.
+    """
+    filenames = []
+    for pid in pids:
+        if pid is not None:
+            filenames.extend(glob.glob(os.path.join(SHMDIR,
+                get_segment_prefix(pid) + '*')))
+    return unlink_segments(filenames)
+
+
 class CustomConnection(object):
     """
     Handles chunking and compression of data.
+
+    Large NumPy arrays are taken out of the pickle stream: their buffer
+    goes through a memory-mapped file in shared memory and only a small
+    header is sent over the pipe. Set ``shared`` to False to pickle
+    everything.
     """
     def __init__(self, conn, index, lock=None, chunked=False,
-                 compressed=False):
+                 compressed=False, shared=True):
         self.conn = conn
         self.chunked = chunked
         self.compressed = compressed
+        self.shared = shared
         self.index = index
         self.lock = lock
         self.BUFSIZE = 2048
+        # shared memory files sent and maybe not loaded yet
+        self.segments = []
 
+    def dumps(self, obj):
+        """
+        Pickles obj, large arrays are replaced by shared memory headers.
+        Returns the pickled string and the number of shared arrays.
+        """
+        if not self.shared:
+            return cPickle.dumps(obj, -1), 0
+        headers = {}
+
+        def persistent_id(v):
+            if not _is_shareable(v):
+                return None
+            # the same array may be referenced several times
+            if id(v) not in headers:
+                headers[id(v)] = (v, dump_shared_array(v))
+                self.segments.append(headers[id(v)][1][1])
+            return headers[id(v)][1]
+
+        f = cStringIO.StringIO()
+        pickler = cPickle.Pickler(f, -1)
+        pickler.persistent_id = persistent_id
+        pickler.dump(obj)
+        return f.getvalue(), len(headers)
+
+    def loads(self, s):
+        if not self.shared:
+            return cPickle.loads(s)
+        arrays = {}
+
+        def persistent_load(header):
+            # headers are unique per array within a message
+            if header[1] not in arrays:
+                arrays[header[1]] = load_shared_array(header)
+            return arrays[header[1]]
+
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(s))
+        unpickler.persistent_load = persistent_load
+        return unpickler.load()
+
     def send(self, obj):
-        s = cPickle.dumps(obj, -1)
+        # forget the files the receiver has loaded
+        self.segments = [f for f in self.segments if os.path.exists(f)]
+        s, nshared = self.dumps(obj)
+        if nshared > 0:
+            log_debug("pipe %d: %d array(s) sent through shared memory" %
+                (self.index, nshared))
 
         log_debug("acquiring lock")
         if self.lock is not None:
             self.lock.acquire()
 
+        # the remaining stream is small, raw float data is not worth
+        # compressing
         if self.compressed:
             s = zlib.compress(s)
         if self.chunked:
-#            l = int(math.ceil(float(len(s))/self.BUFSIZE))
-#            n = l*self.BUFSIZE
-            # len(s) is a multiple of BUFSIZE, padding right with spaces
-#            s = s.ljust(n)
-#            l = "%08d" % l
-#            try:
             # length of the message
             n = len(s)
             l = int(math.ceil(float(n) / self.BUFSIZE))
             log_debug("pipe %d: %d bytes to send in %d packet(s)" %
                 (self.index, n, l))
             self.conn.send(n)
-            time.sleep(.001)
             for i in xrange(l):
-                log_debug("pipe %d: sending packet %d/%d" %
-                    (self.index, i + 1, l))
                 data = s[i * self.BUFSIZE:(i + 1) * self.BUFSIZE]
-#                ar = arr.array('c', data)
-#                self.conn.send_bytes(ar)
                 self.conn.send_bytes(data)
-                time.sleep(.001)
             log_debug("pipe %d: sent %d bytes" % (self.index, n))
-#            except:
-#                log_warn("Connection error")
         else:
             self.conn.send(s)
 
@@ -90,42 +233,30 @@ class CustomConnection(object):
 
     def recv(self):
         if self.chunked:
-            # Gets the first 8 bytes to retrieve the number of packets.
-#            l = ""
-#            n = 8
-#            while n > 0:
-#                l += self.conn.recv(n)
-#                n -= len(l)
-            # BUG: sometimes l is filled with spaces??? setting l=1 in this
-            # case (not a terrible solution)
-#            try:
-#                l = int(l)
-#            except:
-#                log_warn("transfer error, the paquet size was empty")
-#                l = 1
-
             n = int(self.conn.recv())
             log_debug("pipe %d: %d bytes to receive" % (self.index, n))
-#            length = l*self.BUFSIZE
-            s = ""
             # Ensures that all data have been received
-#            for i in xrange(l):# len(s) < length:
-            while len(s) < n:
-#                ar = arr.array('c', [0]*self.BUFSIZE)
-                log_debug("pipe %d: receiving packet..." % (self.index))
-#                n = self.conn.recv_bytes_into(ar)
-#                s += ar.tostring()
-                s += self.conn.recv_bytes()
-#                if not self.conn.poll(.01): break
-                time.sleep(.001)
+            packets = []
+            received = 0
+            while received < n:
+                packet = self.conn.recv_bytes()
+                packets.append(packet)
+                received += len(packet)
+            s = "".join(packets)
             log_debug("pipe %d: received %d bytes" % (self.index, len(s)))
         else:
             s = self.conn.recv()
-        # unpads spaces on the right
-#        s = s.rstrip()
         if self.compressed:
             s = zlib.decompress(s)
-        return cPickle.loads(s)
+        return self.loads(s)
+
+    def release(self):
+        """
+        Unlinks the shared memory files sent through this connection which
+        have not been loaded, to be called when the receiver is gone.
+        """
+        unlink_segments(self.segments)
+        self.segments = []
 
     def close(self):
         self.conn.close()
@@ -251,11 +382,14 @@ def make_numpy(common_shared_data):
     return shared_data
 
 
-def process_fun(index, child_conns, parent_conns, shared_data):
+def process_fun(index, child_conns, parent_conns, shared_data,
+                workers=1, threads=None, affinity=None):
     """
     This function is executed on a child process.
     conn is a connection to the parent
+    The native threads of the process are limited, see configure_worker.
     """
+    configure_worker(index, workers, threads, affinity)
     shared_data = make_numpy(shared_data)
     conn = child_conns[index]
     while True:
@@ -291,8 +425,18 @@ def process_fun(index, child_conns, parent_conns, shared_data):
 
 
 class Pool(object):
-    def __init__(self, workers, npipes=2, globs=None):
+    def __init__(self, workers, npipes=2, globs=None, threads=None,
+                 affinity=None):
+        """
+        threads is the number of native (BLAS, OpenMP) threads of each
+        worker, the cores are split between the workers if None. If
+        affinity is True each worker is pinned to its cores.
+        threads and affinity default to the user preferences
+        ``workerthreads`` and ``affinity``.
+        """
         self.workers = workers
+        self.threads = threads
+        self.affinity = affinity
         if globs is None:
             globs = globals()
         self.globals = globs
@@ -326,7 +470,10 @@ class Pool(object):
             p = Process(target=process_fun, args=(unit,
                                                   self.child_conns,
                                                   self.parent_conns,
-                                                  shared_data))
+                                                  shared_data,
+                                                  self.workers,
+                                                  self.threads,
+                                                  self.affinity))
             p.start()
             self.pids[unit] = p.pid
             self.processes[unit] = p
@@ -345,7 +492,9 @@ class Pool(object):
         for unit in units:
             p = self.processes[unit]
             p.terminate()
+            p.join(.1)
             del p
+        self.release_segments(units)
 
     def restart_workers(self, units=None, shared_data={}):
         shared_data = make_common(shared_data)
@@ -509,6 +658,20 @@ class Pool(object):
         self.processes[i].join(.1)
         self.processes[i].terminate()
 
+    def release_segments(self, units=None):
+        """
+        Unlinks the shared memory files of the messages to and from the
+        workers units which were not received.
+        """
+        if units is None:
+            units = range(self.workers)
+        for i in xrange(self.npipes):
+            for unit in units:
+                conn = self.parent_conns[unit + i * self.workers]
+                if conn is not None:
+                    conn.release()
+        release_process_segments([self.pids[unit] for unit in units])
+
     def close(self):
         threads = []
         for i in xrange(self.workers):
@@ -517,6 +680,7 @@ class Pool(object):
             threads.append(t)
         for t in threads:
             t.join(.1)
+        self.release_segments()
 
 #    def join(self):
 #        self.close()
@@ -731,6 +895,16 @@ class CustomPool(object):
         self.join()
         return [self.results[id] for id in ids]
 
+    def release_tasks(self, ids):
+        """
+        Frees the results and arguments of the given tasks once they have
+        been retrieved.
+        """
+        for id in ids:
+            self.results[id] = None
+            self.tasks[id].args = ()
+            self.tasks[id].kwds = {}
+
     def join(self):
         if self.thread is not None:
             log_debug("joining CustomPool thread")
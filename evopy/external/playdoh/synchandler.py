@@ -146,6 +146,9 @@ class Tubes(object):
         # BUG FIX FOR LINUX
         time.sleep(.01)
         return obj
+
+    def empty(self, name):
+        return self.tubes_in[name].empty()
 
     def push(self, name, obj):
 #        log_debug('out'+name+str(self.tubes_out))
@@ -701,7 +704,7 @@ class ParallelTask(object):
         any time
         by the client, to obtain for example the current iteration number.
 
-    Two methods from the base class are available:
+    Three methods from the base class are available:
 
     ``push(self, name, data)``
         Put some ``data`` into the tube ``name``. Named tubes are
@@ -718,6 +721,10 @@ class ParallelTask(object):
         data into it. The call to this method
         is equivalent to a synchronisation barrier.
 
+    ``empty(self, name)``
+        Return True if the tube ``name`` is empty, so that data can be
+        popped without blocking.
+
     Finally, the following read-only attributes are available:
 
     ``self.index``
@@ -758,6 +765,9 @@ class ParallelTask(object):
     def push(self, name, data):
         self.tubes.push(name, data)
 
+    def empty(self, name):
+        return self.tubes.empty(name)
+
     def initialize(self):
         log_warn("The <initialize> method of a parallel task may \
 be implemented")
@@ -0,0 +1,149 @@
+"""
+Thread limits of the native libraries (BLAS, OpenMP) in worker processes.
+
+NumPy's BLAS and the OpenMP runtime used by some libraries start as many
+threads as there are cores in every process. With one worker per core
+this oversubscribes the CPU. The limits are set at runtime in the loaded
+libraries, since the environment variables are only read when a library
+is loaded, i.e. before the workers are forked.
+"""
+from debugtools import *
+from userpref import *
+import os
+import ctypes
+import multiprocessing
+
+__all__ = ['worker_threads', 'limit_threads', 'restore_threads',
+           'set_affinity', 'configure_worker']
+
+
+# environment variables read by the libraries when they are loaded
+THREAD_VARIABLES = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                    'MKL_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS',
+                    'NUMEXPR_NUM_THREADS']
+
+# library name: (setter, getter) of its thread limit
+THREAD_FUNCTIONS = {'openblas': ('openblas_set_num_threads',
+                                 'openblas_get_num_threads'),
+                    'mkl_rt': ('MKL_Set_Num_Threads',
+                               'MKL_Get_Max_Threads'),
+                    'gomp': ('omp_set_num_threads', 'omp_get_max_threads'),
+                    'iomp': ('omp_set_num_threads', 'omp_get_max_threads')}
+
+
+def get_cpu_count():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def worker_threads(workers, cores=None):
+    """
+    Number of native threads per worker when workers processes or threads
+    share the cores: USERPREF['workerthreads'] if it is set, otherwise the
+    cores are split evenly, one thread at least.
+    """
+    if USERPREF['workerthreads']:
+        return int(USERPREF['workerthreads'])
+    if cores is None:
+        cores = get_cpu_count()
+    return max(1, cores // max(1, workers))
+
+
+def _loaded_libraries():
+    """
+    Returns a list of (path, setter, getter) of the loaded libraries with
+    a thread limit. Only Linux exposes the loaded libraries.
+    """
+    if not os.path.exists('/proc/self/maps'):
+        return []
+    paths = set()
+    for line in open('/proc/self/maps'):
+        fields = line.split()
+        if len(fields) == 6 and '.so' in fields[5]:
+            paths.add(fields[5])
+    libraries = []
+    for path in sorted(paths):
+        name = os.path.basename(path)
+        for key, (setter, getter) in THREAD_FUNCTIONS.iteritems():
+            if name.startswith('lib' + key):
+                libraries.append((path, setter, getter))
+    return libraries
+
+
+def limit_threads(threads):
+    """
+    Limits the native threads of this process and of processes started
+    from it. Returns the previous limits for restore_threads.
+    """
+    environment = dict([(variable, os.environ.get(variable))
+                        for variable in THREAD_VARIABLES])
+    for variable in THREAD_VARIABLES:
+        os.environ[variable] = str(threads)
+    libraries = {}
+    for path, setter, getter in _loaded_libraries():
+        try:
+            library = ctypes.CDLL(path)
+            libraries[(path, setter)] = getattr(library, getter)()
+            getattr(library, setter)(threads)
+        except (OSError, AttributeError):
+            continue
+    log_debug("limited %d libraries to %d threads" % (len(libraries),
+                                                       threads))
+    return environment, libraries
+
+
+def restore_threads(previous):
+    """
+    Restores the limits returned by limit_threads.
+    """
+    environment, libraries = previous
+    for variable, value in environment.iteritems():
+        if value is None:
+            os.environ.pop(variable, None)
+        else:
+            os.environ[variable] = value
+    for (path, setter), threads in libraries.iteritems():
+        getattr(ctypes.CDLL(path), setter)(threads)
+
+
+def set_affinity(cpus):
+    """
+    Pins this process to the list of CPU indices cpus. Only available on
+    Linux, returns False elsewhere.
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        setaffinity = libc.sched_setaffinity
+    except (OSError, AttributeError):
+        log_warn("CPU affinity is not supported on this platform")
+        return False
+    words = max(cpus) // 64 + 1
+    mask = (ctypes.c_ulong * max(16, words))()
+    for cpu in cpus:
+        mask[cpu // 64] |= 1 << (cpu % 64)
+    if setaffinity(0, ctypes.sizeof(mask), mask) != 0:
+        log_warn("could not set the CPU affinity to %s: %s" %
+                 (cpus, os.strerror(ctypes.get_errno())))
+        return False
+    return True
+
+
+def configure_worker(index, workers, threads=None, affinity=None):
+    """
+    Applies the thread policy in the worker index of workers: threads
+    native threads, worker_threads(workers) if None; if affinity is True
+    (USERPREF['affinity'] if None) the worker is pinned to its own
+    threads cores.
+    """
+    if threads is None:
+        threads = worker_threads(workers)
+    if affinity is None:
+        affinity = USERPREF['affinity']
+    limit_threads(threads)
+    if affinity:
+        cores = get_cpu_count()
+        set_affinity([(index * threads + i) % cores
+                      for i in xrange(threads)])
+    return threads
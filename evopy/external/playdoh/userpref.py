@@ -27,6 +27,13 @@ DEFAULTPREF['favoriteservers'] = []
 # default port
 DEFAULTPREF['loglevel'] = 'INFO'
 
+# native (BLAS, OpenMP) threads per worker process, None splits the cores
+# evenly between the workers
+DEFAULTPREF['workerthreads'] = None
+
+# pin each worker process to its own cores
+DEFAULTPREF['affinity'] = False
+
 
 class UserPref(object):
     """
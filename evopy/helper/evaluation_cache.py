@@ -0,0 +1,138 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import sqlite3
+from collections import OrderedDict
+from numpy import asarray, ascontiguousarray, around, float64, int64
+
+from sys import path
+path.append("../..")
+from evopy.helper.logger import Logger
+
+def get_namespace(problem):
+    """ namespace of the cached values of a problem: its cache_namespace
+        attribute, otherwise its class and the parameters it keeps as
+        numbers or strings, e.g. the dimensions """
+
+    namespace = getattr(problem, 'cache_namespace', None)
+    if(namespace != None):
+        return namespace
+    parameters = sorted([(name, value) for name, value\
+        in vars(problem).items()\
+        if isinstance(value, (bool, int, long, float, str))])
+    return problem.__class__.__name__ + "(" +\
+        ", ".join(["%s=%r" % parameter for parameter in parameters]) + ")"
+
+class EvaluationCache(object):
+    """ cache of fitness and constraint values of deterministic problems,
+        problems declare themselves deterministic with the class attribute
+        deterministic = True. Positions are the keys, exact or rounded to
+        a grid of width quantization. The most recent size entries are
+        kept in memory, all entries are written to the SQLite database at
+        path if it is given, so the runs of a sweep can share it. """
+
+    def __init__(self, size = 10000, quantization = None, path = None):
+        self._size = size
+        self._quantization = quantization
+        self._path = path
+        self._connection = None
+        self._memory = OrderedDict()
+        self._pending = []
+
+        self._count_hits = 0
+        self._count_disk_hits = 0
+        self._count_misses = 0
+        self.logger = Logger(self)
+        self.logger.add_binding('_count_hits', 'cache_hits')
+        self.logger.add_binding('_count_disk_hits', 'cache_disk_hits')
+        self.logger.add_binding('_count_misses', 'cache_misses')
+
+    def __getstate__(self):
+        # the connection is opened again after unpickling
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    def _database(self):
+        if(self._connection == None):
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS "\
+                "evaluations (key BLOB PRIMARY KEY, value REAL)")
+        return self._connection
+
+    def _key(self, namespace, kind, position):
+        if(self._quantization == None):
+            values = ascontiguousarray(position, dtype = float64)
+        else:
+            values = ascontiguousarray(\
+                around(asarray(position) / self._quantization), dtype = int64)
+        return "%s:%s:%s:" % (namespace, kind, values.shape) +\
+            values.tostring()
+
+    def get(self, namespace, kind, position):
+        """ cached value of kind ('fitness', 'feasibility') of the position,
+            None if it is not cached """
+
+        key = self._key(namespace, kind, position)
+        if(key in self._memory):
+            self._count_hits += 1
+            value = self._memory.pop(key)
+            self._memory[key] = value
+            return value
+
+        if(self._path != None):
+            row = self._database().execute(\
+                "SELECT value FROM evaluations WHERE key = ?",\
+                (sqlite3.Binary(key),)).fetchone()
+            if(row != None):
+                self._count_hits += 1
+                self._count_disk_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+
+        self._count_misses += 1
+        return None
+
+    def put(self, namespace, kind, position, value):
+        key = self._key(namespace, kind, position)
+        self._remember(key, value)
+        if(self._path != None):
+            self._pending.append((sqlite3.Binary(key), float(value)))
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        if(len(self._memory) > self._size):
+            self._memory.popitem(last = False)
+
+    def flush(self):
+        """ write the new entries to the database """
+        if(len(self._pending) > 0):
+            database = self._database()
+            database.executemany("INSERT OR REPLACE INTO evaluations "\
+                "VALUES (?, ?)", self._pending)
+            database.commit()
+            self._pending = []
+
+    def log(self):
+        """ flush, log the counters since the last call and reset them """
+        self.flush()
+        self.logger.log()
+        self._count_hits = 0
+        self._count_disk_hits = 0
+        self._count_misses = 0
@@ -37,6 +37,18 @@ class Logger(object):
         for k, v in self.bindings.iteritems():
             self.logs[k].append(self.scope.__getattribute__(v))                
 
+    def merge(self, logger, constants = {}):
+        """ append the logs of another logger, its constants and the given
+            constants are repeated for every logged entry """
+
+        logs = logger.all()
+        lists = [len(v) for v in logs.values() if type(v) == list]
+        length = max(lists + [0])
+        for k, v in logs.items() + constants.items():
+            if(type(v) != list):
+                v = [v] * length
+            self.logs.setdefault(k, []).extend(v)
+
     def all(self):
         return self.logs
 
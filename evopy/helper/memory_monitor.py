@@ -0,0 +1,143 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from sys import getsizeof
+from types import ModuleType, FunctionType, BuiltinFunctionType, ClassType
+from resource import getrusage, RUSAGE_SELF
+from numpy import ndarray
+
+from sys import path
+path.append("../..")
+from evopy.helper.logger import Logger
+
+_SKIPPED = (ModuleType, FunctionType, BuiltinFunctionType, ClassType, type)
+
+def deep_size(obj, seen = None):
+    """ estimated bytes of obj and everything it references, objects whose
+        id is in seen are not counted and the counted ones are added """
+
+    if(seen == None):
+        seen = set()
+    size = 0
+    stack = [obj]
+    while(len(stack) > 0):
+        obj = stack.pop()
+        if(id(obj) in seen or isinstance(obj, _SKIPPED)):
+            continue
+        seen.add(id(obj))
+
+        # the size of an array includes its data if it owns it
+        size += getsizeof(obj)
+        if(isinstance(obj, ndarray)):
+            if(obj.base is not None):
+                stack.append(obj.base)
+            if(obj.dtype != object):
+                continue
+            stack.extend(obj.flat)
+        elif(isinstance(obj, dict)):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif(isinstance(obj, (list, tuple, set, frozenset))):
+            stack.extend(obj)
+        elif(hasattr(obj, '__iter__') and hasattr(obj, 'maxlen')):
+            # deque
+            stack.extend(obj)
+
+        if(hasattr(obj, '__dict__')):
+            stack.append(obj.__dict__)
+        slots = getattr(obj.__class__, '__slots__', ())
+        for slot in [slots] if isinstance(slots, str) else slots:
+            if(hasattr(obj, slot)):
+                stack.append(getattr(obj, slot))
+    return size
+
+class MemoryMonitor(object):
+    """ bytes held by the components of a simulation, estimated every k
+        generations by deep_size and logged as memory_bytes with the peak
+        resident memory of the process. Every object is counted once, for
+        the first component that holds it: the logs of all loggers, the
+        pending a posteriori solutions of the strategy, the meta models,
+        the evaluation cache, the rest of the strategy and the rest of the
+        simulator. """
+
+    def __init__(self, k = 10):
+        self.k = k
+        self._generations = 0
+        self._samples = []
+
+        self._memory_bytes = None
+        self._peak_rss = None
+        self.logger = Logger(self)
+        self.logger.add_binding('_memory_bytes', 'memory_bytes')
+        self.logger.add_binding('_peak_rss', 'peak_rss_bytes')
+
+    def _components(self, simulator):
+        optimizer = simulator.optimizer
+        scopes = [simulator, optimizer,\
+            getattr(optimizer, 'meta_model', None),\
+            getattr(optimizer, 'gate', None), simulator.fitness_meta_model,\
+            simulator.cache, simulator.constraints,\
+            getattr(simulator, 'timer', None)]
+
+        return [\
+            ('logs', [s.logger.logs for s in scopes if hasattr(s, 'logger')]),
+            ('a_posteriori',\
+                getattr(optimizer, '_pending_apos_solutions', None)),
+            ('meta_model', [getattr(optimizer, 'meta_model', None),\
+                simulator.fitness_meta_model]),
+            ('cache', simulator.cache),
+            ('strategy', optimizer),
+            ('simulator', simulator)]
+
+    def measure(self, simulator):
+        """ bytes per component of the simulator """
+        seen = set([id(self)])
+        return dict([(name, deep_size(component, seen))\
+            for (name, component) in self._components(simulator)])
+
+    def log(self, simulator):
+        """ measure and log every k-th call """
+        self._generations += 1
+        if(self._generations % self.k != 0):
+            return
+
+        self._memory_bytes = self.measure(simulator)
+        # ru_maxrss is in kilobytes on linux
+        self._peak_rss = getrusage(RUSAGE_SELF).ru_maxrss * 1024
+        self._samples.append((self._generations, self._memory_bytes))
+        self.logger.log()
+
+    def summary(self):
+        """ table of the last and largest bytes and the growth per
+            generation of every component """
+
+        if(len(self._samples) == 0):
+            return "no memory samples, less than %d generations" % self.k
+
+        first_generation, first = self._samples[0]
+        last_generation, last = self._samples[-1]
+        generations = max(1, last_generation - first_generation)
+        lines = ["%-14s %14s %14s %16s" %\
+            ("component", "bytes", "max bytes", "bytes/generation")]
+        for name in sorted(last, key = lambda n : -last[n]):
+            lines.append("%-14s %14d %14d %16.1f" % (name, last[name],\
+                max([sample[name] for (g, sample) in self._samples]),\
+                (last[name] - first[name]) / float(generations)))
+        lines.append("peak resident memory: %d bytes" % self._peak_rss)
+        return "\n".join(lines)
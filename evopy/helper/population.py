@@ -0,0 +1,143 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+from numpy import asarray, asmatrix, empty, ones, argsort, arange, vstack
+from numpy import concatenate, nan
+
+class Population(object):
+    """ individuals as the rows of contiguous (n, N) arrays of positions and
+        optional step sizes, with an array of fitnesses and feasibilities.
+        Indexing and iterating returns 1 x N matrix views of the position
+        rows, or 2 x N [position; sigma] matrices if there are step sizes.
+        Strategies may return a Population instead of a list of individuals,
+        then the Simulator fills the feasibilities and fitnesses and tells
+        the Population itself. """
+
+    def __init__(self, positions, sigmas = None, fitnesses = None,\
+        feasibilities = None):
+
+        self.positions = asarray(positions)
+        self.sigmas = None if sigmas is None else asarray(sigmas)
+
+        n = self.positions.shape[0]
+        if(fitnesses is None):
+            fitnesses = empty(n)
+            fitnesses.fill(nan)
+        if(feasibilities is None):
+            feasibilities = ones(n, dtype = bool)
+
+        self.fitnesses = asarray(fitnesses, dtype = float)
+        self.feasibilities = asarray(feasibilities, dtype = bool)
+
+    def __len__(self):
+        return self.positions.shape[0]
+
+    def __getitem__(self, index):
+        if(isinstance(index, slice)):
+            sigmas = None if self.sigmas is None else self.sigmas[index]
+            return Population(self.positions[index], sigmas,\
+                self.fitnesses[index], self.feasibilities[index])
+
+        if(self.sigmas is None):
+            return self.position(index)
+        return asmatrix(vstack([self.positions[index], self.sigmas[index]]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def position(self, index):
+        """ 1 x N matrix view of the position of an individual """
+        if(index < 0):
+            index += len(self)
+        return asmatrix(self.positions[index:index + 1])
+
+    def take(self, indices):
+        """ new Population of the individuals at indices, the rows are
+            copied, so it does not keep this Population alive """
+
+        indices = asarray(indices, dtype = int)
+        sigmas = None if self.sigmas is None else self.sigmas[indices]
+        return Population(self.positions[indices], sigmas,\
+            self.fitnesses[indices], self.feasibilities[indices])
+
+    def feasible(self):
+        return self.take(self.feasibilities.nonzero()[0])
+
+    def infeasible(self):
+        return self.take((~self.feasibilities).nonzero()[0])
+
+    def sort(self, n = None):
+        """ the best n individuals by fitness, all if n is None; stable
+            like sorted() on (individual, fitness) tuples """
+
+        order = argsort(self.fitnesses, kind = 'mergesort')
+        return self.take(order[:n])
+
+    def head(self, n):
+        return self.take(arange(min(n, len(self))))
+
+    def fitness_tuples(self):
+        """ list of (individual, fitness) tuples """
+        return zip(list(self), self.fitnesses)
+
+    @staticmethod
+    def concatenate(populations):
+        positions = concatenate([p.positions for p in populations])
+        sigmas = None
+        if(all([p.sigmas is not None for p in populations])):
+            sigmas = concatenate([p.sigmas for p in populations])
+
+        return Population(positions, sigmas,\
+            concatenate([p.fitnesses for p in populations]),\
+            concatenate([p.feasibilities for p in populations]))
+
+    @staticmethod
+    def of_individuals(individuals, fitnesses = None, feasibilities = None):
+        """ Population of 1 x N or 2 x N [position; sigma] individuals """
+
+        rows = [asarray(individual) for individual in individuals]
+        positions = vstack([row[0] for row in rows])
+        sigmas = None
+        if(rows[0].shape[0] > 1):
+            sigmas = vstack([row[1] for row in rows])
+
+        return Population(positions, sigmas, fitnesses, feasibilities)
+
+    @staticmethod
+    def of_feasibilities(feasibility_information):
+        """ Population of (individual, feasibility) tuples, a Population
+            is returned as it is """
+
+        if(isinstance(feasibility_information, Population)):
+            return feasibility_information
+
+        individuals, feasibilities = zip(*feasibility_information)
+        return Population.of_individuals(individuals,\
+            feasibilities = feasibilities)
+
+    @staticmethod
+    def of_fitnesses(fitnesses):
+        """ Population of (individual, fitness) tuples, a Population is
+            returned as it is """
+
+        if(isinstance(fitnesses, Population)):
+            return fitnesses
+
+        individuals, values = zip(*fitnesses)
+        return Population.of_individuals(individuals, fitnesses = values)
@@ -0,0 +1,143 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import json
+from os import getpid
+from time import time
+
+from sys import path
+path.append("../..")
+from evopy.helper.logger import Logger
+
+class Timed(object):
+    """ calls scope.method and times it as phase name, set as instance
+        attribute it replaces the method; unlike a closure it pickles """
+
+    def __init__(self, timer, name, scope, method):
+        self.timer = timer
+        self.name = name
+        self.scope = scope
+        self.method = method
+
+    def __call__(self, *args, **kwargs):
+        self.timer.start(self.name)
+        try:
+            return getattr(self.scope.__class__, self.method)(\
+                self.scope, *args, **kwargs)
+        finally:
+            self.timer.stop()
+
+class Timer(object):
+    """ wall clock time of nested phases of a simulation. A phase is named
+        by its path, e.g. 'tell_fitness;train;crossvalidate'. The seconds
+        per phase of every generation are logged as phase_seconds, the
+        totals of the run are kept for summary() and the folded stacks of
+        flame graphs. With trace every phase is recorded as an event of a
+        Chrome trace (chrome://tracing, Perfetto). """
+
+    def __init__(self, trace = False):
+        self._trace = trace
+        self._stack = []
+        self._seconds = {}
+        self._totals = {}
+        self._calls = {}
+        self._events = []
+        self._origin = None
+
+        self._phase_seconds = None
+        self.logger = Logger(self)
+        self.logger.add_binding('_phase_seconds', 'phase_seconds')
+
+    def start(self, name):
+        now = time()
+        if(self._origin == None):
+            self._origin = now
+        self._stack.append((name, now))
+
+    def stop(self):
+        end = time()
+        name, start = self._stack.pop()
+        key = ';'.join([n for (n, s) in self._stack] + [name])
+        self._seconds[key] = self._seconds.get(key, 0.0) + end - start
+        self._calls[key] = self._calls.get(key, 0) + 1
+        if(self._trace):
+            self._events.append((name, start, end - start))
+
+    def instrument(self, scope, methods):
+        """ time every call of the methods of scope which exist, a method
+            is a name or a (name, phase name) tuple """
+
+        for method in methods:
+            method, name = method if type(method) == tuple\
+                else (method, method)
+            if(hasattr(scope, method)):
+                setattr(scope, method, Timed(self, name, scope, method))
+
+    def log(self):
+        """ log the seconds per phase since the last call """
+        self._phase_seconds = self._seconds
+        for key, seconds in self._seconds.iteritems():
+            self._totals[key] = self._totals.get(key, 0.0) + seconds
+        self.logger.log()
+        self._seconds = {}
+
+    def _self_seconds(self):
+        """ total seconds per phase without the seconds of its children """
+        own = dict(self._totals)
+        for key, seconds in self._totals.iteritems():
+            parent = key.rpartition(';')[0]
+            if(parent in own):
+                own[parent] -= seconds
+        return own
+
+    def summary(self):
+        """ table of the total, own and relative seconds and the calls per
+            phase, slowest first """
+
+        own = self._self_seconds()
+        total = sum([s for (k, s) in self._totals.iteritems()\
+            if not ';' in k])
+        lines = ["%-50s %10s %10s %6s %8s" %\
+            ("phase", "seconds", "own", "%", "calls")]
+        for key in sorted(self._totals, key = lambda k : -self._totals[k]):
+            lines.append("%-50s %10.4f %10.4f %6.1f %8d" % (key,\
+                self._totals[key], own[key],\
+                100.0 * self._totals[key] / total if total > 0 else 0.0,\
+                self._calls[key]))
+        return "\n".join(lines)
+
+    def write_folded(self, filename):
+        """ folded stacks with microseconds, the input of flamegraph.pl and
+            speedscope """
+
+        folded = open(filename, "w")
+        for key, seconds in sorted(self._self_seconds().iteritems()):
+            folded.write("%s %d\n" % (key, max(0, int(seconds * 1e6))))
+        folded.close()
+
+    def write_chrome_trace(self, filename):
+        """ the recorded phases as complete events of the Chrome trace
+            format, needs trace = True """
+
+        events = [{'name' : name, 'ph' : 'X', 'pid' : getpid(), 'tid' : 0,\
+            'ts' : (start - self._origin) * 1e6, 'dur' : seconds * 1e6}\
+            for (name, start, seconds) in self._events]
+        trace = open(filename, "w")
+        json.dump({'traceEvents' : events, 'displayTimeUnit' : 'ms'}, trace)
+        trace.close()
@@ -19,12 +19,9 @@ evopy.  If not, see <http://www.gnu.org/licenses/>.
 
 from collections import deque
 
-from sklearn import svm
-from sklearn import __version__ as sklearn_version
-
 from numpy import sum, sqrt, mean, arctan2, pi, matrix, sin, cos
 from numpy import matrix, cos, sin, inner, array, sqrt, arccos, pi, arctan2
-from numpy import transpose
+from numpy import transpose, asarray, zeros
 from numpy.random import rand
 from numpy.random import normal
 from numpy.linalg import inv
@@ -62,12 +59,22 @@ class CMASVCLinearMetaModel(MetaModel):
     def check_feasibility(self, individual):
         """ Check the feasibility with meta model """
 
-        scaled_individual = self._scaling.scale(individual)
+        scaled_individual = self._scaling.scale(individual.astype(self._dtype))
         prediction = self._clf.predict(scaled_individual.getA1())
 
         encode = lambda distance : False if distance < 0 else True
         return encode(prediction)
         
+    def check_feasibilities(self, population):
+        """ Check the feasibility of all individuals of a Population with
+            the meta model, return an array of booleans """
+
+        if(len(population) == 0):
+            return zeros(0, dtype = bool)
+
+        scaled = self._scaling.scale(population.positions.astype(self._dtype))
+        return asarray(self._clf.predict(asarray(scaled))) >= 0
+
     def train(self):
         """ Train a meta model classification with new points, return True
             if training was successful, False if not enough infeasible points 
@@ -82,8 +89,10 @@ class CMASVCLinearMetaModel(MetaModel):
             self.logger.log()
             return False
 
-        cv_feasibles = self._training_feasibles[:self._window_size]
-        cv_infeasibles = [inf for inf in self._training_infeasibles]
+        cv_feasibles = [f.astype(self._dtype)\
+            for f in self._training_feasibles[:self._window_size]]
+        cv_infeasibles = [inf.astype(self._dtype)\
+            for inf in self._training_infeasibles]
 
         self._scaling.setup(cv_feasibles + cv_infeasibles)
 
@@ -103,6 +112,7 @@ class CMASVCLinearMetaModel(MetaModel):
         points = ivalues + fvalues
         labels = [-1] * len(ivalues) + [1] * len(fvalues) 
 
+        from sklearn import svm
         self._clf = svm.SVC(kernel = 'linear', C = self._best_parameter_C, tol = 1.0)
         self._clf.fit(points, labels)
 
@@ -121,6 +131,7 @@ class CMASVCLinearMetaModel(MetaModel):
         w = self._clf.coef_[0]
         nw = w / sqrt(sum(w ** 2))
  
+        from sklearn import __version__ as sklearn_version
         if sklearn_version == '0.10':
             return -nw 
         if sklearn_version == '0.11':
@@ -130,7 +141,7 @@ class CMASVCLinearMetaModel(MetaModel):
 
     def repair(self, individual):
 
-        x = self._scaling.scale(individual)
+        x = self._scaling.scale(individual.astype(self._dtype))
         w = self._clf.coef_[0]
         nw = self.get_normal()
         b = self._clf.intercept_[0] / w[1]
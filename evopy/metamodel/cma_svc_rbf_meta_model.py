@@ -0,0 +1,152 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from collections import deque
+
+from numpy import array, asarray, matrix, dot, exp, sqrt, median, zeros
+from numpy.random import permutation
+from numpy.linalg import eigh
+
+from meta_model import MetaModel
+
+class CMASVCRBFMetaModel(MetaModel):
+    """ CMA SVC meta model with an RBF kernel and a budget of landmarks.
+        The kernel is approximated with the Nystroem method: every point is
+        mapped to its kernel values to at most budget landmarks, whitened
+        with K(landmarks, landmarks)^(-1/2), and a linear SVC separates the
+        mapped points. Training and prediction cost O(budget * N) per point,
+        independent of the number of support vectors. """
+
+    def __init__(self, window_size, scaling, crossvalidation, budget = 20,\
+        gamma = None):
+        """ crossvalidation: a linear crossvalidation, e.g.
+            SVCCVSkGridLinear, it selects C on the mapped points;
+            budget: maximum number of landmarks;
+            gamma: RBF kernel exp(-gamma * |x - y|^2), if None the inverse
+            median squared distance of the landmarks """
+
+        super(CMASVCRBFMetaModel, self).__init__()
+
+        self._window_size = window_size
+        self._scaling = scaling
+        self._training_infeasibles = deque(maxlen = self._window_size)
+        self._crossvalidation = crossvalidation
+        self._budget = budget
+        self._gamma = gamma
+
+        self.logger.add_binding('_selected_feasibles', 'selected_feasibles')
+        self.logger.add_binding('_selected_infeasibles', 'selected_infeasibles')
+        self.logger.add_binding('_best_acc', 'best_acc')
+        self.logger.add_binding('_best_parameter_C', 'best_parameter_C')
+        self.logger.add_binding('_best_gamma', 'best_gamma')
+
+    def add_sorted_feasibles(self, feasibles):
+        self._training_feasibles = feasibles
+
+    def add_infeasible(self, infeasible):
+        self._training_infeasibles.append(infeasible)
+
+    def _kernel(self, X, Y):
+        """ RBF kernel values of the rows of X to the rows of Y """
+        distances = (X ** 2).sum(axis = 1)[:, None] - 2 * dot(X, Y.T) +\
+            (Y ** 2).sum(axis = 1)[None, :]
+        return exp(-self._best_gamma * distances.clip(min = 0))
+
+    def _features(self, X):
+        """ Nystroem features of the scaled rows of X """
+        return dot(self._kernel(X, self._landmarks), self._projection)
+
+    def _setup_landmarks(self, X):
+        """ choose at most budget landmarks of the training points and the
+            whitening projection of their kernel matrix """
+
+        if(len(X) > self._budget):
+            X = X[permutation(len(X))[:self._budget]]
+        self._landmarks = X
+
+        self._best_gamma = self._gamma
+        if(self._best_gamma == None):
+            distances = ((X[:, None, :] - X[None, :, :]) ** 2).sum(axis = 2)
+            self._best_gamma = 1.0 / median(distances[distances > 0])
+
+        # K^(-1/2) of the landmarks, without the degenerate directions
+        values, vectors = eigh(self._kernel(X, X))
+        keep = values > 1e-10 * values.max()
+        self._projection = vectors[:, keep] / sqrt(values[keep])
+
+    def check_feasibility(self, individual):
+        """ Check the feasibility with meta model """
+
+        scaled = asarray(self._scaling.scale(individual.astype(self._dtype)))
+        return self._clf.predict(self._features(scaled))[0] >= 0
+
+    def check_feasibilities(self, population):
+        """ Check the feasibility of all individuals of a Population with
+            the meta model, return an array of booleans """
+
+        if(len(population) == 0):
+            return zeros(0, dtype = bool)
+
+        scaled = self._scaling.scale(population.positions.astype(self._dtype))
+        return asarray(self._clf.predict(self._features(asarray(scaled)))) >= 0
+
+    def train(self):
+        """ Train a meta model classification with new points, return True
+            if training was successful, False if not enough infeasible points
+            are gathered """
+
+        if(len(self._training_infeasibles) < self._window_size):
+            self._selected_feasibles = None
+            self._selected_infeasibles = None
+            self._best_parameter_C = None
+            self._best_acc = None
+            self._best_gamma = None
+            self.logger.log()
+            return False
+
+        cv_feasibles = [f.astype(self._dtype)\
+            for f in self._training_feasibles[:self._window_size]]
+        cv_infeasibles = [inf.astype(self._dtype)\
+            for inf in self._training_infeasibles]
+
+        self._scaling.setup(cv_feasibles + cv_infeasibles)
+
+        scale = lambda child : asarray(self._scaling.scale(child)).ravel()
+        X = array(map(scale, cv_feasibles + cv_infeasibles))
+        self._setup_landmarks(X)
+
+        features = [matrix(f) for f in self._features(X)]
+        self._selected_feasibles, self._selected_infeasibles,\
+        self._best_parameter_C, self._best_acc =\
+            self._crossvalidation.crossvalidate(\
+                features[:len(cv_feasibles)], features[len(cv_feasibles):])
+
+        fvalues = [f.getA1() for f in self._selected_feasibles]
+        ivalues = [i.getA1() for i in self._selected_infeasibles]
+
+        points = ivalues + fvalues
+        labels = [-1] * len(ivalues) + [1] * len(fvalues)
+
+        from sklearn import svm
+        self._clf = svm.SVC(kernel = 'linear', C = self._best_parameter_C,\
+            tol = 1.0)
+        self._clf.fit(points, labels)
+
+        self.logger.log()
+        return True
@@ -20,10 +20,6 @@ evopy.  If not, see <http://www.gnu.org/licenses/>.
 from math import floor
 from numpy import array
 
-from sklearn.svm import SVC
-from sklearn.grid_search import GridSearchCV
-from sklearn.cross_validation import KFold
-from sklearn.cross_validation import LeaveOneOut
 
 class SVCCVSkGridLinear():
     """ A strategy for crossvalidation """
@@ -43,6 +39,8 @@ class SVCCVSkGridLinear():
         X = array([f.getA1() for f in feasible] + [i.getA1() for i in infeasible])
         y = array([1] * len(feasible) + [-1] * len(infeasible))
 
+        from sklearn.svm import SVC
+        from sklearn.grid_search import GridSearchCV
         clf = GridSearchCV(SVC(), tuned_parameters, cv=self._cv_method, verbose=0)
 
         clf.fit(X, y)
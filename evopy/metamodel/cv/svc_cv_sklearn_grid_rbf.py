@@ -20,10 +20,6 @@ evopy.  If not, see <http://www.gnu.org/licenses/>.
 from math import floor
 from numpy import array
 
-from sklearn.svm import SVC
-from sklearn.grid_search import GridSearchCV
-from sklearn.cross_validation import KFold
-from sklearn.cross_validation import LeaveOneOut
 
 class SVCCVSkGridRBF():
     """ A strategy for crossvalidation """
@@ -45,6 +41,8 @@ class SVCCVSkGridRBF():
         X = array([f.value for f in feasible] + [i.value for i in infeasible])
         y = array([1] * len(feasible) + [-1] * len(infeasible))
 
+        from sklearn.svm import SVC
+        from sklearn.grid_search import GridSearchCV
         clf = GridSearchCV(SVC(), tuned_parameters, cv=self._cv_method)
 
         clf.fit(X, y)
@@ -0,0 +1,184 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from math import ceil
+
+from numpy import array, asarray, ones, hstack, vstack, dot, sign, argsort
+from numpy import triu_indices, zeros, concatenate
+from numpy.linalg import lstsq
+
+from meta_model import MetaModel
+
+class LQFitnessMetaModel(MetaModel):
+    """ Linear-quadratic fitness meta model over an archive of evaluated
+        points, after lq-CMA-ES, Hansen 2019. A Population is pre-ranked
+        by the model and only its most promising individuals get a true
+        fitness evaluation, in increments, until the Kendall rank
+        correlation of model and true fitness on the recent archive
+        points reaches tau_threshold. The other individuals get their
+        model fitness, shifted behind the worst true fitness. The model is
+        linear, diagonal or full quadratic, depending on the archive size.
+        Oversampling is a larger lambda of the optimizer. """
+
+    def __init__(self, tau_threshold = 0.85, increment = 0.05,\
+        archive_size = None):
+        """ tau_threshold: rank correlation to trust the model;
+            increment: part of the population evaluated per increment;
+            archive_size: number of most recent evaluated points the model
+            is fitted on, twice the full quadratic degrees of freedom if
+            None """
+
+        super(LQFitnessMetaModel, self).__init__()
+
+        self._tau_threshold = tau_threshold
+        self._increment = increment
+        self._archive_size = archive_size
+        self._positions = None
+        self._fitnesses = zeros(0)
+        self._coefficients = None
+
+        self._tau = None
+        self._model = None
+        self._count_evaluated = 0
+        self._count_predicted = 0
+
+        self.logger.add_binding('_tau', 'tau')
+        self.logger.add_binding('_model', 'model')
+        self.logger.add_binding('_count_evaluated', 'count_evaluated')
+        self.logger.add_binding('_count_predicted', 'count_predicted')
+
+    def _degrees_of_freedom(self, N):
+        return {'linear' : N + 1, 'diagonal' : 2 * N + 1,\
+            'full' : N * (N + 3) / 2 + 1}
+
+    def _design(self, X, model):
+        """ rows of the model features [1, x, x^2 or x_i x_j] """
+        columns = [ones((len(X), 1)), X]
+        if(model == 'diagonal'):
+            columns.append(X ** 2)
+        elif(model == 'full'):
+            i, j = triu_indices(X.shape[1])
+            columns.append(X[:, i] * X[:, j])
+        return hstack(columns)
+
+    def add(self, positions, fitnesses):
+        """ add evaluated points to the archive """
+
+        positions = asarray(positions, dtype = float)
+        if(self._positions is None):
+            self._positions = positions
+            if(self._archive_size == None):
+                N = positions.shape[1]
+                self._archive_size =\
+                    2 * self._degrees_of_freedom(N)['full']
+        else:
+            self._positions = vstack([self._positions, positions])
+        self._fitnesses = concatenate([self._fitnesses, fitnesses])
+
+        self._positions = self._positions[-self._archive_size:]
+        self._fitnesses = self._fitnesses[-self._archive_size:]
+
+    def train(self):
+        """ fit the richest model the archive allows, return False if there
+            are too few points for a linear model """
+
+        n, N = self._positions.shape
+        self._model = None
+        for model in ['full', 'diagonal', 'linear']:
+            if(n >= int(1.1 * self._degrees_of_freedom(N)[model]) + 1):
+                self._model = model
+                break
+        if(self._model == None):
+            self._coefficients = None
+            return False
+
+        self._coefficients = lstsq(\
+            self._design(self._positions, self._model), self._fitnesses,\
+            rcond = -1)[0]
+        return True
+
+    def predict(self, positions):
+        """ model fitness of the rows of positions """
+        return dot(self._design(asarray(positions, dtype = float),\
+            self._model), self._coefficients)
+
+    def _kendall_tau(self, x, y):
+        """ Kendall rank correlation of two arrays """
+        i, j = triu_indices(len(x), 1)
+        concordance = sign(x[i] - x[j]) * sign(y[i] - y[j])
+        if(len(concordance) == 0):
+            return 0.0
+        return concordance.mean()
+
+    def _recent_tau(self, evaluated, n):
+        """ rank correlation on the most recent archive points """
+        recent = max(15, min(int(1.2 * evaluated), int(0.75 * n)))
+        positions = self._positions[-recent:]
+        return self._kendall_tau(self.predict(positions),\
+            self._fitnesses[-recent:])
+
+    def screen(self, population, fitness):
+        """ fill the fitnesses of a Population, fitness(i) returns the true
+            fitness of the i-th individual; return the number of true
+            fitness evaluations """
+
+        n = len(population)
+        evaluate = lambda indices :\
+            [fitness(i) for i in indices]
+
+        if(self._positions is None or not self.train()):
+            population.fitnesses[:] = evaluate(range(n))
+            self.add(population.positions, population.fitnesses)
+            self._tau = None
+            self._count_evaluated, self._count_predicted = n, 0
+            self.logger.log()
+            return n
+
+        increment = max(1, int(ceil(self._increment * n)))
+        evaluated = []
+        predictions = self.predict(population.positions)
+        self._tau = None
+        while(len(evaluated) < n):
+            # the best ranked individuals which are not evaluated yet
+            remaining = [i for i in argsort(predictions, kind = 'mergesort')\
+                if not i in evaluated][:increment]
+            population.fitnesses[remaining] = evaluate(remaining)
+            self.add(population.positions[remaining],\
+                population.fitnesses[remaining])
+            evaluated.extend(remaining)
+
+            if(not self.train()):
+                continue
+            predictions = self.predict(population.positions)
+            self._tau = self._recent_tau(len(evaluated), n)
+            if(self._tau >= self._tau_threshold):
+                break
+
+        # the predicted individuals rank behind the evaluated ones
+        predicted = array([i for i in range(n) if not i in evaluated],\
+            dtype = int)
+        if(len(predicted) > 0):
+            shift = max(0.0, population.fitnesses[evaluated].max() -\
+                predictions[predicted].min())
+            population.fitnesses[predicted] = predictions[predicted] + shift
+
+        self._count_evaluated = len(evaluated)
+        self._count_predicted = len(predicted)
+        self.logger.log()
+        return len(evaluated)
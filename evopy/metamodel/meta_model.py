@@ -17,6 +17,8 @@ You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
+from numpy import float64
+
 from sys import path
 path.append("../../..")
 from evopy.helper.logger import Logger
@@ -24,3 +26,8 @@ from evopy.helper.logger import Logger
 class MetaModel(object):
     def __init__(self):
         self.logger = Logger(self)
+        self._dtype = float64
+
+    def set_dtype(self, dtype):
+        """ set the floating point type of scaling and prediction """
+        self._dtype = dtype
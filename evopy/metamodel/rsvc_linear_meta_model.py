@@ -20,12 +20,9 @@ evopy.  If not, see <http://www.gnu.org/licenses/>.
 from collections import deque
 from copy import deepcopy
 
-from sklearn import svm
-from sklearn import __version__ as sklearn_version
-
 from numpy import sum, sqrt, mean, arctan2, pi, matrix, sin, cos
 from numpy import matrix, cos, sin, inner, array, sqrt, arccos, pi, arctan2
-from numpy import transpose
+from numpy import transpose, asarray, zeros
 from numpy.random import rand
 from numpy.random import normal
 from numpy.linalg import inv
@@ -67,7 +64,7 @@ class RSVCLinearMetaModel(MetaModel):
     def check_feasibility(self, individual):
         """ Check the feasibility with meta model """
     	copied_individual = deepcopy(individual)
-    	copied_individual = matrix([[individual[0, 0]]])
+    	copied_individual = matrix([[individual[0, 0]]], dtype = self._dtype)
 	
         scaled_individual = self._scaling.scale(copied_individual)
         prediction = self._clf.predict(scaled_individual)
@@ -75,6 +72,17 @@ class RSVCLinearMetaModel(MetaModel):
         encode = lambda distance : False if distance < 0 else True
         return encode(prediction)
         
+    def check_feasibilities(self, population):
+        """ Check the feasibility of all individuals of a Population with
+            the meta model, return an array of booleans """
+
+        if(len(population) == 0):
+            return zeros(0, dtype = bool)
+
+        values = population.positions[:, 0:1].astype(self._dtype)
+        scaled = self._scaling.scale(values)
+        return asarray(self._clf.predict(asarray(scaled))).ravel() >= 0
+
     def train(self):
         """ Train a meta model classification with new points, return True
             if training was successful, False if not enough infeasible points 
@@ -108,6 +116,7 @@ class RSVCLinearMetaModel(MetaModel):
         points = ivalues + fvalues
         labels = [-1] * len(ivalues) + [1] * len(fvalues) 
 
+        from sklearn import svm
         self._clf = svm.SVC(kernel = 'linear', C = self._best_parameter_C, tol = 1.0)
         self._clf.fit(points, labels)  
         self.logger.log()
@@ -119,6 +128,7 @@ class RSVCLinearMetaModel(MetaModel):
         w = self._clf.coef_[0]
         nw = w / sqrt(sum(w ** 2))
  
+        from sklearn import __version__ as sklearn_version
         if sklearn_version == '0.10':
             return -nw 
         if sklearn_version == '0.11':
@@ -20,9 +20,6 @@ evopy.  If not, see <http://www.gnu.org/licenses/>.
 from collections import deque
 from copy import deepcopy
 
-from sklearn import svm
-from sklearn import __version__ as sklearn_version
-
 from numpy import sum, sqrt, mean, arctan2, pi, matrix, sin, cos
 from numpy import matrix, cos, sin, inner, array, sqrt, arccos, pi, arctan2
 from numpy import transpose
@@ -108,6 +105,7 @@ class SVCLinearMetaModel(MetaModel):
         points = ivalues + fvalues
         labels = [-1] * len(ivalues) + [1] * len(fvalues) 
 
+        from sklearn import svm
         self._clf = svm.SVC(kernel = 'linear', C = self._best_parameter_C, tol = 1.0)
         self._clf.fit(points, labels)  
         self.logger.log()
@@ -119,6 +117,7 @@ class SVCLinearMetaModel(MetaModel):
         w = self._clf.coef_[0]
         nw = w / sqrt(sum(w ** 2))
  
+        from sklearn import __version__ as sklearn_version
         if sklearn_version == '0.10':
             return -nw 
         if sklearn_version == '0.11':
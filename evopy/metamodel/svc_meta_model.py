@@ -17,8 +17,6 @@ You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-from sklearn import svm
-
 class SVCMetaModel:
     """ SVC meta model which classfies feasible and infeasible points """
 
@@ -29,6 +27,7 @@ class SVCMetaModel:
 
         points_svm = [i.value for i in infeasible] + [f.value for f in feasible]
         labels = [-1] * len(infeasible) + [1] * len(feasible) 
+        from sklearn import svm
         self._clf = svm.SVC(C = parameter_C, gamma = parameter_gamma)
         self._clf.fit(points_svm, labels)
 
@@ -34,10 +34,5 @@ class ScalingNormalization():
         self._max = temp.max(axis = 0)
 
     def scale(self, valx):
-        value = deepcopy(valx)
-
-        scale = lambda val, emin, emax : (2*(val - emin) / (emax - emin)) - 1
-        mat_scale = vectorize(scale)
-
-        value = mat_scale(valx, self._min, self._max)
-        return value
+        """ scale an individual or all rows of a Population array """
+        return (2 * (valx - self._min) / (self._max - self._min)) - 1
@@ -17,7 +17,7 @@ You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-from numpy import array, matrix, vectorize
+from numpy import array, matrix, vectorize, where, multiply, asarray
 from copy import deepcopy
 
 class ScalingStandardscore():
@@ -33,12 +33,15 @@ class ScalingStandardscore():
         self._mean = temp.mean(axis = 0)
         self._std = temp.std(axis = 0)
 
+        # coordinates without deviation are not scaled
+        self._shift = asarray(where(self._std != 0, self._mean, 0),\
+            dtype = temp.dtype)
+        self._factor = asarray(where(self._std != 0, self._std, 1),\
+            dtype = temp.dtype)
+
     def scale(self, valx):
-        scale = lambda val, mean, std : (val - mean) / std if std != 0 else val
-        _mat_scale = vectorize(scale) 
-        return _mat_scale(valx, self._mean, self._std)   
+        """ scale an individual or all rows of a Population array """
+        return (valx - self._shift) / self._factor
 
     def descale(self, valx):
-        descale = lambda val, mean, std : (val * std) + mean if std != 0 else val
-        _mat_descale = vectorize(descale) 
-        return _mat_descale(valx, self._mean, self._std)
+        return multiply(valx, self._factor) + self._shift
@@ -23,6 +23,6 @@ class Accuracy(object):
         self._accuracy = accuracy
         self._threshold = self._optimum_fitness + self._accuracy
 
-    def terminate(self, best_fitness, generations):
+    def terminate(self, best_fitness, generations, simulator = None):
         return best_fitness <= self._threshold
 
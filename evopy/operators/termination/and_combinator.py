@@ -21,7 +21,7 @@ class ANDCombinator():
     def __init__(self, conditions):
         self._conditions = conditions 
 
-    def terminate(self, best_fitness, generations):
-        call = lambda c : c.terminate(best_fitness, generations)
+    def terminate(self, best_fitness, generations, simulator = None):
+        call = lambda c : c.terminate(best_fitness, generations, simulator)
         results = map(call, self._conditions)
         return reduce(lambda c1, c2 : c1 and c2, results)
@@ -0,0 +1,34 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+class ConditionCov(object):
+    """ terminate if the condition number of the CMA-ES covariance matrix
+        exceeds max_condition """
+
+    def __init__(self, max_condition = 1e14):
+        self._max_condition = max_condition
+
+    def terminate(self, best_fitness, generations, simulator):
+        optimizer = simulator.optimizer
+        if(not '_D' in dir(optimizer)):
+            return False
+
+        # D holds the square roots of the eigenvalues of C
+        condition = (max(optimizer._D) / min(optimizer._D)) ** 2
+        return condition > self._max_condition
@@ -24,7 +24,7 @@ class Convergence(object):
         self._distance = distance
         self._first_run = True
 
-    def terminate(self, best_fitness, generations):
+    def terminate(self, best_fitness, generations, simulator = None):
         if(self._first_run): 
             self._last_best = best_fitness
             self._first_run = False
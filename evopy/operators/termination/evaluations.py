@@ -0,0 +1,40 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+class Evaluations(object):
+    """ terminate if the fitness and constraint function calls of all
+        generations exceed the budget """
+
+    def __init__(self, budget):
+        self._budget = budget
+        # evaluations and counted generations per simulator, the
+        # simulators of a sweep may share one termination
+        self._states = {}
+
+    def terminate(self, best_fitness, generations, simulator):
+        # only the generations logged since the last call are added
+        logs = simulator.logger.all()
+        ffc, cfc = logs['count_ffc'], logs['count_cfc']
+        evaluations, counted = self._states.get(id(simulator), (0, 0))
+        if(len(ffc) < counted):
+            # a new simulator at the address of a finished one
+            evaluations, counted = 0, 0
+        evaluations += sum(ffc[counted:]) + sum(cfc[counted:])
+        self._states[id(simulator)] = (evaluations, len(ffc))
+        return evaluations >= self._budget
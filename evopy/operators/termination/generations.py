@@ -21,6 +21,6 @@ class Generations(object):
     def __init__(self, generations):
         self._generations = generations
 
-    def terminate(self, best_fitness, generations):
+    def terminate(self, best_fitness, generations, simulator = None):
         return generations > self._generations 
 
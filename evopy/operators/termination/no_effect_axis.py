@@ -0,0 +1,41 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import all, abs, zeros
+
+class NoEffectAxis(object):
+    """ terminate if adding 0.1 standard deviations along a principal axis
+        of the CMA-ES search distribution does not change the mean, the 
+        axis is cycled with the generations """
+
+    def terminate(self, best_fitness, generations, simulator):
+        optimizer = simulator.optimizer
+        if(not '_B' in dir(optimizer)):
+            return False
+
+        xmean = optimizer._xmean
+        i = generations % xmean.size
+        if(optimizer._B is None):
+            # separable CMA-ES, the axes are the unit vectors
+            axis = zeros(xmean.shape)
+            axis[0, i] = 1.0
+        else:
+            axis = optimizer._B[:, i].T
+        shift = 0.1 * abs(optimizer._sigma) * optimizer._D[i] * axis
+        return all(xmean + shift == xmean)
@@ -0,0 +1,36 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import any, abs, sqrt, diag
+
+class NoEffectCoord(object):
+    """ terminate if adding 0.2 standard deviations in any coordinate
+        does not change the mean of the CMA-ES search distribution """
+
+    def terminate(self, best_fitness, generations, simulator):
+        optimizer = simulator.optimizer
+        if(not '_C' in dir(optimizer)):
+            return False
+
+        xmean = optimizer._xmean.getA1()
+        C = optimizer._C
+        # the separable CMA-ES keeps only the diagonal of C
+        variances = C if C.ndim == 1 else diag(C)
+        shift = 0.2 * abs(optimizer._sigma) * sqrt(variances)
+        return any(xmean + shift == xmean)
@@ -21,8 +21,8 @@ class ORCombinator():
     def __init__(self, conditions):
         self._conditions = conditions 
 
-    def terminate(self, best_fitness, generations):
-        delegate = lambda c : c.terminate(best_fitness, generations)
+    def terminate(self, best_fitness, generations, simulator = None):
+        delegate = lambda c : c.terminate(best_fitness, generations, simulator)
         results = map(delegate, self._conditions)
         return reduce(lambda c1, c2 : c1 or c2, results)
         
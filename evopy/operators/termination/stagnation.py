@@ -0,0 +1,50 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from collections import deque
+from numpy import median
+
+class Stagnation(object):
+    """ terminate if the median fitness of the offspring has not improved 
+        within window generations: the median of the last 30% is not 
+        better than the median of the first 30% of the window """
+
+    def __init__(self, window):
+        self._window = window
+        self._part = max(1, int(0.3 * window))
+        # window and counted generations per simulator, the simulators of
+        # a sweep may share one termination
+        self._states = {}
+
+    def terminate(self, best_fitness, generations, simulator):
+        # only the generations logged since the last call are added
+        medians = simulator.logger.all()['median_fitness']
+        window, counted = self._states.get(id(simulator), (None, 0))
+        if(window == None or len(medians) < counted):
+            # a new simulator, or one at the address of a finished one
+            window, counted = deque(maxlen = self._window), 0
+        window.extend(medians[counted:])
+        self._states[id(simulator)] = (window, len(medians))
+        if(len(window) < self._window):
+            return False
+
+        window = list(window)
+        first = median(window[:self._part])
+        last = median(window[-self._part:])
+        return last >= first
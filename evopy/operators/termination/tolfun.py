@@ -0,0 +1,39 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+class TolFun(object):
+    """ terminate if the best fitness of the last window generations 
+        varies less than tolerance """
+
+    def __init__(self, tolerance, window):
+        self._tolerance = tolerance
+        self._window = window
+        # best fitnesses per simulator, the simulators of a sweep may share
+        # one termination
+        self._histories = {}
+
+    def terminate(self, best_fitness, generations, simulator = None):
+        key = id(simulator) if simulator != None else None
+        history = self._histories.get(key, [])
+        history = (history + [best_fitness])[-self._window:]
+        self._histories[key] = history
+        if(len(history) < self._window):
+            return False
+
+        return max(history) - min(history) < self._tolerance
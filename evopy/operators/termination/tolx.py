@@ -0,0 +1,34 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import abs
+
+class TolX(object):
+    """ terminate if the largest standard deviation of the CMA-ES search
+        distribution, sigma * max(D), falls below tolerance """
+
+    def __init__(self, tolerance):
+        self._tolerance = tolerance
+
+    def terminate(self, best_fitness, generations, simulator):
+        optimizer = simulator.optimizer
+        if(not '_D' in dir(optimizer)):
+            return False
+
+        return abs(optimizer._sigma) * max(optimizer._D) < self._tolerance
@@ -0,0 +1,89 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from sys import path
+path.append("../..")
+from evopy.helper.logger import Logger
+
+class Constraint(object):
+    """ a single constraint g(x) >= 0 of a problem, with an estimate of
+        the cost of one evaluation in arbitrary units """
+
+    def __init__(self, function, cost = 1.0, name = None):
+        self.function = function
+        self.cost = cost
+        self.name = name
+
+    def satisfied(self, x):
+        return self.function(x) >= 0
+
+class LazyConstraints(object):
+    """ evaluates the constraints of a problem lazily, stops at the first
+        violated one. The constraints are ordered by cost per observed
+        violation rate, which minimizes the expected cost of a check for
+        independent constraints, so cheap and often violated constraints
+        come first. """
+
+    def __init__(self, constraints):
+        self.constraints = list(constraints)
+        self.logger = Logger(self)
+
+        self._checks = [0] * len(self.constraints)
+        self._violations = [0] * len(self.constraints)
+        self._order = self._ordering()
+
+        self._cost = 0.0
+        self._count_checks = [0] * len(self.constraints)
+        self.logger.add_binding('_cost', 'constraint_cost')
+        self.logger.add_binding('_count_checks', 'constraint_checks')
+
+    def _violation_rate(self, index):
+        """ Laplace estimate of the violation rate of a constraint """
+        return (self._violations[index] + 1.0) / (self._checks[index] + 2.0)
+
+    def _ordering(self):
+        key = lambda index :\
+            self.constraints[index].cost / self._violation_rate(index)
+        return sorted(range(len(self.constraints)), key = key)
+
+    def violated(self, x):
+        """ index of the first violated constraint, None if x is feasible """
+
+        violated = None
+        for index in self._order:
+            constraint = self.constraints[index]
+            self._checks[index] += 1
+            self._count_checks[index] += 1
+            self._cost += constraint.cost
+            if(not constraint.satisfied(x)):
+                self._violations[index] += 1
+                violated = index
+                break
+
+        self._order = self._ordering()
+        return violated
+
+    def is_feasible(self, x):
+        return self.violated(x) == None
+
+    def log(self):
+        """ log the cost and checks since the last call """
+        self.logger.log()
+        self._cost = 0.0
+        self._count_checks = [0] * len(self.constraints)
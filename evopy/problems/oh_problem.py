@@ -23,6 +23,7 @@ class OHProblem():
 
     description = "Sphere function with origin hyperplane restriction"
     description_short = "OH"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 10):
         self._d = dimensions
@@ -21,6 +21,7 @@ class SchwefelsProblem12():
     
     description = "Schwefel's problem 1.2"
     description_short = "Schwefel12"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 100):
         self._d = dimensions
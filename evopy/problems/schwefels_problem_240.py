@@ -17,12 +17,50 @@ You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
+from evopy.problems.constraint import Constraint
+
+def check_dimensions(x, dimensions):
+    if(x.size != dimensions):
+        raise Exception("expected a position of %d dimensions, got %d" %\
+            (dimensions, x.size))
+
+class LowerBound(object):
+    """ g(x) = x_i """
+    def __init__(self, index, dimensions):
+        self._index = index
+        self._d = dimensions
+
+    def __call__(self, x):
+        check_dimensions(x, self._d)
+        return x[0, self._index]
+
+class WeightedSum(object):
+    """ g(x) = 50000 - sum (9 + i) x_i """
+    def __init__(self, dimensions):
+        self._d = dimensions
+
+    def __call__(self, x):
+        check_dimensions(x, self._d)
+        return 50000 - sum([(9 + (i + 1)) * x[0, i] for i in range(self._d)])
+
 class SchwefelsProblem240():
 
     description = "Schwefel's problem 2.40"
     description_short = "Schwefel240"
+    deterministic = True
+
+    def __init__(self, dimensions = 5):
+        self._d = dimensions
+
+    def constraints(self):
+        """ g1 - g5 and g6 as single constraints, for a lazy evaluation """
+        bounds = [Constraint(LowerBound(i, self._d), 0.1, "g%d" % (i + 1))\
+            for i in range(self._d)]
+        return bounds +\
+            [Constraint(WeightedSum(self._d), 1.0, "g%d" % (self._d + 1))]
 
     def is_feasible(self, x):
+        check_dimensions(x, self._d)
 
         m = x
         # g1, g5       
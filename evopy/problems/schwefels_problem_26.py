@@ -23,6 +23,7 @@ class SchwefelsProblem26:
 
     description = "Schwefel's problem 2.6"
     description_short = "Schwefel26"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 100):
         self._d = dimensions
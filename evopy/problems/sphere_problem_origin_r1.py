@@ -23,6 +23,7 @@ class SphereProblemOriginR1():
 
     description = "Sphere function with unorthogonal restriction in origin"
     description_short = "Sphere with R1"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 10):
         self._d = dimensions
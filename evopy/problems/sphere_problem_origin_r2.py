@@ -23,6 +23,7 @@ class SphereProblemOriginR2():
 
     description = "Sphere function with orthogonal restriction in origin"
     description_short = "Sphere with R2"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 10):
         self._d = dimensions
@@ -23,6 +23,7 @@ class TRProblem():
 
     description = "Sphere function with tangent restriction"
     description_short = "TR"
+    deterministic = True
 
     def __init__(self, dimensions = 2, size = 10):
         self._d = dimensions
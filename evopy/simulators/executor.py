@@ -0,0 +1,180 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import os
+import traceback
+import cPickle
+from time import time
+from threading import Thread
+from multiprocessing import Pool, cpu_count, current_process
+from Queue import Queue
+
+# function and items of the running fork map, inherited by the workers
+_forked = None
+
+def _configure_forked(workers, threads, affinity):
+    from evopy.external.playdoh import configure_worker
+    # the pool numbers its processes from 1
+    index = current_process()._identity[0] - 1
+    configure_worker(index, workers, threads, affinity)
+
+def _evaluate(function, item):
+    """ function(item), or the exception it raised with its traceback as
+        attribute, like playdoh's map """
+
+    try:
+        return function(item)
+    except Exception as error:
+        error.traceback = traceback.format_exc()
+        return error
+
+def _run_forked(index):
+    function, items = _forked
+    result = _evaluate(function, items[index])
+    if(isinstance(result, Exception)):
+        try:
+            cPickle.loads(cPickle.dumps(result, -1))
+        except Exception:
+            # not picklable, sent as a plain exception
+            return Exception(result.traceback)
+    return result
+
+class Executor(object):
+    """ runs independent jobs, e.g. simulator.simulate() of a sweep, on
+        workers of this machine; a drop-in for playdoh's map, an item
+        which raised has the exception as its result:
+
+            Executor('thread').map(lambda s : s.simulate(), simulators)
+
+        mode 'thread': a thread pool in this process, nothing is pickled,
+        NumPy/BLAS and sklearn release the GIL in their heavy kernels;
+        mode 'fork': a process pool forked from this process, only the
+        results are pickled back;
+        mode 'auto': the first workers jobs run on threads, if their CPU
+        time per wall time shows that the GIL serializes them, the other
+        jobs run forked. The numpy.random state is shared by the threads,
+        so threaded runs are not reproducible by seeding.
+        The BLAS and OpenMP threads of every worker are limited, so the
+        workers do not oversubscribe the CPUs. """
+
+    def __init__(self, mode = 'auto', workers = None, threshold = 0.5,\
+        threads = None, affinity = False):
+        """ workers: number of threads or processes, the number of CPUs if
+            None; threshold: the probe falls back to 'fork' if less than
+            threshold * workers CPUs were busy; threads: BLAS/OpenMP threads
+            per worker, the CPUs are split between the workers if None;
+            affinity: pin each forked worker to its CPUs """
+
+        if(not mode in ['auto', 'thread', 'fork']):
+            raise Exception("unknown executor mode: " + str(mode))
+
+        self.mode = mode
+        self.workers = workers if workers != None else cpu_count()
+        self.threshold = threshold
+        self.threads = threads
+        self.affinity = affinity
+        self.parallelism = None
+        self.used_mode = None
+
+    def _cpu_time(self):
+        times = os.times()
+        return times[0] + times[1]
+
+    def _map_threads(self, function, items):
+        from evopy.external.playdoh import worker_threads
+        from evopy.external.playdoh import limit_threads, restore_threads
+        # the limit is global to the process, shared by the threads
+        threads = self.threads if self.threads != None else\
+            worker_threads(min(self.workers, len(items)))
+        previous = limit_threads(threads)
+        try:
+            return self._run_threads(function, items)
+        finally:
+            restore_threads(previous)
+
+    def _run_threads(self, function, items):
+        results = [None] * len(items)
+        queue = Queue()
+        for index in range(len(items)):
+            queue.put(index)
+
+        def work():
+            while(not queue.empty()):
+                try:
+                    index = queue.get_nowait()
+                except Exception:
+                    return
+                results[index] = _evaluate(function, items[index])
+
+        threads = [Thread(target = work)\
+            for i in range(min(self.workers, len(items)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _map_fork(self, function, items):
+        global _forked
+        _forked = (function, items)
+        workers = min(self.workers, len(items))
+        pool = Pool(workers, _configure_forked,\
+            (workers, self.threads, self.affinity))
+        try:
+            return pool.map(_run_forked, range(len(items)), chunksize = 1)
+        finally:
+            pool.close()
+            pool.join()
+            _forked = None
+
+    def _probe(self, function, items):
+        """ run items on threads, return the results and the number of
+            CPUs which were busy on average """
+
+        start, cpu = time(), self._cpu_time()
+        results = self._map_threads(function, items)
+        wall = time() - start
+        if(wall <= 0):
+            return results, float(len(items))
+        return results, (self._cpu_time() - cpu) / wall
+
+    def map(self, function, items):
+        """ return [function(item) for item in items], computed in
+            parallel; the exception of an item which raised is its result,
+            with the traceback as attribute traceback """
+
+        items = list(items)
+        if(self.mode == 'fork'):
+            self.used_mode = 'fork'
+            return self._map_fork(function, items)
+        if(self.mode == 'thread' or self.workers == 1):
+            self.used_mode = 'thread'
+            return self._map_threads(function, items)
+
+        probe = min(self.workers, len(items))
+        results, self.parallelism = self._probe(function, items[:probe])
+        if(self.parallelism >= self.threshold * probe):
+            self.used_mode = 'thread'
+            return results + self._map_threads(function, items[probe:])
+
+        self.used_mode = 'fork'
+        if(len(items) == probe):
+            return results
+        return results + self._map_fork(function, items[probe:])
@@ -0,0 +1,224 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+from numpy import vsplit, sqrt, minimum, maximum, newaxis
+
+from sys import path
+path.append("../..")
+
+from evopy.helper.population import Population
+from evopy.simulators.simulator import Simulator
+from evopy.external.playdoh import ParallelTask, start_task, allocate
+from evopy.external.playdoh import close_servers
+
+def get_topology(name, islands):
+    """ tubes (name, source, target) of a ring or a star topology,
+        island 0 is the center of the star """
+
+    edges = []
+    if name == 'ring':
+        if islands > 1:
+            edges = [(i, (i + 1) % islands) for i in range(islands)]
+    elif name == 'star':
+        for i in range(1, islands):
+            edges += [(0, i), (i, 0)]
+    else:
+        raise Exception("unknown topology: " + str(name))
+
+    return [("island_%d_%d" % (i, j), i, j) for (i, j) in edges]
+
+class Island(Simulator):
+
+    description = "Island of an island-model Simulator"
+    description_short = "Island"
+
+    def __init__(self, optimizer, problem, termination, migrants = 1,\
+        share_infeasibles = False):
+
+        super(Island, self).__init__(optimizer, problem, termination)
+
+        self._migrants = migrants
+        self._share_infeasibles = share_infeasibles
+        self._immigrants = []
+        self._emigrants = []
+        self._infeasibles = []
+
+        self._count_immigrants = 0
+        self.logger.add_binding('_count_immigrants', 'count_immigrants')
+
+    def _tell_feasibility(self, feasibility_information):
+        if(self._share_infeasibles and\
+            isinstance(feasibility_information, Population)):
+            infeasible = feasibility_information.infeasible()
+            self._infeasibles.extend(\
+                [infeasible.position(i) for i in range(len(infeasible))])
+        elif(self._share_infeasibles):
+            for solution, feasibility in feasibility_information:
+                if(not feasibility):
+                    self._infeasibles.append(\
+                        vsplit(solution, solution.shape[0])[0])
+
+        return super(Island, self)._tell_feasibility(feasibility_information)
+
+    def _tell_fitness(self, fitnesses):
+        # the best individuals of this generation leave the island, the
+        # immigrants compete with the offspring in the selection
+        self._count_immigrants = len(self._immigrants)
+        if(isinstance(fitnesses, Population)):
+            self._emigrants =\
+                fitnesses.sort(self._migrants).fitness_tuples()
+            if(len(self._immigrants) > 0):
+                fitnesses = Population.concatenate(\
+                    [fitnesses, self._inject(self._immigrants)])
+        else:
+            fitness = lambda (child, fitness) : fitness
+            self._emigrants = sorted(fitnesses, key = fitness)[:self._migrants]
+            if(len(self._immigrants) > 0):
+                fitnesses = fitnesses +\
+                    self._inject(self._immigrants).fitness_tuples()
+        self._immigrants = []
+
+        return super(Island, self)._tell_fitness(fitnesses)
+
+    def _inject(self, immigrants):
+        """ Population of the immigrants, their steps from the mean are
+            shortened to the Mahalanobis length sqrt(N) + 2N / (N + 2) of
+            the search distribution (Hansen 2011, injecting external
+            solutions into CMA-ES), a far away immigrant does not wreck the
+            evolution paths and sigma of the optimizer """
+
+        population = Population.of_fitnesses(immigrants)
+        if(not 'mahalanobis_norm' in dir(self.optimizer)):
+            return population
+
+        xmean = self.optimizer._xmean.getA()
+        sigma = self.optimizer._sigma
+        steps = (population.positions - xmean) / sigma
+        N = steps.shape[1]
+        bound = sqrt(N) + 2.0 * N / (N + 2)
+        lengths = self.optimizer.mahalanobis_norm(steps)
+        scale = minimum(1.0, bound / maximum(lengths, 1e-300))
+        population.positions = xmean + sigma * steps * scale[:, newaxis]
+        return population
+
+    def emigrate(self):
+        """ return the best individuals with their fitness and the
+            infeasible positions found since the last migration """
+
+        infeasibles, self._infeasibles = self._infeasibles, []
+        return (self._emigrants, infeasibles)
+
+    def immigrate(self, migration):
+        """ add individuals to the next selection, and infeasible positions
+            to the meta model of the optimizer """
+
+        immigrants, infeasibles = migration
+        self._immigrants.extend(immigrants)
+        if('meta_model' in dir(self.optimizer)):
+            for infeasible in infeasibles:
+                self.optimizer.meta_model.add_infeasible(infeasible)
+
+class IslandTask(ParallelTask):
+    """ playdoh task evolving one island, migrations are sent to all
+        outgoing tubes and received from all incoming tubes without
+        waiting for the other islands """
+
+    def initialize(self, island, migration_interval):
+        self.island = island
+        self.migration_interval = migration_interval
+        self.generations = 0
+
+    def migrate(self):
+        migration = self.island.emigrate()
+        for name in self.tubes_out:
+            self.push(name, migration)
+        for name in self.tubes_in:
+            while(not self.empty(name)):
+                self.island.immigrate(self.pop(name))
+
+    def start(self):
+        while(True):
+            optimum_fitness = self.island._generation()
+            self.generations += 1
+
+            if(self.generations % self.migration_interval == 0):
+                self.migrate()
+
+            if(self.island.termination.terminate(optimum_fitness,\
+                self.island._generations, self.island)):
+                break
+
+        self.result = self.island
+
+    def get_info(self):
+        return self.generations
+
+class IslandSimulator(object):
+
+    name = "evopy: framework for experimention in evolutionary computing"
+    description = "Island-model Simulator"
+    description_short = "Island-model Simulator"
+
+    def __init__(self, simulators, topology = 'ring', migration_interval = 10,\
+        migrants = 1, share_infeasibles = False, machines = []):
+        """ simulators: one Simulator per island, all with the same kind of
+            optimizer; topology: 'ring', 'star' or a list of tubes
+            (name, source, target); machines: playdoh servers, the local
+            machine if empty """
+
+        self.islands = [Island(simulator.optimizer, simulator.problem,\
+            simulator.termination, migrants, share_infeasibles)\
+            for simulator in simulators]
+
+        if(type(topology) == str):
+            topology = get_topology(topology, len(self.islands))
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.machines = machines
+
+    def _information(self):
+        print ("-" * 80) + "\n" + self.name +"\n" + ("-" * 80)
+        print "simulator: " + self.description
+        print "islands: %d" % len(self.islands)
+        print "optimizer: " + self.islands[0].optimizer.description
+        print "problem: " + self.islands[0].problem.description
+        print "-" * 80
+
+    def simulate(self):
+        self._information()
+        islands = len(self.islands)
+        allocation = allocate(machines = self.machines, cpu = islands)
+        if(allocation.total_units < islands):
+            if(allocation.local):
+                close_servers(allocation.machine_tuples)
+            raise Exception("%d islands but only %d units available" %\
+                (islands, allocation.total_units))
+
+        task = start_task(IslandTask,\
+            topology = self.topology,\
+            allocation = allocation,\
+            args = (self.islands, self.migration_interval))
+
+        self.islands = task.get_result()
+        return self
+
+    def best(self):
+        """ return the best fitness reached on all islands """
+        best_fitness = lambda island :\
+            island.optimizer.logger.all()['best_fitness'][-1]
+        return min(map(best_fitness, self.islands))
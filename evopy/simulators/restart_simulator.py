@@ -0,0 +1,189 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+from copy import deepcopy
+from numpy import inf, floor
+from numpy.random import rand
+
+from sys import path
+path.append("../..")
+
+from evopy.helper.logger import Logger
+from evopy.simulators.simulator import Simulator
+from evopy.operators.termination.or_combinator import ORCombinator
+from evopy.operators.termination.evaluations import Evaluations
+
+class RestartSimulator(object):
+
+    name = "evopy: framework for experimention in evolutionary computing"
+    description = "Restart Simulator"
+    description_short = "Restart Simulator"
+
+    def __init__(self, optimizer_factory, problem, termination, budget,\
+        lambd, sigma, regime = 'ipop', workers = 1, target = None,\
+        carry_over = False, machines = []):
+        """ optimizer_factory: function (lambd, sigma) returning a new
+            optimizer, e.g. a CMAES or CMAESSVC with a random xmean;
+            termination: template of the termination of every run;
+            budget: fitness and constraint function calls of all runs;
+            lambd, sigma: default population size and step size;
+            regime: 'ipop' doubles lambda on every restart, 'bipop'
+            alternates between the doubled (large) populations and small
+            populations with random lambda and sigma;
+            workers: runs started at the same time, with playdoh on the
+            machines (the local machine if empty) if more than one;
+            target: stop all restarts if this fitness is reached;
+            carry_over: pass the infeasibles of the meta model on to the
+            next run (SVC optimizers only) """
+
+        if(not regime in ['ipop', 'bipop']):
+            raise Exception("unknown regime: " + str(regime))
+
+        self.optimizer_factory = optimizer_factory
+        self.problem = problem
+        self.termination = termination
+        self.budget = budget
+        self.lambd = lambd
+        self.sigma = sigma
+        self.regime = regime
+        self.workers = workers
+        self.target = target
+        self.carry_over = carry_over
+        self.machines = machines
+
+        self.simulators = []
+        self.logger = Logger(self)
+
+        self._large_lambd = lambd
+        self._evaluations = {'large' : 0, 'small' : 0}
+        self._infeasibles = []
+        self._best_fitness = inf
+
+    def _information(self):
+        print ("-" * 80) + "\n" + self.name +"\n" + ("-" * 80)
+        print "simulator: " + self.description
+        print "regime: " + self.regime
+        print "problem: " + self.problem.description
+        print "-" * 80
+
+    def _next_regime(self):
+        """ BIPOP starts a large population run only while the small
+            population runs used more evaluations """
+
+        if(self.regime == 'ipop'):
+            return 'large'
+        if(self._evaluations['small'] < self._evaluations['large']):
+            return 'small'
+        return 'large'
+
+    def _parameters(self, regime):
+        """ return lambda and sigma of the next run of the regime """
+
+        if(regime == 'large'):
+            lambd = self._large_lambd
+            self._large_lambd *= 2
+            return lambd, self.sigma
+
+        u = rand()
+        ratio = 0.5 * self._large_lambd / self.lambd
+        lambd = int(floor(self.lambd * ratio ** (u ** 2)))
+        return lambd, self.sigma * 10 ** (-2 * u)
+
+    def _simulator(self, regime, budget):
+        lambd, sigma = self._parameters(regime)
+        optimizer = self.optimizer_factory(lambd, sigma)
+        if(self.carry_over and 'meta_model' in dir(optimizer)):
+            for infeasible in self._infeasibles:
+                optimizer.meta_model.add_infeasible(infeasible)
+
+        termination = ORCombinator(\
+            [deepcopy(self.termination), Evaluations(budget)])
+        return Simulator(optimizer, self.problem, termination)
+
+    def _evaluations_of(self, simulator):
+        logs = simulator.logger.all()
+        return sum(logs['count_ffc']) + sum(logs['count_cfc'])
+
+    def _regimes(self):
+        """ regimes of the runs of the next round, IPOP doubles lambda for
+            every worker, BIPOP starts at most one large run per round """
+
+        regimes = []
+        for i in range(self.workers):
+            if(self.regime == 'bipop' and 'large' in regimes):
+                regimes.append('small')
+            else:
+                regimes.append(self._next_regime())
+        return regimes
+
+    def _round(self, remaining):
+        """ start the next runs with an equal part of the remaining
+            budget, return the runs and their regimes """
+
+        regimes = self._regimes()
+        budget = remaining / len(regimes)
+        simulators = [self._simulator(regime, budget) for regime in regimes]
+
+        simulate = lambda simulator : simulator.simulate()
+        if(self.workers > 1):
+            # loaded on demand, serial restarts do not need playdoh
+            from evopy.external.playdoh import map as pmap
+            simulators = pmap(simulate, simulators, machines = self.machines)
+            for simulator in simulators:
+                if(isinstance(simulator, Exception)):
+                    raise simulator
+        else:
+            simulators = map(simulate, simulators)
+
+        return zip(simulators, regimes)
+
+    def _merge(self, simulator, regime):
+        restart = len(self.simulators)
+        self.simulators.append(simulator)
+
+        constants = {'restart' : restart, 'regime' : regime}
+        self.logger.merge(simulator.optimizer.logger, constants)
+        self.logger.merge(simulator.logger)
+
+        evaluations = self._evaluations_of(simulator)
+        self._evaluations[regime] += evaluations
+
+        best_fitness = min(simulator.optimizer.logger.all()['best_fitness'])
+        self._best_fitness = min(self._best_fitness, best_fitness)
+
+        if(self.carry_over and 'meta_model' in dir(simulator.optimizer)):
+            self._infeasibles =\
+                list(simulator.optimizer.meta_model._training_infeasibles)
+
+        return evaluations
+
+    def simulate(self):
+        self._information()
+        remaining = self.budget
+        while(remaining > 0):
+            for simulator, regime in self._round(remaining):
+                remaining -= self._merge(simulator, regime)
+
+            if(self.target != None and self._best_fitness <= self.target):
+                break
+
+        return self
+
+    def best(self):
+        """ return the best fitness reached in all runs """
+        return self._best_fitness
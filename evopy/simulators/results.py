@@ -0,0 +1,120 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from os import makedirs
+from os.path import join, exists
+from uuid import uuid4
+
+from numpy import asarray, savez_compressed, load
+
+class Result(object):
+    """ the declared series and state of a finished simulation, series as
+        NumPy arrays where possible. result[name] returns the values as
+        the logger had them, as lists. """
+
+    def __init__(self, series, state, path = None):
+        self.series = series
+        self.state = state
+        self.path = path
+
+    def _decode(self, value):
+        if(hasattr(value, 'tolist')):
+            return value.tolist()
+        return value
+
+    def __getitem__(self, name):
+        if(name in self.state):
+            return self.state[name]
+        if(self.series == None):
+            stored = load(self.path, allow_pickle = True)
+            self.series = dict([(key, stored[key]) for key in stored.files])
+        return self._decode(self.series[name])
+
+class Results(object):
+    """ runs a simulator and returns a compact Result instead of the whole
+        simulator, to be mapped over a sweep:
+
+            compact = Results(['count_cfc', 'optimizer.best_fitness'])
+            simulate = lambda simulator : compact(simulator)
+            for result in pmap(simulate, simulators):
+                cfc = result['count_cfc']
+
+        A series 'a.b.name' is the log 'name' of the logger of
+        simulator.a.b, a state 'a.b.name' is the attribute
+        simulator.a.b.name after the simulation. Only these are pickled
+        back from the workers, not the optimizer, its meta model or its
+        other logs. """
+
+    def __init__(self, series, state = [], dtype = None, store = None):
+        """ series: names of logged series; state: names of attributes;
+            dtype: type of the floating point series, e.g. numpy.float32;
+            store: directory the workers write the series to, the Result
+            reads them on first access """
+
+        self.series = series
+        self.state = state
+        self.dtype = dtype
+        self.store = store
+
+    def _attribute(self, simulator, name):
+        scope = simulator
+        for attribute in name.split('.'):
+            scope = getattr(scope, attribute)
+        return scope
+
+    def _log(self, simulator, name):
+        path = name.split('.')
+        scope = self._attribute(simulator, '.'.join(path[:-1]))\
+            if len(path) > 1 else simulator
+        return scope.logger.all()[path[-1]]
+
+    def _encode(self, values):
+        """ NumPy array of the values, the values if they do not form one """
+        if(type(values) == list and any([v is None for v in values])):
+            return values
+        try:
+            encoded = asarray(values)
+        except (ValueError, TypeError):
+            return values
+        if(encoded.dtype == object):
+            return values
+        if(self.dtype != None and encoded.dtype.kind == 'f'):
+            encoded = encoded.astype(self.dtype)
+        return encoded
+
+    def __call__(self, simulator):
+        simulator.simulate()
+
+        series = dict([(name, self._encode(self._log(simulator, name)))\
+            for name in self.series])
+        state = dict([(name, self._attribute(simulator, name))\
+            for name in self.state])
+
+        if(self.store == None):
+            return Result(series, state)
+
+        if(not exists(self.store)):
+            try:
+                makedirs(self.store)
+            except OSError:
+                # created by another worker
+                pass
+        path = join(self.store, uuid4().hex + ".npz")
+        savez_compressed(path, **series)
+        return Result(None, state, path)
@@ -16,10 +16,13 @@ Public License for more details.
 You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
-from numpy import vsplit
+from numpy import vsplit, median, float64
 
 from sys import path
 from evopy.helper.logger import Logger
+from evopy.helper.population import Population
+from evopy.helper.evaluation_cache import get_namespace
+from evopy.problems.constraint import LazyConstraints
 path.append("../..")
 
 class Simulator(object):
@@ -28,18 +31,59 @@ class Simulator(object):
     description = "Single-threaded Simulator"
     description_short = "Simulator"
 
-    def __init__(self, optimizer, problem, termination):
+    def __init__(self, optimizer, problem, termination, dtype = None,\
+        fitness_meta_model = None, cache = None, timer = None,\
+        memory = None):
+        """ dtype: floating point type of the optimizer, e.g. numpy.float32,
+            float64 if None; the problem receives positions in its own dtype
+            attribute, float64 if it has none;
+            fitness_meta_model: e.g. a LQFitnessMetaModel, it pre-screens the
+            valid solutions and only the promising ones get a true fitness
+            evaluation; the constraints of problems with a constraints()
+            method are evaluated lazily, see LazyConstraints;
+            cache: an EvaluationCache for the fitness and feasibility of a
+            deterministic problem, count_ffc and count_cfc only count the
+            evaluations which are not cached;
+            timer: a Timer for the phases of every generation and the
+            training, cross validation and predictions of the meta models,
+            its summary is printed at the end of the run;
+            memory: a MemoryMonitor for the bytes held by the strategy, the
+            meta models and the logs, its summary is printed at the end of
+            the run """
+
         self.optimizer = optimizer
         self.problem = problem
         self.termination = termination
         self.logger = Logger(self)
 
+        if(dtype != None):
+            self.optimizer.set_dtype(dtype)
+        self._problem_dtype = getattr(problem, 'dtype', float64)
+        self.fitness_meta_model = fitness_meta_model
+
+        if(cache != None and not getattr(problem, 'deterministic', False)):
+            raise Exception("the problem is not declared deterministic: " +\
+                problem.description)
+        self.cache = cache
+        self._namespace = get_namespace(problem)
+
+        self.constraints = None
+        if('constraints' in dir(problem)):
+            self.constraints = LazyConstraints(problem.constraints())
+
+        self.timer = timer
+        if(timer != None):
+            self._instrument()
+        self.memory = memory
+
         self._count_cfc = 0
         self._count_ffc = 0
         self._generations = 0
+        self._median_fitness = None
         self.logger.add_binding('_count_cfc', 'count_cfc')
         self.logger.add_binding('_count_ffc', 'count_ffc')
         self.logger.add_binding('_generations', 'generations')
+        self.logger.add_binding('_median_fitness', 'median_fitness')
 
     def _information(self):
         print ("-" * 80) + "\n" + self.name +"\n" + ("-" * 80)
@@ -48,71 +92,214 @@ class Simulator(object):
         print "problem: " + self.problem.description
         print "-" * 80    
 
-    def simulate(self):
-        self._information()
-        while(True):
-            # Simulator and optimizer handling constraints
-            all_feasible = False
-            while(not all_feasible):
-                # ASK for solutions (feasbile and infeasible) 
-                solutions = self.optimizer.ask_pending_solutions()
+    def _instrument(self):
+        """ time the methods of the meta models """
+        methods = ['train', 'check_feasibility', 'check_feasibilities']
+        for meta_model in [getattr(self.optimizer, 'meta_model', None),\
+            self.fitness_meta_model]:
+            if(meta_model == None):
+                continue
+            self.timer.instrument(meta_model, methods)
+            crossvalidation = getattr(meta_model, '_crossvalidation', None)
+            if(crossvalidation != None):
+                self.timer.instrument(crossvalidation, ['crossvalidate'])
+
+    def _start(self, phase):
+        if(self.timer != None):
+            self.timer.start(phase)
+
+    def _stop(self):
+        if(self.timer != None):
+            self.timer.stop()
+
+    def _position(self, position):
+        if(position.dtype != self._problem_dtype):
+            return position.astype(self._problem_dtype)
+        return position
+
+    def _cached(self, kind, position, evaluate):
+        """ value of kind of the position from the cache, otherwise
+            evaluated and cached """
+
+        value = self.cache.get(self._namespace, kind, position)
+        if(value == None):
+            value = evaluate(position)
+            self.cache.put(self._namespace, kind, position, value)
+        return value
+
+    def _feasibility(self, position):
+        if(self.constraints != None):
+            return self.constraints.is_feasible(position)
+        return self.problem.is_feasible(position)
+
+    def _is_feasible(self, position, count = True):
+        """ feasibility of a position, counted as constraint function call
+            if count and not cached; uncounted checks bypass the cache, a
+            later counted check of the position is not free """
+
+        position = self._position(position)
+        if(self.cache == None or not count):
+            self._count_cfc += int(count)
+            return self._feasibility(position)
+
+        def evaluate(position):
+            self._count_cfc += int(count)
+            return self._feasibility(position)
+        return bool(self._cached('feasibility', position, evaluate))
+
+    def _fitness(self, position):
+        """ fitness of a position, counted as fitness function call if not
+            cached """
+
+        position = self._position(position)
+        if(self.cache == None):
+            self._count_ffc += 1
+            return self.problem.fitness(position)
 
-                # CHECK solutions for feasibility 
+        def evaluate(position):
+            self._count_ffc += 1
+            return self.problem.fitness(position)
+        return self._cached('fitness', position, evaluate)
+
+    def _check_feasibilities(self, population):
+        """ fill the feasibilities of a Population in place """
+        for i in range(len(population)):
+            population.feasibilities[i] =\
+                self._is_feasible(population.position(i))
+        return population
+
+    def _check_fitnesses(self, population):
+        """ fill the fitnesses of a Population in place """
+        if(self.fitness_meta_model != None):
+            fitness = lambda i : self._fitness(population.position(i))
+            self.fitness_meta_model.screen(population, fitness)
+            return population
+
+        for i in range(len(population)):
+            population.fitnesses[i] = self._fitness(population.position(i))
+        return population
+
+    def _tell_feasibility(self, feasibility_information):
+        return self.optimizer.tell_feasibility(feasibility_information)
+
+    def _tell_fitness(self, fitnesses):
+        return self.optimizer.tell_fitness(fitnesses)
+
+    def _generation(self):
+        """ simulate one generation, return the best fitness """
+        self._start('generation')
+
+        # Simulator and optimizer handling constraints
+        all_feasible = False
+        while(not all_feasible):
+            # ASK for solutions (feasbile and infeasible) 
+            self._start('ask')
+            solutions = self.optimizer.ask_pending_solutions()
+            self._stop()
+
+            # CHECK solutions for feasibility 
+            self._start('feasibility')
+            if(isinstance(solutions, Population)):
+                feasibility_information = self._check_feasibilities(solutions)
+            else:
                 feasibility =\
                     lambda solution, position :\
-                        (solution, self.problem.is_feasible(position))
+                        (solution, self._is_feasible(position))
 
                 feasibility_information = []                   
                 for solution in solutions:
-                    self._count_cfc += 1                    
                     information = vsplit(solution, solution.shape[0])
                     position = information[0]
-                    feasibility_information.append(feasibility(solution, position))
+                    feasibility_information.append(\
+                        feasibility(solution, position))
+            self._stop()
  
-                # TELL feasibility, returns True if all feasible, 
-                # returns False if extra checks
-                all_feasible =\
-                    self.optimizer.tell_feasibility(feasibility_information)
+            # TELL feasibility, returns True if all feasible, 
+            # returns False if extra checks
+            self._start('tell_feasibility')
+            all_feasible = self._tell_feasibility(feasibility_information)
+            self._stop()
 
-            # ASK for valid solutions (feasible)
-            valid_solutions = self.optimizer.ask_valid_solutions()
+        # ASK for valid solutions (feasible)
+        self._start('ask')
+        valid_solutions = self.optimizer.ask_valid_solutions()
+        self._stop()
 
-            # CHECK fitness
+        # CHECK fitness
+        self._start('fitness')
+        if(isinstance(valid_solutions, Population)):
+            fitnesses = self._check_fitnesses(valid_solutions)
+            self._median_fitness = median(fitnesses.fitnesses)
+        elif(self.fitness_meta_model != None):
+            population = self._check_fitnesses(\
+                Population.of_individuals(valid_solutions))
+            fitnesses = zip(valid_solutions, population.fitnesses)
+            self._median_fitness = median(population.fitnesses)
+        else:
             fitnesses = []
-            fitness = lambda solution : (solution, self.problem.fitness(solution[0]))
+            fitness = lambda solution :\
+                (solution, self._fitness(solution[0]))
             for solution in valid_solutions:
                 fitnesses.append(fitness(solution))
-                self._count_ffc += 1
+            self._median_fitness = median([f for (s, f) in fitnesses])
+        self._stop()
 
-            # TELL fitness, return optimum
-            optimum, optimum_fitness = self.optimizer.tell_fitness(fitnesses)
+        # TELL fitness, return optimum
+        self._start('tell_fitness')
+        optimum, optimum_fitness = self._tell_fitness(fitnesses)
+        self._stop()
 
-            # A-POSTERIORI information for confusion matrix
-            if('ask_a_posteriori_solutions' in dir(self.optimizer)):
-                apos_feasibility =\
-                    lambda (position, meta_feasibility) :\
-                    (position, meta_feasibility, self.problem.is_feasible(position))
+        # A-POSTERIORI information for confusion matrix
+        if('ask_a_posteriori_solutions' in dir(self.optimizer)):
+            self._start('a_posteriori')
+            apos_feasibility =\
+                lambda (position, meta_feasibility) :\
+                (position, meta_feasibility,\
+                self._is_feasible(position, count = False))
  
-                apos_solutions = self.optimizer.ask_a_posteriori_solutions() 
-                feasibility_info = []
-                for solution in apos_solutions:
-                    information = vsplit(solution[0], solution[0].shape[0])      
-                    position = information[0]
-                    meta_feasibility = solution[1]
-                    feasibility_info.append(apos_feasibility((position, meta_feasibility)))
+            apos_solutions = self.optimizer.ask_a_posteriori_solutions() 
+            feasibility_info = []
+            for solution in apos_solutions:
+                information = vsplit(solution[0], solution[0].shape[0])      
+                position = information[0]
+                meta_feasibility = solution[1]
+                feasibility_info.append(apos_feasibility((position, meta_feasibility)))
 
-                self.optimizer.tell_a_posteriori_feasibility(feasibility_info)
+            self.optimizer.tell_a_posteriori_feasibility(feasibility_info)
+            self._stop()
 
-            # UPDATE OWN STATS
-            self._generations += 1
-            self.logger.log()
-            self._count_cfc = 0
-            self._count_ffc = 0
-          
+        self._stop()
+
+        # UPDATE OWN STATS
+        self._generations += 1
+        self.logger.log()
+        if(self.constraints != None):
+            self.constraints.log()
+        if(self.cache != None):
+            self.cache.log()
+        if(self.timer != None):
+            self.timer.log()
+        if(self.memory != None):
+            self.memory.log(self)
+        self._count_cfc = 0
+        self._count_ffc = 0
+
+        return optimum_fitness
+
+    def simulate(self):
+        self._information()
+        while(True):
+            optimum_fitness = self._generation()
             print "%.20f" % (optimum_fitness)
 
             # TERMINATION
-            if(self.termination.terminate(optimum_fitness, self._generations)):
+            if(self.termination.terminate(optimum_fitness, self._generations,\
+                self)):
                 break
+
+        if(self.timer != None):
+            print self.timer.summary()
+        if(self.memory != None):
+            print self.memory.summary()
             
         return self 
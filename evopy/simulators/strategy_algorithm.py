@@ -0,0 +1,171 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+from copy import deepcopy
+from numpy import array, array_split, hstack, zeros, inf, vsplit
+
+from sys import path
+path.append("../..")
+
+from evopy.external.playdoh import OptimizationAlgorithm
+
+class StrategyAlgorithm(OptimizationAlgorithm):
+    """ playdoh optimization algorithm running an evopy strategy, to be used
+        with playdoh.minimize and argtype = 'matrix'.
+
+        optparams:
+        strategy: the evopy strategy (one deep copy per group)
+        problem: the evopy problem whose constraints are checked
+
+        The strategy runs on node 0. Its feasibility phase happens in
+        pre_fitness, then the feasible solutions are split across all
+        nodes, every node evaluates the fitness of its part and node 0
+        tells the fitnesses to the strategy. popsize should be the lambda
+        of the strategy. """
+
+    @staticmethod
+    def default_optparams():
+        return {'strategy' : None, 'problem' : None}
+
+    @staticmethod
+    def get_topology(node_count):
+        # 0 is the master, 1..n are the workers
+        topology = []
+        for i in range(1, node_count):
+            topology.extend([('to_master_%d' % i, i, 0),\
+                ('to_worker_%d' % i, 0, i)])
+        return topology
+
+    def initialize(self):
+        self.problem = self.optparams['problem'][0]
+        self.strategies = [deepcopy(self.optparams['strategy'][group])\
+            for group in range(self.groups)]
+
+        self.best_positions = [None] * self.groups
+        self.best_fitnesses = [inf] * self.groups
+        self.count_cfc = [0] * self.groups
+        self.count_ffc = [0] * self.groups
+
+    def initialize_particles(self):
+        # the particles are set by pre_fitness at every iteration
+        self.X = zeros((self.ndimensions, 0))
+
+    def _feasible_solutions(self, group):
+        """ feasibility phase of the strategy, return the valid solutions """
+        strategy = self.strategies[group]
+        all_feasible = False
+        while(not all_feasible):
+            feasibility_information = []
+            for solution in strategy.ask_pending_solutions():
+                self.count_cfc[group] += 1
+                position = vsplit(solution, solution.shape[0])[0]
+                feasibility_information.append(\
+                    (solution, self.problem.is_feasible(position)))
+            all_feasible = strategy.tell_feasibility(feasibility_information)
+
+        return strategy.ask_valid_solutions()
+
+    def _a_posteriori(self, group):
+        strategy = self.strategies[group]
+        if('ask_a_posteriori_solutions' in dir(strategy)):
+            feasibility_info = []
+            for solution, meta_feasibility in\
+                strategy.ask_a_posteriori_solutions():
+                position = vsplit(solution, solution.shape[0])[0]
+                feasibility_info.append((position, meta_feasibility,\
+                    self.problem.is_feasible(position)))
+            strategy.tell_a_posteriori_feasibility(feasibility_info)
+
+    def _particles(self, solutions):
+        """ positions of the solutions as columns """
+        if(len(solutions) == 0):
+            return zeros((self.ndimensions, 0))
+        return hstack([array(solution[0]).T for solution in solutions])
+
+    def pre_fitness(self):
+        if self.index == 0:
+            # parts[node][group]: solutions evaluated by node
+            self.solutions, parts = [], [[] for node in self.nodes]
+            for group in range(self.groups):
+                solutions = self._feasible_solutions(group)
+                self.solutions.append(solutions)
+                start = 0
+                for node, indices in zip(range(self.nodecount),\
+                    array_split(range(len(solutions)), self.nodecount)):
+                    parts[node].append(solutions[start:start + len(indices)])
+                    start += len(indices)
+
+            for node in range(1, self.nodecount):
+                self.tubes.push('to_worker_%d' % node,\
+                    [self._particles(part) for part in parts[node]])
+            self.sizes = [[len(part) for part in parts[node]]\
+                for node in range(self.nodecount)]
+            particles = [self._particles(part) for part in parts[0]]
+        else:
+            particles = self.tubes.pop('to_worker_%d' % self.index)
+
+        self.X = hstack(particles)
+
+    def post_fitness(self, fitness):
+        if self.index > 0:
+            self.tubes.push('to_master_%d' % self.index, fitness)
+        else:
+            self.fitnesses = [list(fitness)]
+            for node in range(1, self.nodecount):
+                self.fitnesses.append(\
+                    list(self.tubes.pop('to_master_%d' % node)))
+        return fitness
+
+    def iterate(self, iteration, fitness):
+        if self.index > 0:
+            return
+
+        # fitnesses of each group, in the order of the solutions
+        group_fitnesses = [[] for group in range(self.groups)]
+        for node in range(self.nodecount):
+            start = 0
+            for group, size in enumerate(self.sizes[node]):
+                group_fitnesses[group].extend(\
+                    self.fitnesses[node][start:start + size])
+                start += size
+
+        for group in range(self.groups):
+            solutions = self.solutions[group]
+            fitnesses = [float(f) for f in group_fitnesses[group]]
+            self.count_ffc[group] += len(fitnesses)
+            best_child, best_fitness = self.strategies[group].tell_fitness(\
+                zip(solutions, fitnesses))
+            if(best_fitness < self.best_fitnesses[group]):
+                self.best_fitnesses[group] = best_fitness
+                self.best_positions[group] = array(best_child[0]).flatten()
+            self._a_posteriori(group)
+
+    def get_info(self):
+        info = []
+        if self.index == 0 and self.return_info:
+            for group in range(self.groups):
+                logs = dict(self.strategies[group].logger.all())
+                logs['count_cfc'] = self.count_cfc[group]
+                logs['count_ffc'] = self.count_ffc[group]
+                info.append(logs)
+        return info
+
+    def get_result(self):
+        if self.index > 0:
+            return [], []
+        return self.best_positions, self.best_fitnesses
@@ -24,34 +24,103 @@ http://www.lri.fr/~hansen/cmaesintro.html.
 from copy import deepcopy
 
 from numpy import array, mean, log, eye, diag, transpose
-from numpy import identity, matrix, dot, exp, zeros, ones, sqrt
+from numpy import identity, matrix, dot, exp, zeros, ones, sqrt, asarray
 from numpy.random import normal, rand
 from numpy.linalg import eigh, norm
 
-from evopy.metamodel.svc_linear_meta_model import SVCLinearMetaModel
+from evopy.helper.population import Population
 from evolution_strategy import EvolutionStrategy
 
-class CMAES(EvolutionStrategy):
+class CMASampling(object):
+    """ sampling and separable updates shared by the CMA-ES variants, for
+        strategies with the CMA-ES strategy parameters """
+
+    def _init_separable(self, N):
+        """ faster learning rates of the separable CMA-ES (Ros, Hansen
+            2008); only the diagonal of C, the eigenvectors are the unit
+            vectors """
+
+        self._c1 *= (N + 2) / 3.0
+        self._cmu = min(1 - self._c1, self._cmu * (N + 2) / 3.0)
+
+        self._C = ones(N)
+        self._D = ones(N)
+        self._B = None
+        self._invsqrtC = ones(N)
+        self._norm = sqrt(N) * (1.0 - (1.0 / (4 * N)) + (1.0 / (21 * N ** 2)))
+
+    def _generate_population(self, n):
+        """ sample n individuals at once, the rows of one array """
+
+        normals = normal(0.0, 1.0, (n, self._xmean.size))
+        if(self._separable):
+            normals = normals.astype(self._active_dtype) * self._D
+        else:
+            normals = dot((normals * self._D).astype(self._active_dtype),\
+                asarray(self._B).T)
+
+        return Population(self._xmean.getA() + self._sigma * normals)
+
+    def _update_separable(self, oldxmean, selected):
+        """ update evolution paths, the diagonal of C and sigma in O(N) """
+
+        y = (self._xmean - oldxmean).getA1()
+
+        c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5 / self._sigma
+        self._ps = (1 - self._cs) * self._ps + c * self._invsqrtC * y
+
+        c = (self._cc * (2 - self._cc) * self._mueff) ** 0.5 / self._sigma
+        self._pc = (1 - self._cc) * self._pc + c * y
+
+        # rank one and rank mu update of the diagonal
+        steps = ((selected.positions - oldxmean.getA()) / self._sigma)\
+            .astype(self._active_dtype)
+        rank_mu = dot(self._weights, steps ** 2)
+        self._C = (1 - self._c1 - self._cmu) * self._C +\
+            self._c1 * self._pc ** 2 + self._cmu * rank_mu
+
+        self._sigma *= exp((self._cs / self._damps) *\
+            (norm(self._ps) / self._norm - 1))
+
+        self._adapt_dtype(min(self._C), max(self._C))
+        self._D = sqrt(self._C).astype(self._active_dtype)
+        self._invsqrtC = 1.0 / self._D
+
+    def mahalanobis_norm(self, steps):
+        """ lengths |C^-1/2 y| of the steps y in the rows """
+
+        if(self._separable):
+            return sqrt(((steps * self._invsqrtC) ** 2).sum(axis = 1))
+        return sqrt((dot(steps, asarray(self._invsqrtC).T) ** 2).sum(axis = 1))
+
+class CMAES(CMASampling, EvolutionStrategy):
  
     description =\
         "Covariance matrix adaption evolution strategy (CMA-ES)"    
 
     description_short = "CMA-ES"        
 
-    def __init__(self, mu, lambd, xmean, sigma):
+    # sampling in the dtype of set_dtype, C accumulates in float64
+    _dtype_attributes = ["_B", "_D", "_invsqrtC"]
+
+    def __init__(self, mu, lambd, xmean, sigma, separable = False):
 
         # initialize super constructor
         super(CMAES, self).__init__(mu, lambd) 
 
+        # diagonal covariance matrix (sep-CMA-ES)
+        self._separable = separable
+
         # initialize CMA-ES specific strategy parameters
         self._init_cma_strategy_parameters(xmean, sigma)
 
         # valid solutions
-        self._valid_solutions = []
+        self._valid_solutions = Population(zeros((0, xmean.size)))
 
         # statistics
         self.logger.add_const_binding('_xmean', 'initial_xmean')
         self.logger.add_const_binding('_sigma', 'initial_sigma')
+        self.logger.add_const_binding('_separable', 'separable')
 
         self.logger.add_binding('_D', 'D')
         self.logger.add_binding('_C', 'C')
@@ -97,6 +166,10 @@ class CMAES(EvolutionStrategy):
         self._pc = zeros(N)
         self._ps = zeros(N)
 
+        if(self._separable):
+            self._init_separable(N)
+            return
+
         # B-matrix of eigenvectors, defines the coordinate system
         self._B = identity(N)
 
@@ -122,29 +195,20 @@ class CMAES(EvolutionStrategy):
         """ ask pending solutions; solutions which need a checking for 
             true feasibility """        
 
-        pending_solutions = []
-        while(len(pending_solutions) < (self._lambd - len(self._valid_solutions))):
-            normals = transpose(matrix([normal(0.0, d) for d in self._D]))
-            value = self._xmean + transpose(self._sigma * self._B * normals)
-            pending_solutions.append(value)
-
-        return pending_solutions  
+        return self._generate_population(\
+            self._lambd - len(self._valid_solutions))
 
     def tell_feasibility(self, feasibility_information):
         """ tell feasibilty; return True if there are no pending solutions, 
             otherwise False """
 
-        for (child, feasibility) in feasibility_information:
-            if(feasibility):
-                self._valid_solutions.append(child)
-            else:
-                self._count_constraint_infeasibles += 1
+        population = Population.of_feasibilities(feasibility_information)
+        self._count_constraint_infeasibles +=\
+            int((~population.feasibilities).sum())
+        self._valid_solutions = Population.concatenate(\
+            [self._valid_solutions, population.feasible()])
 
-        # @todo shorten: return expression
-        if(len(self._valid_solutions) < self._lambd):
-            return False
-        else:
-            return True
+        return len(self._valid_solutions) >= self._lambd
      
     def ask_valid_solutions(self):
         return self._valid_solutions
@@ -155,72 +219,68 @@ class CMAES(EvolutionStrategy):
         N = self._xmean.size
         oldxmean = deepcopy(self._xmean)
 
-        fitness = lambda (child, fitness) : fitness
-        child = lambda (child, fitness) : child
-
-        sorted_fitnesses = sorted(fitnesses, key = fitness)[:self._mu]
-        sorted_children = map(child, sorted_fitnesses)
+        selected = Population.of_fitnesses(fitnesses).sort(self._mu)
 
         # new xmean
-        values = sorted_children
-
-        self._xmean = matrix([[0.0 for i in range(0,N)]]) 
-        weighted_values = zip(self._weights, values)
-        for weight, value in weighted_values:
-            self._xmean += weight * value
-
-        # cumulation: update evolution paths
-        y = self._xmean - oldxmean
-        z = dot(self._invsqrtC, y.T) # C**(-1/2) * (xnew - xold)
-
-        # normalizing coefficient c and evolution path sigma control
-        c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5 / self._sigma
-        self._ps = (1 - self._cs) * self._ps + c * z
+        self._xmean = matrix(dot(self._weights, selected.positions))
 
-        # normalizing coefficient c and evolution path for rank-one-update
-        # without hsig (!)
-        c = (self._cc * (2 - self._cc) * self._mueff) ** 0.5 / self._sigma
-        self._pc = (1 - self._cc) * self._pc + c * y
+        if(self._separable):
+            self._update_separable(oldxmean, selected)
+        else:
+            # cumulation: update evolution paths
+            y = self._xmean - oldxmean
+            z = dot(self._invsqrtC, y.T) # C**(-1/2) * (xnew - xold)
+
+            # normalizing coefficient c and evolution path sigma control
+            c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5 / self._sigma
+            self._ps = (1 - self._cs) * self._ps + c * z
+
+            # normalizing coefficient c and evolution path for rank-one-update
+            # without hsig (!)
+            c = (self._cc * (2 - self._cc) * self._mueff) ** 0.5 / self._sigma
+            self._pc = (1 - self._cc) * self._pc + c * y
         
-        # adapt covariance matrix C
-        # rank one update term
-        term_cov1 = self._c1 * (transpose(matrix(self._pc)) * matrix(self._pc))       
+            # adapt covariance matrix C
+            # rank one update term
+            pc = matrix(self._pc, dtype = self._active_dtype)
+            term_cov1 = self._c1 * (transpose(pc) * pc)       
 
-        # ranke mu update term
-        valuesv = [(value - oldxmean) / self._sigma for value in values] 
-        term_covmu = self._cmu *\
-            sum([self._weights[i] * (transpose(matrix(valuesv[i])) *\
-            matrix(valuesv[i]))\
-            for i in range(0, self._mu)])
+            # ranke mu update term
+            steps = ((selected.positions - oldxmean.getA()) / self._sigma)\
+                .astype(self._active_dtype)
+            term_covmu = self._cmu *\
+                matrix(dot(steps.T * self._weights, steps))
 
-        self._C = (1 - self._c1 - self._cmu) * self._C + term_cov1 + term_covmu
+            self._C = (1 - self._c1 - self._cmu) * self._C + term_cov1 + term_covmu
 
-        # update global sigma by comparing evolution path 
-        # with approx. norm of random vector
-        self._sigma *= exp(self._cs / self._damps) *\
-            ((norm(self._ps.getA1()) / self._norm) - 1)
+            # update global sigma by comparing evolution path 
+            # with approx. norm of random vector
+            self._sigma *= exp(self._cs / self._damps) *\
+                ((norm(self._ps.getA1()) / self._norm) - 1)
 
         ### UPDATE FOR NEXT ITERATION
-        self._valid_solutions = []
+        self._valid_solutions = Population(zeros((0, N)))
 
         ### STATISTICS
-        self._selected_children = values
-        self._best_child, self._best_fitness = sorted_fitnesses[0]
-        self._worst_child, self._worst_fitness = sorted_fitnesses[-1]        
-
-        fitnesses = map(fitness, sorted_fitnesses)
-        self._mean_fitness = array(fitnesses).mean()
+        self._selected_children = selected
+        self._best_child, self._best_fitness =\
+            selected[0], selected.fitnesses[0]
+        self._worst_child, self._worst_fitness =\
+            selected[-1], selected.fitnesses[-1]
+        self._mean_fitness = selected.fitnesses.mean()
 
         # log all bindings
         self.logger.log()
         self._count_constraint_infeasibles = 0                
 
-        self._D, self._B = eigh(self._C)
-        self._B = matrix(self._B)
-        self._D = [d ** 0.5 for d in self._D] 
+        if(not self._separable):
+            self._D, self._B = eigh(self._C)
+            self._D = [d ** 0.5 for d in self._D] 
+            self._adapt_dtype(min(self._D) ** 2, max(self._D) ** 2)
+            self._B = matrix(self._B, dtype = self._active_dtype)
 
-        invD = diag([1.0/d for d in self._D])
-        self._invsqrtC = self._B * invD * transpose(self._B) 
+            invD = diag([1.0/d for d in self._D]).astype(self._active_dtype)
+            self._invsqrtC = self._B * invD * transpose(self._B) 
 
         return self._best_child, self._best_fitness
 
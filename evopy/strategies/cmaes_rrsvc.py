@@ -25,14 +25,21 @@ from copy import deepcopy
 from math import floor
 
 from numpy import array, mean, log, eye, diag, transpose, vectorize
-from numpy import identity, matrix, dot, exp, zeros, ones, sqrt
+from numpy import identity, matrix, dot, exp, zeros, ones, sqrt, asarray
 from numpy.random import normal, rand, random
 from numpy.linalg import eigh, norm, inv
 
+from evopy.helper.population import Population
 from evolution_strategy import EvolutionStrategy
+from cmaes import CMASampling
 from confusion_matrix import ConfusionMatrix
 
-class CMAESRRSVC(EvolutionStrategy):
+class CMAESRRSVC(CMASampling, EvolutionStrategy):
+    """ uses the meta model with the fixed probability beta and retrains
+        it every generation: the meta-infeasible candidates are repaired
+        instead of discarded and still cost a constraint evaluation, so a
+        MetaModelGate, which adapts to the saved evaluations, does not
+        apply """
  
     description =\
         "Covariance matrix adaption evolution strategy (CMA-ES) with linear SVC "\
@@ -40,11 +47,18 @@ class CMAESRRSVC(EvolutionStrategy):
 
     description_short = "CMA-ES with RSVC and repair"
 
-    def __init__(self, mu, lambd, xmean, sigma, beta, meta_model):
+    # sampling in the dtype of set_dtype, C accumulates in float64
+    _dtype_attributes = ["_B", "_invB", "_D", "_invsqrtC"]
+
+    def __init__(self, mu, lambd, xmean, sigma, beta, meta_model,\
+        separable = False):
 
         # call super constructor 
         super(CMAESRRSVC, self).__init__(mu, lambd)
 
+        # diagonal covariance matrix (sep-CMA-ES)
+        self._separable = separable
+
         # initialize CMA-ES specific strategy parameters
         self._init_cma_strategy_parameters(xmean, sigma)      
 
@@ -53,13 +67,14 @@ class CMAESRRSVC(EvolutionStrategy):
         self.meta_model_trained = False
         self._beta = beta
 
-        self._valid_solutions = []
+        self._valid_solutions = Population(zeros((0, xmean.size)))
         self._pending_apos_solutions = []
 
         # statistics
         self.logger.add_const_binding('_xmean', 'initial_xmean')
         self.logger.add_const_binding('_sigma', 'initial_sigma')
         self.logger.add_const_binding('_beta', 'beta')
+        self.logger.add_const_binding('_separable', 'separable')
 
         self.logger.add_binding('_D', 'D')
         self.logger.add_binding('_C', 'C')
@@ -106,6 +121,10 @@ class CMAESRRSVC(EvolutionStrategy):
         self._pc = zeros(N)
         self._ps = zeros(N)
 
+        if(self._separable):
+            self._init_separable(N)
+            return
+
         # B-matrix of eigenvectors, defines the coordinate system
         self._B = identity(N)
 
@@ -130,60 +149,62 @@ class CMAESRRSVC(EvolutionStrategy):
 
     def _reduce(self, individual):
         """ back rotation to standard basis """
+        if(self._separable):
+            # the eigenbasis of a diagonal C is the standard basis
+            return individual.copy()
         return (self._invB * individual.T).T
         
     def _unreduce(self, individual):
         """ rotation to self._B basis """
+        if(self._separable):
+            return individual.copy()
     	return (self._B * individual.T).T 
 
-    def _generate_individual(self):
-        normals = transpose(matrix([normal(0.0, d) for d in self._D]))
-        value = self._xmean + transpose(self._sigma * self._B * normals)
-        return value
+    def _reduce_population(self, population):
+        """ back rotation of all individuals to standard basis """
+        if(self._separable):
+            return Population(population.positions.copy())
+        return Population(dot(population.positions, asarray(self._invB).T))
 
     def ask_pending_solutions(self):
         """ ask pending solutions; solutions which need a checking for true 
             feasibility """
-        individuals = []
-        while(len(individuals) < 1):
-            if((random() < self._beta) and self.meta_model_trained):
-                individual = self._generate_individual()
-                reduced_individual = self._reduce(individual)
-                if(self.meta_model.check_feasibility(reduced_individual)):
-                    individuals.append(individual)
-                    self._pending_apos_solutions.append((individual, True))
-                else:
-                    # appending meta-infeasible solution to a_posteriori pending 
-                    self._pending_apos_solutions.append((individual, False))
-                    individual = self._unreduce(\
-                        self.meta_model.repair(self._reduce(individual)))
-                    self._count_repaired += 1
-                    individuals.append(individual)
-                    # appending meta-feasible solution to a_posteriori pending
-                    self._pending_apos_solutions.append((individual, True))
-            
-            else:
-                individual = self._generate_individual()
-                individuals.append(individual)
-
-        return individuals 
+
+        population = self._generate_population(\
+            self._lambd - len(self._valid_solutions))
+        if(not self.meta_model_trained):
+            return population
+
+        # a part of the individuals is checked by the meta model, the
+        # meta-infeasible ones are repaired in the reduced basis
+        checked = (random(len(population)) < self._beta).nonzero()[0]
+        predictions = self.meta_model.check_feasibilities(\
+            self._reduce_population(population.take(checked)))
+        for index, prediction in zip(checked, predictions):
+            individual = population.position(index).copy()
+            # appending meta-(in)feasible solution to a_posteriori pending
+            self._pending_apos_solutions.append((individual, prediction))
+            if(not prediction):
+                individual = self._unreduce(\
+                    self.meta_model.repair(self._reduce(individual)))
+                population.positions[index] = individual.getA1()
+                self._count_repaired += 1
+                self._pending_apos_solutions.append((individual, True))
+
+        return population
 
     def tell_feasibility(self, feasibility_information):
         """ tell feasibilty; return True if there are no pending solutions, 
             otherwise False """
 
-        for (child, feasibility) in feasibility_information:
-            if(feasibility):
-                self._valid_solutions.append(child)
-            else:
-                reduced_child = self._reduce(child)
-                self._count_constraint_infeasibles += 1
-                self.meta_model.add_infeasible(reduced_child)
+        population = Population.of_feasibilities(feasibility_information)
+        for child in population.infeasible():
+            self._count_constraint_infeasibles += 1
+            self.meta_model.add_infeasible(self._reduce(child))
 
-        if(len(self._valid_solutions) < self._lambd):
-            return False
-        else:            
-           return True
+        self._valid_solutions = Population.concatenate(\
+            [self._valid_solutions, population.feasible()])
+        return len(self._valid_solutions) >= self._lambd
 
     def ask_valid_solutions(self):
         """ asked by simulator for valid solutions """
@@ -195,64 +216,60 @@ class CMAESRRSVC(EvolutionStrategy):
         N = self._xmean.size
         oldxmean = deepcopy(self._xmean)
 
-        fitness = lambda (child, fitness) : fitness
-        child = lambda (child, fitness) : child
-
-        sorted_fitnesses = sorted(fitnesses, key = fitness)
-        sorted_children = map(child, sorted_fitnesses)
+        population = Population.of_fitnesses(fitnesses).sort()
 
-        reduced_sorted_children = map(self._reduce, sorted_children)
-        self.meta_model.add_sorted_feasibles(reduced_sorted_children)
+        self.meta_model.add_sorted_feasibles(\
+            list(self._reduce_population(population)))
         self.meta_model_trained = self.meta_model.train()
         
         # new xmean
-        values = sorted_children[:self._mu]
-        self._xmean = matrix([[0.0 for i in range(0,N)]]) 
-        weighted_values = zip(self._weights, values)
-        for weight, value in weighted_values:
-            self._xmean += weight * value
-
-        # cumulation: update evolution paths
-        y = self._xmean - oldxmean
-        z = dot(self._invsqrtC, y.T) # C**(-1/2) * (xnew - xold)
-
-        # normalizing coefficient c and evolution path sigma control
-        c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5 / self._sigma
-        self._ps = (1 - self._cs) * self._ps + c * z
-
-        # normalizing coefficient c and evolution path for rank-one-update
-        # without hsig (!)
-        c = (self._cc * (2 - self._cc) * self._mueff) ** 0.5 / self._sigma
-        self._pc = (1 - self._cc) * self._pc + c * y
+        selected = population.head(self._mu)
+        self._xmean = matrix(dot(self._weights, selected.positions))
+
+        if(self._separable):
+            self._update_separable(oldxmean, selected)
+        else:
+            # cumulation: update evolution paths
+            y = self._xmean - oldxmean
+            z = dot(self._invsqrtC, y.T) # C**(-1/2) * (xnew - xold)
+
+            # normalizing coefficient c and evolution path sigma control
+            c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5 / self._sigma
+            self._ps = (1 - self._cs) * self._ps + c * z
+
+            # normalizing coefficient c and evolution path for rank-one-update
+            # without hsig (!)
+            c = (self._cc * (2 - self._cc) * self._mueff) ** 0.5 / self._sigma
+            self._pc = (1 - self._cc) * self._pc + c * y
         
-        # adapt covariance matrix C
-        # rank one update term
-        term_cov1 = self._c1 * (transpose(matrix(self._pc)) * matrix(self._pc))       
+            # adapt covariance matrix C
+            # rank one update term
+            pc = matrix(self._pc, dtype = self._active_dtype)
+            term_cov1 = self._c1 * (transpose(pc) * pc)       
 
-        # ranke mu update term
-        valuesv = [(value - oldxmean) / self._sigma for value in values] 
-        term_covmu = self._cmu *\
-            sum([self._weights[i] * (transpose(matrix(valuesv[i])) *\
-            matrix(valuesv[i]))\
-            for i in range(0, self._mu)])
+            # ranke mu update term
+            steps = ((selected.positions - oldxmean.getA()) / self._sigma)\
+                .astype(self._active_dtype)
+            term_covmu = self._cmu *\
+                matrix(dot(steps.T * self._weights, steps))
 
-        self._C = (1 - self._c1 - self._cmu) * self._C + term_cov1 + term_covmu
+            self._C = (1 - self._c1 - self._cmu) * self._C + term_cov1 + term_covmu
 
-        # update global sigma by comparing evolution path 
-        # with approx. norm of random vector
-        self._sigma *= exp(self._cs / self._damps) *\
-            ((norm(self._ps.getA1()) / self._norm) - 1)
+            # update global sigma by comparing evolution path 
+            # with approx. norm of random vector
+            self._sigma *= exp(self._cs / self._damps) *\
+                ((norm(self._ps.getA1()) / self._norm) - 1)
 
         ### UPDATE FOR NEXT ITERATION
-        self._valid_solutions = []
+        self._valid_solutions = Population(zeros((0, N)))
 
         ### STATISTICS
-        self._selected_children = values
-        self._best_child, self._best_fitness = sorted_fitnesses[0]
-        self._worst_child, self._worst_fitness = sorted_fitnesses[-1] 
-
-        fitnesses = map(fitness, sorted_fitnesses)
-        self._mean_fitness = array(fitnesses).mean()
+        self._selected_children = selected
+        self._best_child, self._best_fitness =\
+            selected[0], population.fitnesses[0]
+        self._worst_child, self._worst_fitness =\
+            population.position(-1).copy(), population.fitnesses[-1]
+        self._mean_fitness = population.fitnesses.mean()
         
         return self._best_child, self._best_fitness
 
@@ -269,11 +286,13 @@ class CMAESRRSVC(EvolutionStrategy):
         self._count_constraint_infeasibles = 0                
         self._count_repaired = 0
 
-        self._D, self._B = eigh(self._C)
-        self._B = matrix(self._B) 
-        self._invB = inv(self._B)
-        self._D = [d ** 0.5 for d in self._D] 
+        if(not self._separable):
+            self._D, self._B = eigh(self._C)
+            self._D = [d ** 0.5 for d in self._D] 
+            self._adapt_dtype(min(self._D) ** 2, max(self._D) ** 2)
+            self._B = matrix(self._B, dtype = self._active_dtype)
+            self._invB = inv(self._B)
 
-        invD = diag([1.0/d for d in self._D])
-        self._invsqrtC = self._B * invD * transpose(self._B) 
+            invD = diag([1.0/d for d in self._D]).astype(self._active_dtype)
+            self._invsqrtC = self._B * invD * transpose(self._B) 
 
@@ -25,12 +25,14 @@ from copy import deepcopy
 from math import floor
 
 from numpy import array, mean, log, eye, diag, transpose
-from numpy import identity, matrix, dot, exp, zeros, ones
+from numpy import identity, matrix, dot, exp, zeros, ones, asarray
 from numpy.random import normal, rand, random
 from numpy.linalg import eigh, norm, inv
 
+from evopy.helper.population import Population
 from evolution_strategy import EvolutionStrategy
 from confusion_matrix import ConfusionMatrix
+from meta_model_gate import FixedGate
 
 class CMAESSVC(EvolutionStrategy):
  
@@ -40,7 +42,11 @@ class CMAESSVC(EvolutionStrategy):
 
     description_short = "CMA-ES with SVC"        
 
-    def __init__(self, mu, lambd, xmean, sigma, beta, meta_model):
+    # sampling in the dtype of set_dtype, C accumulates in float64
+    _dtype_attributes = ["_B", "_D", "_invsqrtC"]
+
+    def __init__(self, mu, lambd, xmean, sigma, beta, meta_model,\
+        gate = None):
 
         # call super constructor 
         super(CMAESSVC, self).__init__(mu, lambd)
@@ -53,7 +59,10 @@ class CMAESSVC(EvolutionStrategy):
         self.meta_model_trained = False
         self._beta = beta
 
-        self._valid_solutions = []
+        # usage of the meta model, a fixed beta by default
+        self.gate = gate if gate != None else FixedGate(beta)
+
+        self._valid_solutions = Population(zeros((0, xmean.size)))
         self._pending_apos_solutions = []
 
         # statistics
@@ -124,46 +133,50 @@ class CMAESSVC(EvolutionStrategy):
         invD = diag([1.0/d for d in self._D])
         self._invsqrtC = self._B * invD * transpose(self._B) 
 
-    def _generate_individual(self):
-        normals = transpose(matrix([normal(0.0, d) for d in self._D]))
-        value = self._xmean + transpose(self._sigma * self._B * normals)
-        return value 
+    def _generate_population(self, n):
+        """ sample n individuals at once, the rows of one array """
+
+        normals = normal(0.0, 1.0, (n, self._xmean.size))
+        normals = dot((normals * self._D).astype(self._active_dtype),\
+            asarray(self._B).T)
+        return Population(self._xmean.getA() + self._sigma * normals)
 
     def ask_pending_solutions(self):
         """ ask pending solutions; solutions which need a checking for true 
             feasibility """
 
-        individuals = []
-        while(len(individuals) < 1):
-            if((random() < self._beta) and self.meta_model_trained):
-                individual = self._generate_individual()
-                if(self.meta_model.check_feasibility(individual)):
-                    individuals.append(individual)
-                    self._pending_apos_solutions.append((individual, True))
-                else:
-                    # appending meta-infeasible solution to a_posteriori pending 
-                    self._pending_apos_solutions.append((individual, False))
-            else:
-                individual = self._generate_individual()
-                individuals.append(individual)
-
-        return individuals 
+        while(True):
+            population = self._generate_population(\
+                self._lambd - len(self._valid_solutions))
+            if(not self.gate.use(self.meta_model_trained)):
+                return population
+
+            # a part of the individuals is checked by the meta model, the
+            # meta-infeasible ones are only kept for the a posteriori check
+            checked = (random(len(population)) < self.gate.beta).nonzero()[0]
+            predictions = self.gate.check_feasibilities(self.meta_model,\
+                population.take(checked))
+            for index, prediction in zip(checked, predictions):
+                self._pending_apos_solutions.append(\
+                    (population.position(index).copy(), prediction))
+
+            population.feasibilities[checked[~predictions]] = False
+            population = population.feasible()
+            if(len(population) > 0):
+                return population
 
     def tell_feasibility(self, feasibility_information):
         """ tell feasibilty; return True if there are no pending solutions, 
             otherwise False """
 
-        for (child, feasibility) in feasibility_information:
-            if(feasibility):
-                self._valid_solutions.append(child)
-            else:
-                self._count_constraint_infeasibles += 1
-                self.meta_model.add_infeasible(child)
+        population = Population.of_feasibilities(feasibility_information)
+        for child in population.infeasible():
+            self._count_constraint_infeasibles += 1
+            self.meta_model.add_infeasible(child)
 
-        if(len(self._valid_solutions) < self._lambd):
-            return False
-        else:            
-           return True
+        self._valid_solutions = Population.concatenate(\
+            [self._valid_solutions, population.feasible()])
+        return len(self._valid_solutions) >= self._lambd
 
     def ask_valid_solutions(self):
         return self._valid_solutions
@@ -174,23 +187,17 @@ class CMAESSVC(EvolutionStrategy):
         N = self._xmean.size
         oldxmean = deepcopy(self._xmean)
 
-        fitness = lambda (child, fitness) : fitness
-        child = lambda (child, fitness) : child
-
-        sorted_fitnesses = sorted(fitnesses, key = fitness)
-        sorted_children = map(child, sorted_fitnesses)
+        population = Population.of_fitnesses(fitnesses).sort()
 
         # update meta model sort self._valid_solutions by fitness and 
         # unsorted self._sliding_infeasibles
-        self.meta_model.add_sorted_feasibles(sorted_children)       
-        self.meta_model_trained = self.meta_model.train()
+        self.meta_model.add_sorted_feasibles(list(population))
+        self.meta_model_trained =\
+            self.gate.train(self.meta_model, self.meta_model_trained)
 
         # new xmean
-        values = sorted_children[:self._mu] 
-        self._xmean = matrix([[0.0 for i in range(0,N)]]) 
-        weighted_values = zip(self._weights, values)
-        for weight, value in weighted_values:
-            self._xmean += weight * value
+        selected = population.head(self._mu)
+        self._xmean = matrix(dot(self._weights, selected.positions))
       
         # cumulation: update evolution paths
         y = self._xmean - oldxmean
@@ -207,14 +214,13 @@ class CMAESSVC(EvolutionStrategy):
         
         # adapt covariance matrix C
         # rank one update term
-        term_cov1 = self._c1 * (transpose(matrix(self._pc)) * matrix(self._pc))       
+        pc = matrix(self._pc, dtype = self._active_dtype)
+        term_cov1 = self._c1 * (transpose(pc) * pc)       
 
         # ranke mu update term
-        valuesv = [(value - oldxmean) / self._sigma for value in values] 
-        term_covmu = self._cmu *\
-            sum([self._weights[i] * (transpose(matrix(valuesv[i])) *\
-            matrix(valuesv[i]))\
-            for i in range(0, self._mu)])
+        steps = ((selected.positions - oldxmean.getA()) / self._sigma)\
+            .astype(self._active_dtype)
+        term_covmu = self._cmu * matrix(dot(steps.T * self._weights, steps))
 
         self._C = (1 - self._c1 - self._cmu) * self._C + term_cov1 + term_covmu
 
@@ -223,15 +229,15 @@ class CMAESSVC(EvolutionStrategy):
             sum(x ** 2 for x in self._ps.getA1())/(N - 1) / 2))
 
         ### UPDATE FOR NEXT ITERATION
-        self._valid_solutions = []
+        self._valid_solutions = Population(zeros((0, N)))
         
         ### STATISTICS
-        self._selected_children = values 
-        self._best_child, self._best_fitness = sorted_fitnesses[0]
-        self._worst_child, self._worst_fitness = sorted_fitnesses[-1]        
-
-        fitnesses = map(fitness, sorted_fitnesses)
-        self._mean_fitness = array(fitnesses).mean()
+        self._selected_children = selected
+        self._best_child, self._best_fitness =\
+            selected[0], population.fitnesses[0]
+        self._worst_child, self._worst_fitness =\
+            population.position(-1).copy(), population.fitnesses[-1]
+        self._mean_fitness = population.fitnesses.mean()
 
         return self._best_child, self._best_fitness
 
@@ -240,6 +246,7 @@ class CMAESSVC(EvolutionStrategy):
 
     def tell_a_posteriori_feasibility(self, apos_feasibility):        
         self._confusion_matrix = ConfusionMatrix(apos_feasibility)
+        self.gate.update(self._confusion_matrix)
         self._pending_apos_solutions = []
 
         # log all bindings
@@ -248,10 +255,11 @@ class CMAESSVC(EvolutionStrategy):
         self._count_repaired = 0
 
         self._D, self._B = eigh(self._C)
-        self._B = matrix(self._B)
         self._D = [d ** 0.5 for d in self._D] 
+        self._adapt_dtype(min(self._D) ** 2, max(self._D) ** 2)
+        self._B = matrix(self._B, dtype = self._active_dtype)
 
-        invD = diag([1.0/d for d in self._D])
+        invD = diag([1.0/d for d in self._D]).astype(self._active_dtype)
         self._invsqrtC = self._B * invD * transpose(self._B) 
 
     def _blend_B_with_rotation(self, B, rotation):
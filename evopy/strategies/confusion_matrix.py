@@ -37,13 +37,25 @@ class ConfusionMatrix():
             else:
                 self.tn += 1.0
 
+        self._mcc = self.mcc()
+
+    def add(self, confusion_matrix):
+        """ add the counts of another confusion matrix """
+        self.tp += confusion_matrix.tp
+        self.fp += confusion_matrix.fp
+        self.tn += confusion_matrix.tn
+        self.fn += confusion_matrix.fn
+        self._mcc = self.mcc()
+
+    # matthews correlation coefficient
+    def mcc(self):
         top = self.tp * self.tn - self.fp * self.fn
         bottom = sqrt((self.tp + self.fp) * (self.tp + self.fn) *\
             (self.tn + self.fp) * (self.tn + self.fn))
         if(bottom == 0):
-            self._mcc = top / 1.0
+            return top / 1.0
         else:            
-            self._mcc = top / bottom            
+            return top / bottom            
 
     def success_probability(self):
         sum_b = self.tn + self.fn + self.tp + self.fp
@@ -17,7 +17,7 @@ You should have received a copy of the GNU General Public License along with
 evopy.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-from numpy import array
+from numpy import array, ndarray, float64, finfo
 
 from sys import path
 path.append("../../..")
@@ -25,9 +25,13 @@ from evopy.helper.logger import Logger
 
 class EvolutionStrategy(object):
 
+    # arrays which are kept in the dtype of set_dtype
+    _dtype_attributes = []
+
     def __init__(self, mu, lambd):
         self._mu = mu
         self._lambd = lambd
+        self._dtype = self._active_dtype = float64
     
         self.logger = Logger(self)
 
@@ -43,6 +47,32 @@ class EvolutionStrategy(object):
         self._count_constraint_infeasibles = 0
         self._count_repaired = 0
 
+    def set_dtype(self, dtype):
+        """ set the floating point type of sampling and covariance update
+            terms, e.g. numpy.float32; accumulations like xmean, sigma and
+            the evolution paths stay float64 """
+
+        self._dtype = self._active_dtype = dtype
+        for name in self._dtype_attributes:
+            value = getattr(self, name, None)
+            if(isinstance(value, ndarray)):
+                setattr(self, name, value.astype(dtype))
+
+        if('meta_model' in dir(self)):
+            self.meta_model.set_dtype(dtype)
+
+    def _adapt_dtype(self, smallest, largest):
+        """ use the dtype while the eigenvalues of the covariance are far
+            from its range and its rounding errors are small compared to
+            the smallest eigenvalue, float64 otherwise """
+
+        info = finfo(self._dtype)
+        if(smallest > info.tiny ** 0.5 and largest < info.max ** 0.5 and\
+            largest / smallest * info.eps < 1e-3):
+            self._active_dtype = self._dtype
+        else:
+            self._active_dtype = float64
+
     def ask_pending_solutions(self):
         pass
 
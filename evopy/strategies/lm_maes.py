@@ -0,0 +1,208 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import array, log, matrix, dot, exp, zeros, sqrt, outer
+from numpy.random import normal
+from numpy.linalg import norm
+
+from evopy.helper.population import Population
+from evolution_strategy import EvolutionStrategy
+
+class LMMAES(EvolutionStrategy):
+    """ Limited-memory matrix adaptation evolution strategy, Loshchilov, 
+        Glasmachers, Beyer 2017. The covariance matrix is represented by
+        memory direction vectors, sampling and update are O(memory * N) """
+
+    description =\
+        "Limited-memory matrix adaptation evolution strategy (LM-MA-ES)"
+
+    description_short = "LM-MA-ES"
+
+    # the direction vectors represent the covariance matrix
+    _dtype_attributes = ["_M"]
+
+    def __init__(self, mu, lambd, xmean, sigma, memory = None):
+
+        # initialize super constructor
+        super(LMMAES, self).__init__(mu, lambd)
+
+        # initialize LM-MA-ES specific strategy parameters
+        self._init_lm_strategy_parameters(xmean, sigma, memory)
+
+        # valid solutions
+        self._valid_solutions = Population(zeros((0, xmean.size)))
+
+        # statistics
+        self.logger.add_const_binding('_xmean', 'initial_xmean')
+        self.logger.add_const_binding('_sigma', 'initial_sigma')
+        self.logger.add_const_binding('_memory', 'memory')
+
+        self.logger.add_binding('_sigma', 'sigma')
+
+        # log constants
+        self.logger.const_log()
+
+    def _init_lm_strategy_parameters(self, xmean, sigma, memory):
+
+        # dimension of objective function
+        N = xmean.size
+        self._xmean = xmean
+        self._sigma = sigma
+
+        # recombination weights
+        self._weights = [log(self._mu + 0.5) - log(i + 1) for i in range(self._mu)]
+        self._weights = [w / sum(self._weights) for w in self._weights]
+        self._mueff = sum(self._weights) ** 2 / sum(w ** 2 for w in self._weights)
+
+        # number of direction vectors
+        if(memory == None):
+            memory = int(4 + 3 * log(N))
+        self._memory = memory
+
+        # the rates of LM-MA-ES are meant for N much larger than lambda,
+        # for the others sigma and the transformation diverge or stall;
+        # there the rates of the CMA-ES are used
+        large = N >= 10 * self._lambd
+
+        # cumulative step-size adaptation
+        self._cs = 2.0 * self._lambd / N if large else\
+            (self._mueff + 2) / (N + self._mueff + 5)
+        self._damps = 1 + 2 * max(0, sqrt((self._mueff - 1) / (N + 1)) - 1)\
+            + self._cs
+        self._chiN = sqrt(N) * (1 - 1.0 / (4 * N) + 1.0 / (21 * N ** 2))
+
+        # learning rates for the transformation and the direction vectors;
+        # the direction vectors are evolution paths, their rate is bounded
+        # by the rank-one rate of the transformation of the MA-ES and by the
+        # time constant for cumulation of the CMA-ES
+        self._cd = [1.0 / (1.5 ** i * N) for i in range(memory)]
+        cc = (4 + self._mueff / N) / (N + 4 + 2 * self._mueff / N)
+        cc = min(cc, float(self._lambd) / N)
+        if(not large):
+            c1 = 2 / ((N + 1.3) ** 2 + self._mueff)
+            self._cd = [min(cd, c1 / 2) for cd in self._cd]
+        self._cc = [cc / 4.0 ** i for i in range(memory)]
+
+        # evolution path for sigma and direction vectors
+        self._ps = zeros(N)
+        self._M = zeros((memory, N))
+
+        # direction vectors in use, one more each generation
+        self._used = 0
+
+    def _transform(self, z):
+        """ d = (prod_j (1 - cd_j) I + cd_j m_j m_j^T) z for the rows z """
+        d = z
+        for j in range(self._used):
+            m, c = self._M[j], self._cd[j]
+            d = (1 - c) * d + c * outer(dot(d, m), m)
+        return d
+
+    def _inverse_transform(self, d):
+        """ z for the steps d in the rows, every factor is inverted with the 
+            Sherman-Morrison formula """
+        z = d
+        for j in reversed(range(self._used)):
+            m, c = self._M[j], self._cd[j]
+            z = (z - c * outer(dot(z, m), m) / (1 - c + c * dot(m, m))) /\
+                (1 - c)
+        return z
+
+    def _generate_population(self, n):
+        """ sample n individuals at once, the rows of one array """
+        d = self._transform(
+            normal(0.0, 1.0, (n, self._xmean.size)).astype(self._dtype))
+        return Population(self._xmean.getA() + self._sigma * d)
+
+    def mahalanobis_norm(self, steps):
+        """ lengths of the normal samples of the steps in the rows """
+        return sqrt((self._inverse_transform(steps) ** 2).sum(axis = 1))
+
+    def ask_pending_solutions(self):
+        """ ask pending solutions; solutions which need a checking for 
+            true feasibility """        
+
+        return self._generate_population(\
+            self._lambd - len(self._valid_solutions))
+
+    def tell_feasibility(self, feasibility_information):
+        """ tell feasibilty; return True if there are no pending solutions, 
+            otherwise False """
+
+        population = Population.of_feasibilities(feasibility_information)
+        self._count_constraint_infeasibles +=\
+            int((~population.feasibilities).sum())
+        self._valid_solutions = Population.concatenate(\
+            [self._valid_solutions, population.feasible()])
+
+        return len(self._valid_solutions) >= self._lambd
+
+    def ask_valid_solutions(self):
+        return self._valid_solutions
+
+    def _update(self, fitnesses):
+        """ update all strategy specific attributes """
+
+        N = self._xmean.size
+
+        selected = Population.of_fitnesses(fitnesses).sort(self._mu)
+
+        # steps of the selected children and their normal samples, the 
+        # steps are recovered from the children, so any child can be told
+        steps = (selected.positions - self._xmean.getA()) / self._sigma
+        dw = dot(self._weights, steps)
+        zw = dot(self._weights, self._inverse_transform(steps))
+
+        # new xmean
+        self._xmean = self._xmean + self._sigma * matrix(dw)
+
+        # evolution path for sigma and direction vectors
+        c = (self._cs * (2 - self._cs) * self._mueff) ** 0.5
+        self._ps = (1 - self._cs) * self._ps + c * zw
+        for i in range(self._memory):
+            c = (self._cc[i] * (2 - self._cc[i]) * self._mueff) ** 0.5
+            self._M[i] = (1 - self._cc[i]) * self._M[i] + c * zw
+        self._used = min(self._used + 1, self._memory)
+
+        self._sigma *= exp((self._cs / self._damps) *\
+            (norm(self._ps) / self._chiN - 1))
+
+        ### UPDATE FOR NEXT ITERATION
+        self._valid_solutions = Population(zeros((0, N)))
+
+        ### STATISTICS
+        self._selected_children = selected
+        self._best_child, self._best_fitness =\
+            selected[0], selected.fitnesses[0]
+        self._worst_child, self._worst_fitness =\
+            selected[-1], selected.fitnesses[-1]
+        self._mean_fitness = selected.fitnesses.mean()
+
+        return self._best_child, self._best_fitness
+
+    def tell_fitness(self, fitnesses):
+        """ tell fitness; update all strategy specific attributes """        
+
+        best_child, best_fitness = self._update(fitnesses)
+
+        # log all bindings
+        self.logger.log()
+        self._count_constraint_infeasibles = 0                
+
+        return best_child, best_fitness
@@ -0,0 +1,119 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy.random import random
+
+from evopy.helper.population import Population
+from lm_maes import LMMAES
+from confusion_matrix import ConfusionMatrix
+from meta_model_gate import FixedGate
+
+class LMMAESSVC(LMMAES):
+    """ LM-MA-ES with a linear SVC meta model of the constraint, 
+        solutions the meta model classifies as infeasible are discarded 
+        without checking the true constraint """
+
+    description =\
+        "Limited-memory matrix adaptation evolution strategy (LM-MA-ES) "\
+        "with linear SVC meta model"
+
+    description_short = "LM-MA-ES with SVC"
+
+    def __init__(self, mu, lambd, xmean, sigma, beta, meta_model,\
+        memory = None, gate = None):
+
+        # call super constructor 
+        super(LMMAESSVC, self).__init__(mu, lambd, xmean, sigma, memory)
+
+        # SVC Metamodel
+        self.meta_model = meta_model
+        self.meta_model_trained = False
+        self._beta = beta
+
+        # usage of the meta model, a fixed beta by default
+        self.gate = gate if gate != None else FixedGate(beta)
+
+        self._pending_apos_solutions = []
+
+        # statistics
+        self.logger.add_const_binding('_beta', 'beta')
+        self.logger.add_binding('_confusion_matrix', 'confusion_matrix')
+
+        # log constants
+        self.logger.const_log()
+
+    def ask_pending_solutions(self):
+        """ ask pending solutions; solutions which need a checking for true 
+            feasibility """
+
+        while(True):
+            population = self._generate_population(\
+                self._lambd - len(self._valid_solutions))
+            if(not self.gate.use(self.meta_model_trained)):
+                return population
+
+            # a part of the individuals is checked by the meta model, the
+            # meta-infeasible ones are only kept for the a posteriori check
+            checked = (random(len(population)) < self.gate.beta).nonzero()[0]
+            predictions = self.gate.check_feasibilities(self.meta_model,\
+                population.take(checked))
+            for index, prediction in zip(checked, predictions):
+                self._pending_apos_solutions.append(\
+                    (population.position(index).copy(), prediction))
+
+            population.feasibilities[checked[~predictions]] = False
+            population = population.feasible()
+            if(len(population) > 0):
+                return population
+
+    def tell_feasibility(self, feasibility_information):
+        """ tell feasibilty; return True if there are no pending solutions, 
+            otherwise False """
+
+        population = Population.of_feasibilities(feasibility_information)
+        for child in population.infeasible():
+            self._count_constraint_infeasibles += 1
+            self.meta_model.add_infeasible(child)
+
+        self._valid_solutions = Population.concatenate(\
+            [self._valid_solutions, population.feasible()])
+        return len(self._valid_solutions) >= self._lambd
+
+    def tell_fitness(self, fitnesses):
+        """ tell fitness; train the meta model and update all strategy 
+            specific attributes """       
+
+        population = Population.of_fitnesses(fitnesses).sort()
+        self.meta_model.add_sorted_feasibles(list(population))
+        self.meta_model_trained =\
+            self.gate.train(self.meta_model, self.meta_model_trained)
+
+        return self._update(population)
+
+    def ask_a_posteriori_solutions(self):
+        return self._pending_apos_solutions        
+
+    def tell_a_posteriori_feasibility(self, apos_feasibility):        
+        self._confusion_matrix = ConfusionMatrix(apos_feasibility)
+        self.gate.update(self._confusion_matrix)
+        self._pending_apos_solutions = []
+
+        # log all bindings
+        self.logger.log()
+        self._count_constraint_infeasibles = 0                
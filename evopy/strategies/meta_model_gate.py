@@ -0,0 +1,168 @@
+'''
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from collections import deque
+from time import time
+
+from sys import path
+path.append("../..")
+from evopy.helper.logger import Logger
+
+from confusion_matrix import ConfusionMatrix
+
+class FixedGate(object):
+    """ uses a trained meta model with the fixed probability beta and
+        trains it every generation """
+
+    def __init__(self, beta):
+        self.beta = beta
+
+    def use(self, meta_model_trained):
+        return meta_model_trained
+
+    def check_feasibility(self, meta_model, position):
+        return meta_model.check_feasibility(position)
+
+    def check_feasibilities(self, meta_model, population):
+        return meta_model.check_feasibilities(population)
+
+    def train(self, meta_model, meta_model_trained):
+        return meta_model.train()
+
+    def update(self, confusion_matrix):
+        pass
+
+class MetaModelGate(FixedGate):
+    """ adapts the usage of the meta model to the constraint evaluations
+        it saves. A true negative saves a constraint evaluation, a false
+        negative discards a feasible solution and costs one. With
+        constraint_cost, the seconds of a constraint evaluation, the
+        measured seconds of training and prediction are charged as well.
+        While the saving over the last window generations is positive beta
+        grows by factor, otherwise it shrinks; after patience generations
+        without saving the meta model is not used and not trained for
+        pause generations. Retraining is skipped while the rolling MCC is
+        at least retrain_mcc. """
+
+    def __init__(self, beta, window = 5, factor = 1.2, beta_min = 0.05,\
+        beta_max = 1.0, patience = 3, pause = 10, retrain_mcc = 0.95,\
+        constraint_cost = None):
+
+        super(MetaModelGate, self).__init__(beta)
+
+        self._window = deque(maxlen = window)
+        self._factor = factor
+        self._beta_min = beta_min
+        self._beta_max = beta_max
+        self._patience = patience
+        self._pause = pause
+        self._retrain_mcc = retrain_mcc
+        self._constraint_cost = constraint_cost
+
+        self._state = 'on'
+        self._stale = True
+        self._losses = 0
+        self._paused = 0
+        self._seconds = 0.0
+        self._rolling = ConfusionMatrix([])
+
+        self._retrained = False
+        self._saving = None
+        self.logger = Logger(self)
+        self.logger.add_binding('beta', 'beta')
+        self.logger.add_binding('_state', 'state')
+        self.logger.add_binding('_retrained', 'retrained')
+        self.logger.add_binding('_saving', 'saving')
+        self.logger.add_binding('_ppv', 'ppv')
+        self.logger.add_binding('_npv', 'npv')
+        self.logger.add_binding('_mcc', 'mcc')
+
+    def use(self, meta_model_trained):
+        return meta_model_trained and self._state == 'on'
+
+    def check_feasibility(self, meta_model, position):
+        start = time()
+        prediction = meta_model.check_feasibility(position)
+        self._seconds += time() - start
+        return prediction
+
+    def check_feasibilities(self, meta_model, population):
+        start = time()
+        predictions = meta_model.check_feasibilities(population)
+        self._seconds += time() - start
+        return predictions
+
+    def train(self, meta_model, meta_model_trained):
+        """ train unless the meta model is paused or good enough """
+
+        self._retrained = self._state == 'on' and (self._stale or\
+            not meta_model_trained or self._rolling.mcc() < self._retrain_mcc)
+        if(not self._retrained):
+            return meta_model_trained
+
+        start = time()
+        meta_model_trained = meta_model.train()
+        self._seconds += time() - start
+        self._stale = False
+        return meta_model_trained
+
+    def _saving_of(self, confusion_matrix, seconds):
+        saving = confusion_matrix.tn - confusion_matrix.fn
+        if(self._constraint_cost == None):
+            return saving
+        return saving * self._constraint_cost - seconds
+
+    def update(self, confusion_matrix):
+        """ adapt to the a posteriori checked predictions of a generation """
+
+        checked = confusion_matrix.tp + confusion_matrix.fp +\
+            confusion_matrix.tn + confusion_matrix.fn
+
+        if(self._state == 'off'):
+            self._paused -= 1
+            if(self._paused <= 0):
+                self._state = 'on'
+                self._stale = True
+        elif(checked > 0):
+            self._window.append((confusion_matrix, self._seconds))
+            self._rolling = ConfusionMatrix([])
+            for matrix, seconds in self._window:
+                self._rolling.add(matrix)
+            self._saving = sum([self._saving_of(matrix, seconds)\
+                for matrix, seconds in self._window])
+
+            if(self._saving > 0):
+                self._losses = 0
+                self.beta = min(self._beta_max, self.beta * self._factor)
+            else:
+                self._losses += 1
+                self.beta = max(self._beta_min, self.beta / self._factor)
+
+            if(self._losses >= self._patience):
+                self._state = 'off'
+                self._paused = self._pause
+                self._losses = 0
+                self._window.clear()
+                self._rolling = ConfusionMatrix([])
+
+        self._ppv = self._rolling.ppv()
+        self._npv = self._rolling.npv()
+        self._mcc = self._rolling.mcc()
+        self.logger.log()
+        self._seconds = 0.0
@@ -27,6 +27,7 @@ from numpy.random import normal
 
 from evolution_strategy import EvolutionStrategy
 from confusion_matrix import ConfusionMatrix
+from meta_model_gate import FixedGate
 
 # constants, row indices for individual matrix
 POS = 0
@@ -41,7 +42,7 @@ class ORIDSESAlignedSVC(EvolutionStrategy):
     description_short = "Ori. DSES with SVC alignment"
 
     def __init__(self, mu, lambd, theta, pi, initial_sigma,\
-        delta, tau0, tau1, initial_pos, beta, meta_model):
+        delta, tau0, tau1, initial_pos, beta, meta_model, gate = None):
 
         super(ORIDSESAlignedSVC, self).__init__(mu, lambd)
 
@@ -65,6 +66,9 @@ class ORIDSESAlignedSVC(EvolutionStrategy):
         self.meta_model_trained = False
         self._beta = beta
 
+        # usage of the meta model, a fixed beta by default
+        self.gate = gate if gate != None else FixedGate(beta)
+
         self._current_population = [] 
         self._valid_solutions = [] 
         self._pending_apos_solutions = []
@@ -216,9 +220,11 @@ class ORIDSESAlignedSVC(EvolutionStrategy):
         
         individuals = [] 
         while(len(individuals) < 1):
-            if((random.random() < self._beta) and self.meta_model_trained):
+            if((random.random() < self.gate.beta) and\
+                self.gate.use(self.meta_model_trained)):
                 individual = self._generate_individual()
-                if(self.meta_model.check_feasibility(individual[POS])):
+                if(self.gate.check_feasibility(self.meta_model,\
+                    individual[POS])):
                     individuals.append(individual)
                     self._pending_apos_solutions.append((individual, True))
                 else:
@@ -265,7 +271,8 @@ class ORIDSESAlignedSVC(EvolutionStrategy):
         # unsorted self._sliding_infeasibles
         sorted_feasibles = map(position, sorted_fitnesses)        
         self.meta_model.add_sorted_feasibles(sorted_feasibles)       
-        self.meta_model_trained = self.meta_model.train()
+        self.meta_model_trained =\
+            self.gate.train(self.meta_model, self.meta_model_trained)
 
         """ update the selection probabilites according to 
             anti-proportional fitness. """      
@@ -306,6 +313,7 @@ class ORIDSESAlignedSVC(EvolutionStrategy):
 
     def tell_a_posteriori_feasibility(self, apos_feasibility):        
         self._confusion_matrix = ConfusionMatrix(apos_feasibility)
+        self.gate.update(self._confusion_matrix)
         self._pending_apos_solutions = []
 
         # log all bindings
@@ -30,6 +30,11 @@ POS = 0
 SIGMA = 1
 
 class ORIDSESSVCR(EvolutionStrategy):
+    """ uses the meta model with the fixed probability beta and retrains
+        it every generation: the meta-infeasible candidates are repaired
+        instead of discarded and still cost a constraint evaluation, so a
+        MetaModelGate, which adapts to the saved evaluations, does not
+        apply """
 
     description =\
         "Ori. DSES with SVC and repair"
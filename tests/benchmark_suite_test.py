@@ -0,0 +1,101 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import sys
+import json
+from os import environ, mkdir
+from os.path import abspath, dirname, join
+from tempfile import mkdtemp
+from shutil import rmtree
+from subprocess import Popen, PIPE
+
+ROOT = dirname(dirname(abspath(__file__)))
+COMPARE = join(ROOT, 'evopy', 'examples', 'experiments', 'benchmark_suite',\
+    'compare.py')
+
+def _run(label, seconds, evaluations):
+    return {'label' : label, 'time' : '2013-01-01 00:00:00',\
+        'commit' : None, 'results' : [\
+        {'case' : 'import evopy.strategies.cmaes', 'import_seconds' : 0.1},
+        {'case' : 'CMAES TR N=2 lambda=20',\
+            'seconds_per_generation' : seconds,\
+            'evaluations_per_second' : evaluations,\
+            'peak_rss_bytes' : 0}]}
+
+def _compare(runs, *args):
+    """ exit status and output of compare.py on the history runs """
+
+    directory = mkdtemp()
+    try:
+        mkdir(join(directory, 'output'))
+        history = open(join(directory, 'output', 'history.jsonl'), 'w')
+        for run in runs:
+            history.write(json.dumps(run) + "\n")
+        history.close()
+        env = dict(environ)
+        env['PYTHONPATH'] = ROOT
+        process = Popen([sys.executable, COMPARE] + list(args),\
+            stdout = PIPE, stderr = PIPE, cwd = directory, env = env)
+        out, err = process.communicate()
+        assert process.returncode in [0, 1], err
+        return process.returncode, out
+    finally:
+        rmtree(directory)
+
+METRICS = ['seconds_per_generation', 'evaluations_per_second',\
+    'peak_rss_bytes', 'import_seconds']
+
+def _regressions(out):
+    """ metrics flagged as regressions """
+    return [metric for line in out.splitlines() for metric in METRICS\
+        if line.endswith('REGRESSION') and metric in line.split()]
+
+def benchmark_compare_test():
+    baseline = _run('before', 0.10, 1000.0)
+
+    # slower generations fail the gate, better metrics pass
+    status, out = _compare([baseline, _run('after', 0.20, 1000.0)])
+    assert status == 1
+    assert _regressions(out) == ['seconds_per_generation']
+    assert "1 regressions beyond 30%" in out
+
+    status, out = _compare([baseline, _run('after', 0.05, 2000.0)])
+    assert status == 0 and _regressions(out) == []
+
+    # fewer evaluations per second are worse, within the threshold is not
+    status, out = _compare([baseline, _run('after', 0.12, 500.0)])
+    assert status == 1
+    assert _regressions(out) == ['evaluations_per_second']
+    status, out = _compare([baseline, _run('after', 0.12, 500.0)], '0.6')
+    assert status == 0
+
+def benchmark_compare_runs_test():
+    runs = [_run('before', 0.10, 1000.0), _run('slow', 0.20, 1000.0),\
+        _run('after', 0.10, 1000.0)]
+
+    # the last two runs by default, otherwise by index or by label
+    assert _compare(runs)[0] == 0
+    assert _compare(runs, '0.3', '0', '1')[0] == 1
+    assert _compare(runs, '0.3', 'before', 'slow')[0] == 1
+    assert _compare(runs, '0.3', 'slow', 'after')[0] == 0
+
+    # a single run has nothing to compare with
+    status, out = _compare(runs[:1])
+    assert status == 0 and "at least two runs are needed" in out
@@ -0,0 +1,86 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix, float32, float64
+from numpy.random import seed
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.lm_maes import LMMAES
+from evopy.simulators.simulator import Simulator
+from evopy.operators.termination.generations import Generations
+
+class SphereProblem(object):
+    """ the sphere, records the dtypes of the positions it receives """
+
+    description = "Sphere"
+
+    def __init__(self, dtype = None):
+        if(dtype != None):
+            self.dtype = dtype
+        self.dtypes = set([])
+
+    def is_feasible(self, x):
+        self.dtypes.add(x.dtype.type)
+        return True
+
+    def fitness(self, x):
+        self.dtypes.add(x.dtype.type)
+        return float((x.getA1() ** 2).sum())
+
+def get_simulator(optimizer, problem, dtype):
+    return Simulator(optimizer, problem, Generations(30), dtype = dtype)
+
+def dtype_sampling_test():
+    for optimizer in [CMAES(5, 10, matrix([[3.0] * 4]), 1.0),\
+        CMAES(5, 10, matrix([[3.0] * 4]), 1.0, separable = True),\
+        LMMAES(5, 10, matrix([[3.0] * 4]), 1.0)]:
+        seed(0)
+        problem = SphereProblem()
+        simulator = get_simulator(optimizer, problem, float32)
+        arrays = [getattr(optimizer, name) for name\
+            in optimizer._dtype_attributes\
+            if hasattr(getattr(optimizer, name), 'dtype')]
+        assert len(arrays) > 0
+        assert all([array.dtype == float32 for array in arrays])
+
+        # the problem receives float64, the accumulations stay float64
+        for generation in range(30):
+            best = simulator._generation()
+        assert problem.dtypes == set([float64])
+        assert optimizer._xmean.dtype == float64
+        # from a fitness of 36
+        assert best < 3.6
+
+def dtype_problem_test():
+    problem = SphereProblem(float32)
+    simulator = get_simulator(CMAES(5, 10, matrix([[3.0] * 4]), 1.0),\
+        problem, None)
+    simulator._generation()
+    assert problem.dtypes == set([float32])
+
+def dtype_fallback_test():
+    # float64 while the covariance is badly conditioned
+    optimizer = CMAES(5, 10, matrix([[3.0] * 4]), 1.0)
+    optimizer.set_dtype(float32)
+    optimizer._adapt_dtype(1.0, 10.0)
+    assert optimizer._active_dtype == float32
+    optimizer._adapt_dtype(1e-8, 1.0)
+    assert optimizer._active_dtype == float64
+    optimizer._adapt_dtype(1e-40, 1e-38)
+    assert optimizer._active_dtype == float64
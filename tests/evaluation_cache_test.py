@@ -0,0 +1,84 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+from numpy import matrix
+from evopy.helper.evaluation_cache import EvaluationCache, get_namespace
+from evopy.strategies.cmaes import CMAES
+from evopy.problems.tr_problem import TRProblem
+from evopy.problems.schwefels_problem_240 import SchwefelsProblem240
+from evopy.simulators.simulator import Simulator
+from evopy.operators.termination.generations import Generations
+
+def evaluation_cache_lru_test():
+    cache = EvaluationCache(size = 2)
+    cache.put('P', 'fitness', matrix([[1.0, 2.0]]), 5.0)
+    cache.put('P', 'fitness', matrix([[2.0, 2.0]]), 8.0)
+    assert cache.get('P', 'fitness', matrix([[1.0, 2.0]])) == 5.0
+    cache.put('P', 'fitness', matrix([[3.0, 2.0]]), 13.0)
+
+    # the least recently used entry is evicted
+    assert cache.get('P', 'fitness', matrix([[2.0, 2.0]])) == None
+    assert cache.get('P', 'fitness', matrix([[1.0, 2.0]])) == 5.0
+    assert cache.get('P', 'feasibility', matrix([[1.0, 2.0]])) == None
+    assert cache.get('Q', 'fitness', matrix([[1.0, 2.0]])) == None
+
+def evaluation_cache_quantization_test():
+    cache = EvaluationCache(quantization = 0.1)
+    cache.put('P', 'fitness', matrix([[1.0, 2.0]]), 5.0)
+    assert cache.get('P', 'fitness', matrix([[1.01, 1.99]])) == 5.0
+    assert cache.get('P', 'fitness', matrix([[1.1, 2.0]])) == None
+
+def evaluation_cache_disk_test():
+    directory = mkdtemp()
+    try:
+        path = join(directory, 'cache.db')
+        cache = EvaluationCache(path = path)
+        cache.put('P', 'fitness', matrix([[1.0, 2.0]]), 5.0)
+        cache.log()
+
+        cache = EvaluationCache(path = path)
+        assert cache.get('P', 'fitness', matrix([[1.0, 2.0]])) == 5.0
+        assert cache._count_disk_hits == 1
+    finally:
+        rmtree(directory)
+
+def evaluation_cache_namespace_test():
+    assert get_namespace(SchwefelsProblem240(3)) !=\
+        get_namespace(SchwefelsProblem240(10))
+    assert get_namespace(TRProblem(2)) == get_namespace(TRProblem(2))
+    problem = TRProblem(2)
+    problem.cache_namespace = 'tr'
+    assert get_namespace(problem) == 'tr'
+
+def evaluation_cache_uncounted_test():
+    """ a-posteriori checks neither count nor fill the cache """
+
+    optimizer = CMAES(2, 4, matrix([[5.0, 5.0]]), 1.0)
+    simulator = Simulator(optimizer, TRProblem(), Generations(1),\
+        cache = EvaluationCache())
+    position = matrix([[5.0, 5.0]])
+    assert simulator._is_feasible(position, count = False)
+    assert simulator._count_cfc == 0
+    assert simulator._is_feasible(position)
+    assert simulator._count_cfc == 1
+    assert simulator._is_feasible(position)
+    assert simulator._count_cfc == 1
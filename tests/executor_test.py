@@ -0,0 +1,91 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from time import sleep
+from nose.tools import assert_raises
+from evopy.simulators.executor import Executor
+
+def square(x):
+    # the later items finish first
+    sleep(0.01 * (5 - x % 5))
+    return x * x
+
+def inverse(x):
+    return 1.0 / x
+
+class RequiredArgument(Exception):
+    """ cannot be unpickled, its constructor needs two arguments """
+    def __init__(self, first, second):
+        Exception.__init__(self, first + second)
+
+def required(x):
+    raise RequiredArgument("missing ", "argument")
+
+def executor_order_test():
+    for mode in ['thread', 'fork', 'auto']:
+        executor = Executor(mode, workers = 3)
+        assert executor.map(square, range(10)) == [x * x for x in range(10)]
+
+    # the first jobs are probed on threads, the others forked
+    executor = Executor('auto', workers = 3, threshold = 1e6)
+    assert executor.map(square, range(10)) == [x * x for x in range(10)]
+    assert executor.used_mode == 'fork'
+
+def executor_errors_test():
+    # the exceptions are the results of their items, like playdoh's map
+    for mode in ['thread', 'fork']:
+        results = Executor(mode, workers = 2).map(inverse, [1.0, 0.0, 2.0])
+        assert results[0] == 1.0 and results[2] == 0.5
+        assert isinstance(results[1], ZeroDivisionError)
+        assert 'ZeroDivisionError' in results[1].traceback
+
+    results = Executor('fork', workers = 2).map(required, [1])
+    assert isinstance(results[0], Exception)
+    assert 'missing argument' in str(results[0])
+
+class Run(object):
+    """ a job which keeps its result, like a simulator """
+
+    def __init__(self, x):
+        self.x = x
+        self.result = None
+
+    def simulate(self):
+        self.result = self.x * 2
+        return self
+
+def executor_in_process_test():
+    # threads share the jobs, nothing is pickled
+    runs = [Run(x) for x in range(4)]
+    results = Executor('thread', workers = 2).map(Run.simulate, runs)
+    assert all([result is run for result, run in zip(results, runs)])
+    assert [run.result for run in runs] == [0, 2, 4, 6]
+
+    # forked jobs come back as copies
+    runs = [Run(x) for x in range(4)]
+    results = Executor('fork', workers = 2).map(Run.simulate, runs)
+    assert [result.result for result in results] == [0, 2, 4, 6]
+    assert [run.result for run in runs] == [None] * 4
+
+    # a single worker needs no probe
+    executor = Executor('auto', workers = 1)
+    executor.map(Run.simulate, [Run(1)])
+    assert executor.used_mode == 'thread' and executor.parallelism == None
+    assert_raises(Exception, Executor, 'process')
@@ -0,0 +1,71 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix, sqrt, allclose
+from numpy.random import seed
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.lm_maes import LMMAES
+from evopy.problems.tr_problem import TRProblem
+from evopy.simulators.island_simulator import Island, get_topology
+from evopy.operators.termination.generations import Generations
+
+BOUND = sqrt(2) + 2.0 * 2 / (2 + 2)
+
+def get_island(optimizer):
+    return Island(optimizer, TRProblem(), Generations(50), migrants = 2)
+
+def get_cmaes():
+    return CMAES(15, 100, matrix([[5.0, 5.0]]), 1.0)
+
+def island_inject_test():
+    for optimizer in [get_cmaes(), LMMAES(15, 100, matrix([[5.0, 5.0]]), 1.0)]:
+        island = get_island(optimizer)
+        far, near = matrix([[1e6, 1e6]]), matrix([[5.5, 5.0]])
+        injected = island._inject([(far, 2.0), (near, 3.0)])
+
+        # the far immigrant keeps its direction and fitness, the near one
+        # is not changed
+        steps = injected.positions - matrix([[5.0, 5.0]]).getA()
+        assert allclose(optimizer.mahalanobis_norm(steps[:1]), BOUND)
+        assert allclose(steps[0, 0], steps[0, 1])
+        assert allclose(injected.positions[1], near.getA1())
+        assert list(injected.fitnesses) == [2.0, 3.0]
+
+def island_migration_test():
+    seed(0)
+    source, target = get_island(get_cmaes()), get_island(get_cmaes())
+    for generation in range(30):
+        source._generation()
+        target._generation()
+
+        # a far away immigrant with the best fitness in every generation
+        emigrants, infeasibles = source.emigrate()
+        assert len(emigrants) == 2
+        target.immigrate(([(matrix([[1e6, 1e6]]), 0.0)], infeasibles))
+
+    # the paths and sigma are not wrecked by the immigrants
+    assert target.logger.all()['count_immigrants'][-1] == 1
+    assert target.optimizer._sigma < 10.0
+    assert abs(target.optimizer._xmean).max() < 1e3
+
+def island_topology_test():
+    assert get_topology('ring', 3) == [('island_0_1', 0, 1),\
+        ('island_1_2', 1, 2), ('island_2_0', 2, 0)]
+    assert len(get_topology('star', 3)) == 4
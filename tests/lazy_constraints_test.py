@@ -0,0 +1,69 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import matrix, ones
+from numpy.random import seed, uniform
+from nose.tools import assert_raises
+from evopy.problems.constraint import Constraint, LazyConstraints
+from evopy.problems.schwefels_problem_240 import SchwefelsProblem240
+
+def lazy_constraints_order_test():
+    """ the expensive constraint is only evaluated if the cheap one is
+        satisfied, the often violated constraint moves to the front """
+
+    calls = []
+    def expensive(x):
+        calls.append(x)
+        return x[0, 1]
+
+    constraints = LazyConstraints([\
+        Constraint(expensive, cost = 100.0),
+        Constraint(lambda x : x[0, 0], cost = 1.0)])
+
+    assert constraints._order == [1, 0]
+    assert not constraints.is_feasible(matrix([[-1.0, 1.0]]))
+    assert len(calls) == 0
+    assert constraints.is_feasible(matrix([[1.0, 1.0]]))
+    assert len(calls) == 1
+
+    constraints = LazyConstraints([\
+        Constraint(lambda x : x[0, 0]), Constraint(lambda x : x[0, 1])])
+    for i in range(10):
+        assert constraints.violated(matrix([[1.0, -1.0]])) == 1
+    assert constraints._order == [1, 0]
+
+def schwefels_problem_240_constraints_test():
+    """ the single constraints agree with is_feasible in any dimension,
+        both reject positions of other dimensions """
+
+    seed(0)
+    for dimensions in [3, 10]:
+        problem = SchwefelsProblem240(dimensions)
+        constraints = LazyConstraints(problem.constraints())
+        feasibles = 0
+        for i in range(200):
+            x = matrix(uniform(-100.0, 1000.0, (1, dimensions)))
+            feasible = problem.is_feasible(x)
+            assert constraints.is_feasible(x) == feasible
+            feasibles += int(feasible)
+        assert 0 < feasibles < 200
+
+        for x in [matrix(ones((1, 2))), matrix(ones((1, 12)))]:
+            assert_raises(Exception, problem.is_feasible, x)
+            assert_raises(Exception, constraints.is_feasible, x)
@@ -0,0 +1,72 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import sys
+from os import environ, listdir
+from tempfile import mkdtemp
+from shutil import rmtree
+from subprocess import Popen, PIPE
+
+# the core of a simulation, none of them needs sklearn, scipy or playdoh
+# before a meta model is trained or a run is parallelized
+CORE = ['evopy.simulators.simulator', 'evopy.simulators.restart_simulator',
+    'evopy.simulators.executor', 'evopy.simulators.results',
+    'evopy.strategies.cmaes', 'evopy.strategies.cmaes_svc',
+    'evopy.strategies.cmaes_rsvc', 'evopy.strategies.ori_dses_svc',
+    'evopy.strategies.ori_dses_aligned_svc', 'evopy.strategies.lm_maes_svc',
+    'evopy.metamodel.svc_linear_meta_model',
+    'evopy.metamodel.cma_svc_linear_meta_model',
+    'evopy.metamodel.cma_svc_rbf_meta_model',
+    'evopy.metamodel.cv.svc_cv_sklearn_grid_linear',
+    'evopy.metamodel.cv.svc_cv_sklearn_grid_rbf',
+    'evopy.problems.tr_problem']
+
+HEAVY = ['sklearn', 'scipy', 'matplotlib', 'evopy.external.playdoh']
+
+def _loaded(modules, home):
+    """ heavy modules loaded by importing modules in a fresh interpreter """
+
+    script = "import sys\n" +\
+        "".join(["import %s\n" % module for module in modules]) +\
+        "print ' '.join([m for m in %r if m in sys.modules])" % HEAVY
+    env = dict(environ)
+    env['HOME'] = home
+    process = Popen([sys.executable, '-c', script], stdout = PIPE,\
+        stderr = PIPE, env = env)
+    out, err = process.communicate()
+    assert process.returncode == 0, err
+    return out.split()
+
+def lazy_imports_core_test():
+    home = mkdtemp()
+    try:
+        assert _loaded(CORE, home) == []
+    finally:
+        rmtree(home)
+
+def lazy_imports_playdoh_test():
+    home = mkdtemp()
+    try:
+        loaded = _loaded(['evopy.external.playdoh'], home)
+        assert not 'scipy' in loaded
+        # the user directories are created when a job needs them
+        assert listdir(home) == []
+    finally:
+        rmtree(home)
@@ -0,0 +1,88 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix
+from numpy.random import seed
+from evopy.strategies.lm_maes import LMMAES
+from evopy.strategies.lm_maes_svc import LMMAESSVC
+from evopy.metamodel.cma_svc_linear_meta_model import CMASVCLinearMetaModel
+from evopy.metamodel.cv.svc_cv_sklearn_grid_linear import SVCCVSkGridLinear
+from evopy.operators.scaling.scaling_standardscore import ScalingStandardscore
+from evopy.problems.tr_problem import TRProblem
+from evopy.problems.sphere_problem_origin_r1 import SphereProblemOriginR1
+from evopy.simulators.simulator import Simulator
+from evopy.operators.termination.generations import Generations
+
+from sklearn.cross_validation import KFold
+
+def get_method_lmmaes(mu = 15):
+    return LMMAES(\
+        mu = mu,
+        lambd = 100,
+        xmean = matrix([[5.0, 5.0]]),
+        sigma = 1.0)
+
+def get_method_lmmaessvc():
+    sklearn_cv = SVCCVSkGridLinear(\
+        C_range = [2 ** i for i in range(-5, 5, 2)],
+        cv_method = KFold(20, 5))
+
+    meta_model = CMASVCLinearMetaModel(\
+        window_size = 10,
+        scaling = ScalingStandardscore(),
+        crossvalidation = sklearn_cv,
+        repair_mode = 'mirror')
+
+    return LMMAESSVC(\
+        mu = 15,
+        lambd = 100,
+        xmean = matrix([[5.0, 5.0]]),
+        sigma = 1.0,
+        beta = 0.9,
+        meta_model = meta_model)
+
+def converges(optimizer, problem, generations = 60):
+    """ the run ends close to the optimum and sigma never grows much, 
+        lambda is not much smaller than N in two dimensions """
+
+    Simulator(optimizer, problem, Generations(generations)).simulate()
+    error = optimizer._best_fitness - problem.optimum_fitness()
+    sigmas = optimizer.logger.all()['sigma']
+    return error < 1e-3 and max(sigmas) < 10.0
+
+def LMMAES_TR2_test():
+    # seeds which diverged or stalled with the LM-MA-ES step-size rate
+    for s in [3, 10, 11, 12, 14]:
+        seed(s)
+        assert converges(get_method_lmmaes(), TRProblem())
+
+def LMMAES_Sphere2_test():
+    for s in [12]:
+        seed(s)
+        assert converges(get_method_lmmaes(), SphereProblemOriginR1())
+
+def LMMAES_large_mu_TR2_test():
+    # many selected children, the direction vectors diverged
+    seed(0)
+    assert converges(get_method_lmmaes(mu = 50), TRProblem(), 100)
+
+def LMMAESSVC_TR2_test():
+    seed(3)
+    assert converges(get_method_lmmaessvc(), TRProblem())
@@ -0,0 +1,44 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import arange
+from numpy.random import seed, normal
+from evopy.helper.population import Population
+from evopy.metamodel.lq_fitness_meta_model import LQFitnessMetaModel
+
+def lq_fitness_meta_model_screening_test():
+    """ on a quadratic fitness the model is exact, after the archive is
+        large enough only a few individuals are evaluated, and the best
+        individual is among them """
+
+    seed(0)
+    fitness_of = lambda X : ((arange(1, 4) * X) ** 2).sum(axis = 1)
+    meta_model = LQFitnessMetaModel()
+
+    for generation in range(4):
+        population = Population(normal(0.0, 1.0, (20, 3)))
+        fitness = lambda i : fitness_of(population.positions[i:i + 1])[0]
+        evaluations = meta_model.screen(population, fitness)
+
+    assert meta_model._model == 'full'
+    assert evaluations < 5
+    true_fitnesses = fitness_of(population.positions)
+    best = true_fitnesses.argmin()
+    assert population.fitnesses[best] == true_fitnesses[best]
+    assert population.fitnesses.argmin() == best
@@ -0,0 +1,61 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import zeros
+from evopy.helper.logger import Logger
+from evopy.helper.memory_monitor import MemoryMonitor, deep_size
+
+class Component(object):
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+        self.logger = Logger(self)
+        self.logger.add_binding('_value', 'value')
+
+def deep_size_test():
+    data = zeros(1000)
+    assert deep_size(data) >= data.nbytes
+    assert deep_size([data, data, data[10:]]) < 2 * data.nbytes
+
+    seen = set()
+    assert deep_size({'a' : data}, seen) >= data.nbytes
+    assert deep_size(data, seen) == 0
+
+def memory_monitor_test():
+    meta_model = Component(_value = 0, window = [zeros(100)])
+    optimizer = Component(_value = 0, meta_model = meta_model,\
+        _pending_apos_solutions = [], _C = zeros((10, 10)))
+    simulator = Component(_value = 0, optimizer = optimizer,\
+        fitness_meta_model = None, cache = None, constraints = None)
+    monitor = MemoryMonitor(k = 2)
+    simulator.memory = monitor
+
+    for generation in range(4):
+        meta_model.window.append(zeros(100))
+        simulator._value = float(generation)
+        simulator.logger.log()
+        monitor.log(simulator)
+
+    samples = monitor.logger.all()['memory_bytes']
+    assert len(samples) == 2
+    # the meta model grows, the strategy does not hold its meta model
+    assert samples[1]['meta_model'] - samples[0]['meta_model'] >= 1600
+    assert samples[1]['strategy'] == samples[0]['strategy']
+    assert samples[1]['strategy'] < 1600 + 800 + 1000
+    assert samples[1]['logs'] > samples[0]['logs']
+    assert 'meta_model' in monitor.summary()
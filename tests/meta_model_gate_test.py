@@ -0,0 +1,91 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from evopy.strategies.confusion_matrix import ConfusionMatrix
+from numpy import matrix
+from evopy.strategies.meta_model_gate import MetaModelGate
+from evopy.strategies.ori_dses_svc import ORIDSESSVC
+
+def confusion_matrix(tp, fp, tn, fn):
+    return ConfusionMatrix([(None, True, True)] * tp +\
+        [(None, True, False)] * fp + [(None, False, False)] * tn +\
+        [(None, False, True)] * fn)
+
+def meta_model_gate_test():
+    gate = MetaModelGate(0.5, patience = 2, pause = 3)
+
+    # true negatives save constraint evaluations, beta grows
+    gate.update(confusion_matrix(10, 0, 10, 0))
+    assert gate.beta > 0.5 and gate.use(True)
+
+    # false negatives cost more than the window saved
+    gate.update(confusion_matrix(10, 0, 0, 30))
+    gate.update(confusion_matrix(10, 0, 0, 30))
+    assert not gate.use(True)
+    assert gate.logger.all()['state'] == ['on', 'on', 'off']
+
+    # paused, neither used nor trained, then retrained
+    for i in range(3):
+        assert not gate.use(True)
+        assert gate.train(None, True)
+        gate.update(confusion_matrix(0, 0, 0, 0))
+    assert gate.use(True) and gate._stale
+
+class CountingMetaModel(object):
+    """ predicts every second position feasible, counts the calls """
+
+    def __init__(self):
+        self.checks, self.trainings = 0, 0
+
+    def check_feasibility(self, position):
+        self.checks += 1
+        return self.checks % 2 == 0
+
+    def train(self):
+        self.trainings += 1
+        return True
+
+    def add_sorted_feasibles(self, feasibles):
+        pass
+
+    def add_infeasible(self, infeasible):
+        pass
+
+def ori_dses_svc_gate_test():
+    gate = MetaModelGate(1.0, patience = 1, pause = 3)
+    dses = ORIDSESSVC(2, 4, 0.3, 70, matrix([[1.0, 1.0]]), 1.0, 0.5, 0.6,\
+        matrix([[5.0, 5.0]]), 1.0, CountingMetaModel(), gate)
+    fitnesses = [(individual, 1.0 + i) for i, individual\
+        in enumerate(dses.ask_pending_solutions() * 4)]
+    dses.tell_fitness(fitnesses)
+    assert dses.meta_model.trainings == 1
+
+    # the meta model rejects the first individual
+    dses.ask_pending_solutions()
+    assert dses.meta_model.checks == 2
+    assert len(dses.ask_a_posteriori_solutions()) == 2
+    # reported as two false negatives, no saving
+    dses.tell_a_posteriori_feasibility([(None, False, True)] * 2)
+    assert gate.logger.all()['state'] == ['off']
+
+    # paused, neither used nor trained
+    dses.ask_pending_solutions()
+    dses.tell_fitness(fitnesses)
+    assert dses.meta_model.checks == 2
+    assert dses.meta_model.trainings == 1
@@ -0,0 +1,94 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import gc
+from cPickle import loads, dumps
+from nose.tools import assert_raises
+from evopy.external.playdoh import map_async
+from evopy.external.playdoh.codehandler import pickle_class
+from evopy.external.playdoh.codehandler.codehandler import PICKLED
+from evopy.external.playdoh.filetransfer import SENTFILES, MissingFile,\
+    forget_sent_files
+
+X = 1
+
+def reference():
+    return X
+
+def pickle_cache_globals_test():
+    global X
+    # lambdas are pickled by value with the globals they read
+    value = lambda : X
+    X = 1
+    assert loads(pickle_class(value).pkl)() == 1
+    X = 2
+    assert loads(pickle_class(value).pkl)() == 2
+
+def pickle_cache_class_globals_test():
+    global X
+    # not an attribute of its module, pickled by value
+    class Value(object):
+        def get(self):
+            return X
+    X = 1
+    assert loads(pickle_class(Value).pkl)().get() == 1
+    X = 2
+    assert loads(pickle_class(Value).pkl)().get() == 2
+
+def pickle_cache_reference_test():
+    # pickled by reference, the global is read where it is loaded
+    assert pickle_class(reference).pkl is pickle_class(reference).pkl
+
+    # without globals a function pickled by value is reused
+    constant = lambda : 1
+    assert pickle_class(constant).pkl is pickle_class(constant).pkl
+
+def pickle_cache_release_test():
+    # the cache does not keep the functions alive
+    constant = lambda : 1
+    pickle_class(constant)
+    assert constant in PICKLED
+    size = len(PICKLED)
+    del constant
+    gc.collect()
+    assert len(PICKLED) == size - 1
+
+def lost(filename):
+    raise MissingFile(2, "missing code dependency", filename)
+
+def missing_dependency_test():
+    pklclass = pickle_class(reference)
+    pklclass.set_code_dependencies(['removed.py'])
+    assert_raises(MissingFile, pklclass)
+
+    # the client forgets the file it sent, it is sent again
+    try:
+        pklclass()
+    except MissingFile as error:
+        error = loads(dumps(error, -1))
+    SENTFILES.add(('localhost', error.filename, 'hash'))
+    forget_sent_files(error.filename)
+    assert not ('localhost', error.filename, 'hash') in SENTFILES
+
+    # reported by the results of a map
+    SENTFILES.add(('localhost', 'lost.py', 'hash'))
+    results = map_async(lost, ['lost.py']).get_results()
+    assert isinstance(results[0], MissingFile)
+    assert not ('localhost', 'lost.py', 'hash') in SENTFILES
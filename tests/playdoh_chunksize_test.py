@@ -0,0 +1,66 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from time import sleep
+from evopy.external.playdoh import map_async
+from evopy.external.playdoh.asyncjobhandler import TASK_DURATIONS, \
+    CHUNK_DURATION, get_chunksize
+from evopy.external.playdoh.codehandler.codehandler import pickle_class
+
+# defined without source code
+def unreadable():
+    return eval("lambda x: x * 2"), eval("lambda x: x * 3")
+
+def slow(x):
+    sleep(0.01)
+    return 2 * x
+
+def durations_test():
+    square, cube = lambda x: x ** 2, lambda x: x ** 3
+    first, second = pickle_class(square), pickle_class(cube)
+    assert(first.codekey is not None)
+    assert(first.codekey != second.codekey)
+    TASK_DURATIONS[first.codekey] = CHUNK_DURATION / 10.0
+    assert(get_chunksize(first, 100, 1, 'auto') == 10)
+    assert(get_chunksize(second, 100, 1, 'auto') == 25)
+    del TASK_DURATIONS[first.codekey]
+
+def no_source_test():
+    double, triple = [pickle_class(fun) for fun in unreadable()]
+    assert(double.codekey is None and triple.codekey is None)
+    TASK_DURATIONS[double.hash] = CHUNK_DURATION / 10.0
+    assert(get_chunksize(triple, 100, 1, 'auto') == 25)
+    del TASK_DURATIONS[double.hash]
+
+def first_map_test():
+    """ a first map smaller than 4 chunks per unit measures the durations
+        for the next maps """
+
+    key = pickle_class(slow).codekey
+    TASK_DURATIONS.pop(key, None)
+    task = map_async(slow, [1, 2, 3], chunksize = 'auto')
+    assert task.get_results() == [2, 4, 6]
+    assert 0.01 <= TASK_DURATIONS[key] < CHUNK_DURATION / 10
+
+    chunksize = int(CHUNK_DURATION / TASK_DURATIONS[key])
+    assert get_chunksize(pickle_class(slow), 1000, 1, 'auto') == chunksize
+    task = map_async(slow, range(10), chunksize = 'auto')
+    assert task.get_results() == range(0, 20, 2)
+    del TASK_DURATIONS[key]
@@ -0,0 +1,75 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import socket
+from nose.tools import assert_raises
+from evopy.external.playdoh.connection import ConnectionListener
+from evopy.external.playdoh.baserpc import BaseRpcClient
+
+class FailingListener(object):
+    """ a listener whose socket fails on every accept """
+
+    def __init__(self):
+        self.accepts = 0
+
+    def accept(self):
+        self.accepts += 1
+        raise socket.error("Too many open files")
+
+    def close(self):
+        pass
+
+class LostConnection(object):
+    """ a pooled connection closed by the other end after the send """
+
+    def __init__(self):
+        self.sent = []
+        self.broken = False
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+    def recv(self):
+        self.broken = True
+        return None
+
+    def close(self):
+        pass
+
+def listener_accept_test():
+    listener = ConnectionListener(('127.0.0.1', 0))
+    listener.listener.close()
+    listener.listener = FailingListener()
+    listener.max_delay = 0.2
+
+    # retried with a growing delay, then raised
+    assert_raises(socket.error, listener.accept)
+    assert listener.listener.accepts == 3
+
+def lost_pooled_connection_test():
+    client = BaseRpcClient(('localhost', 2718))
+    client.conn, client.reused = LostConnection(), True
+    client.keep_connection = True
+    sent = client.conn.sent
+
+    # the procedure is not sent a second time
+    assert_raises(Exception, client.execute, 'procedure')
+    assert sent == ['procedure']
+    assert client.conn == None
@@ -0,0 +1,50 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from time import sleep
+from evopy.external.playdoh import map_async
+
+def inverse(x):
+    return 1.0 / x
+
+def statuses(task):
+    """ status of every task once none is waiting or running """
+    while(True):
+        status = task.get_status()
+        if(not 'queued' in status and not 'processing' in status):
+            return status
+        sleep(0.05)
+
+def playdoh_status_crashed_test():
+    task = map_async(inverse, [1.0, 0.0, 2.0])
+    # the results are retrieved first, it closes the local servers
+    status, results = statuses(task), task.get_results()
+    assert status == ['finished', 'crashed', 'finished']
+    assert isinstance(results[1], ZeroDivisionError)
+    assert results[0] == 1.0 and results[2] == 0.5
+
+def playdoh_status_chunk_crashed_test():
+    # only one of the tasks of the first chunk raised
+    task = map_async(inverse, [1.0, 0.0, 2.0, 4.0, 0.0], chunksize = 2)
+    status, results = statuses(task), task.get_results()
+    assert status == ['finished', 'crashed', 'finished', 'finished',\
+        'crashed']
+    assert results[0] == 1.0 and results[3] == 0.25
+    assert isinstance(results[1], ZeroDivisionError)
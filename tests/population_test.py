@@ -0,0 +1,176 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix, arange, array, zeros, allclose, isnan, all
+from numpy import identity, dot, outer
+from numpy.random import seed, normal
+from evopy.helper.population import Population
+from evopy.strategies.cmaes import CMAES
+from evopy.strategies.cmaes_rsvc import CMAESRSVC
+from evopy.strategies.cmaes_rrsvc import CMAESRRSVC
+from evopy.strategies.lm_maes import LMMAES
+
+def get_population():
+    return Population(arange(12.0).reshape(4, 3),\
+        fitnesses = [3.0, 1.0, 2.0, 1.0],\
+        feasibilities = [True, False, True, True])
+
+def population_indexing_test():
+    population = get_population()
+    assert len(population) == 4
+
+    # rows are 1 x N matrix views
+    assert isinstance(population[1], matrix)
+    assert population[1].shape == (1, 3)
+    assert all(population[-1] == matrix([[9.0, 10.0, 11.0]]))
+    population[0][0, 0] = -1.0
+    assert population.positions[0, 0] == -1.0
+
+    # slices are populations with their fitnesses
+    head = population[1:3]
+    assert isinstance(head, Population)
+    assert list(head.fitnesses) == [1.0, 2.0]
+    assert list(head.feasibilities) == [False, True]
+
+    assert isnan(Population(zeros((2, 3))).fitnesses).all()
+
+def population_sigmas_test():
+    population = Population(zeros((2, 3)), sigmas = [[1.0] * 3, [2.0] * 3])
+    assert population[1].shape == (2, 3)
+    assert all(population[1][1] == 2.0)
+
+    rows = Population.of_individuals(list(population))
+    assert all(rows.sigmas == population.sigmas)
+
+def population_selection_test():
+    population = get_population()
+    assert list(population.feasible().fitnesses) == [3.0, 2.0, 1.0]
+    assert list(population.infeasible().positions[0]) == [3.0, 4.0, 5.0]
+
+    # the positions move with the fitnesses, ties keep their order
+    best = population.sort(3)
+    assert list(best.fitnesses) == [1.0, 1.0, 2.0]
+    assert list(best.positions[:, 0]) == [3.0, 9.0, 6.0]
+
+    # take copies the rows
+    best.positions[0, 0] = -1.0
+    assert population.positions[1, 0] == 3.0
+
+    assert len(population.head(10)) == 4
+    tuples = population.fitness_tuples()
+    assert tuples[2][1] == 2.0 and all(tuples[2][0] == population[2])
+
+def population_concatenate_test():
+    population = get_population()
+    both = Population.concatenate([population, population[:1]])
+    assert len(both) == 5
+    assert list(both.fitnesses) == [3.0, 1.0, 2.0, 1.0, 3.0]
+    assert list(both.feasibilities)[-2:] == [True, True]
+    assert both.sigmas is None
+
+def population_tuples_test():
+    population = get_population()
+    assert Population.of_fitnesses(population) is population
+    assert Population.of_feasibilities(population) is population
+
+    fitnesses = Population.of_fitnesses(\
+        [(matrix([[1.0, 2.0]]), 5.0), (matrix([[3.0, 4.0]]), 4.0)])
+    assert all(fitnesses.positions == array([[1.0, 2.0], [3.0, 4.0]]))
+    assert list(fitnesses.sort().fitnesses) == [4.0, 5.0]
+
+    feasibilities = Population.of_feasibilities(\
+        [(matrix([[1.0, 2.0]]), False), (matrix([[3.0, 4.0]]), True)])
+    assert len(feasibilities.feasible()) == 1
+
+class UntrainedMetaModel(object):
+    """ a meta model which never trains, the SVC strategies sample and
+        update like the CMA-ES """
+
+    def add_infeasible(self, infeasible):
+        pass
+
+    def add_sorted_feasibles(self, feasibles):
+        pass
+
+    def train(self):
+        return False
+
+def get_cmaes(separable):
+    return CMAES(5, 10, matrix([arange(1.0, 6.0)]), 0.5,\
+        separable = separable)
+
+def trajectory(separable, get_optimizer = get_cmaes):
+    """ mean and sigma of a seeded CMA-ES on the sphere """
+    seed(1)
+    optimizer = get_optimizer(separable)
+    sigmas = []
+    for generation in range(8):
+        while(not optimizer.tell_feasibility(\
+            [(s, True) for s in optimizer.ask_pending_solutions()])):
+            pass
+        optimizer.tell_fitness([(s, float((s.getA1() ** 2).sum()))\
+            for s in optimizer.ask_valid_solutions()])
+        sigmas.append(optimizer._sigma)
+    return optimizer._xmean.getA1(), sigmas
+
+def population_cmaes_trajectory_test():
+    # recorded with the per-individual sampling and updates before the
+    # populations were arrays; the samples scale with sigma, so the mean
+    # depends on its whole trajectory
+    xmean, sigmas = trajectory(False)
+    assert allclose(xmean, [0.423186515, 1.6794480628, 2.5235904467,\
+        3.7622749539, 4.7673909282])
+
+    xmean, sigmas = trajectory(True)
+    assert allclose(xmean, [0.5876946625, 1.5083386059, 1.6967948791,\
+        1.9257967479, 4.115053341])
+    assert allclose(sigmas, [0.4655793976, 0.449993686, 0.4276903643,\
+        0.3848253765, 0.4081790474, 0.4297503116, 0.6313700728,\
+        0.8168947523])
+
+def population_separable_svc_test():
+    # the SVC variants share the sampling and the separable update
+    for strategy in [CMAESRSVC, CMAESRRSVC]:
+        get_optimizer = lambda separable : strategy(5, 10,\
+            matrix([arange(1.0, 6.0)]), 0.5, 1.0, UntrainedMetaModel(),\
+            separable = separable)
+        assert allclose(trajectory(True, get_optimizer)[0],\
+            trajectory(True)[0])
+        assert allclose(trajectory(True, get_optimizer)[1],\
+            trajectory(True)[1])
+
+def population_lmmaes_transform_test():
+    # the rows transformed at once equal the product of the factors
+    # (1 - cd_j) I + cd_j m_j m_j^T with every row
+    seed(2)
+    optimizer = LMMAES(3, 6, matrix([zeros(4)]), 1.0, memory = 3)
+    optimizer._M = normal(0.0, 1.0, (3, 4))
+    optimizer._used = 3
+    z = normal(0.0, 1.0, (5, 4))
+
+    transformation = identity(4)
+    for m, c in zip(optimizer._M, optimizer._cd):
+        transformation = dot((1 - c) * identity(4) + c * outer(m, m),\
+            transformation)
+
+    d = optimizer._transform(z)
+    for row in range(5):
+        assert allclose(d[row], dot(transformation, z[row]))
+    assert allclose(optimizer._inverse_transform(d), z)
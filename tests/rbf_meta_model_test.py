@@ -0,0 +1,57 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from numpy import matrix
+from numpy.random import seed, normal
+from evopy.helper.population import Population
+from evopy.metamodel.cma_svc_rbf_meta_model import CMASVCRBFMetaModel
+from evopy.operators.scaling.scaling_standardscore import ScalingStandardscore
+from evopy.metamodel.cv.svc_cv_sklearn_grid_linear import SVCCVSkGridLinear
+
+from sklearn.cross_validation import KFold
+
+def rbf_meta_model_circle_test():
+    """ the feasible region outside of the unit circle is not linearly
+        separable, the budgeted RBF meta model learns it """
+
+    seed(0)
+    feasible = lambda X : (X ** 2).sum(axis = 1) >= 1.0
+    X = normal(0.0, 1.2, (400, 2))
+
+    sklearn_cv = SVCCVSkGridLinear(\
+        C_range = [2 ** i for i in range(-3, 14, 2)],
+        cv_method = KFold(100, 5))
+
+    meta_model = CMASVCRBFMetaModel(\
+        window_size = 50,
+        scaling = ScalingStandardscore(),
+        crossvalidation = sklearn_cv,
+        budget = 20)
+
+    meta_model.add_sorted_feasibles([matrix(x) for x in X[feasible(X)]])
+    for x in X[~feasible(X)][:50]:
+        meta_model.add_infeasible(matrix(x))
+
+    assert meta_model.train()
+    assert len(meta_model._landmarks) == 20
+
+    T = normal(0.0, 1.2, (1000, 2))
+    predictions = meta_model.check_feasibilities(Population(T))
+    assert (predictions == feasible(T)).mean() > 0.9
+    assert meta_model.check_feasibility(matrix(T[0])) == predictions[0]
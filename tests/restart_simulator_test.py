@@ -0,0 +1,63 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix
+from numpy.random import seed
+from evopy.strategies.cmaes import CMAES
+from evopy.problems.tr_problem import TRProblem
+from evopy.simulators.restart_simulator import RestartSimulator
+from evopy.operators.termination.generations import Generations
+
+def get_cmaes(lambd, sigma):
+    return CMAES(lambd / 2, lambd, matrix([[5.0, 5.0]]), sigma)
+
+def get_restarts(regime, workers, budget = 400):
+    return RestartSimulator(get_cmaes, TRProblem(), Generations(5),\
+        budget, 10, 1.0, regime = regime, workers = workers)
+
+def ipop_regimes_test():
+    restarts = get_restarts('ipop', 3)
+    assert restarts._regimes() == ['large', 'large', 'large']
+    lambds = [restarts._parameters('large') for i in range(3)]
+    assert lambds == [(10, 1.0), (20, 1.0), (40, 1.0)]
+
+def bipop_regimes_test():
+    seed(0)
+    restarts = get_restarts('bipop', 3)
+    assert restarts._regimes() == ['large', 'small', 'small']
+    restarts._evaluations = {'large' : 100, 'small' : 50}
+    assert restarts._regimes() == ['small', 'small', 'small']
+    restarts._large_lambd = 40
+    lambd, sigma = restarts._parameters('small')
+    assert 10 <= lambd < 20 and 1e-2 <= sigma <= 1.0
+    restarts._evaluations = {'large' : 100, 'small' : 100}
+    assert restarts._regimes() == ['large', 'small', 'small']
+
+def budget_test():
+    seed(0)
+    for regime, workers in [('ipop', 1), ('bipop', 1), ('ipop', 2)]:
+        restarts = get_restarts(regime, workers).simulate()
+        evaluations = [restarts._evaluations_of(simulator)\
+            for simulator in restarts.simulators]
+        assert sum(restarts._evaluations.values()) == sum(evaluations)
+        assert sum(evaluations) >= restarts.budget
+        assert len(restarts.simulators) > 1
+        if(regime == 'ipop'):
+            assert restarts._evaluations['small'] == 0
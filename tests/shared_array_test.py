@@ -0,0 +1,71 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import os
+from glob import glob
+from multiprocessing import Process
+from numpy import arange, asfortranarray, matrix, ndarray, float32, int64
+from numpy import complex128, all
+from evopy.external.playdoh.pool import getCustomPipe, dump_shared_array
+from evopy.external.playdoh.pool import get_segment_prefix
+from evopy.external.playdoh.pool import release_process_segments, SHMDIR
+
+def segments(pid = None):
+    return glob(os.path.join(SHMDIR, get_segment_prefix(pid) + '*'))
+
+def shared_array_round_trip_test():
+    parent, child = getCustomPipe(0)
+    arrays = [arange(20000, dtype = float32),\
+        arange(60000, dtype = int64).reshape(300, 200),\
+        asfortranarray(arange(30000.0).reshape(100, 300)),\
+        arange(9000, dtype = complex128).reshape(30, 10, 30),\
+        matrix(arange(40000.0).reshape(200, 200))]
+    # the same array twice is sent once
+    parent.send(arrays + [arrays[0]])
+    received = child.recv()
+
+    assert received[0] is received[-1]
+    for sent, array in zip(arrays, received):
+        assert type(array) == type(sent)
+        assert array.dtype == sent.dtype and array.shape == sent.shape
+        assert array.flags.f_contiguous == sent.flags.f_contiguous
+        assert all(array == sent)
+    # the receiver unlinked the files
+    assert segments() == []
+
+def shared_array_dropped_test():
+    parent, child = getCustomPipe(0)
+    parent.send(arange(20000.0))
+    assert len(segments()) == 1
+
+    # never received
+    parent.release()
+    assert segments() == []
+
+def dump():
+    dump_shared_array(arange(20000.0))
+
+def shared_array_exited_process_test():
+    process = Process(target = dump)
+    process.start()
+    process.join()
+    assert len(segments(process.pid)) == 1
+    assert release_process_segments([process.pid]) == 1
+    assert segments(process.pid) == []
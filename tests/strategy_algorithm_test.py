@@ -0,0 +1,56 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix, array, allclose
+from numpy.random import seed
+from evopy.external.playdoh import minimize
+from evopy.simulators.strategy_algorithm import StrategyAlgorithm
+from evopy.simulators.simulator import Simulator
+from evopy.strategies.cmaes import CMAES
+from evopy.problems.tr_problem import TRProblem
+from evopy.operators.termination.generations import Generations
+
+def fitness(x):
+    # the particles are the columns
+    return (x ** 2).sum(axis = 0)
+
+def get_cmaes():
+    return CMAES(5, 10, matrix([[5.0, 5.0]]), 1.0)
+
+def strategy_algorithm_test():
+    """ the strategy runs in playdoh as in a Simulator """
+
+    seed(0)
+    result = minimize(fitness, popsize = 10, maxiter = 20,\
+        algorithm = StrategyAlgorithm,\
+        optparams = {'strategy' : get_cmaes(), 'problem' : TRProblem()},\
+        initrange = array([[-10.0, 10.0], [-10.0, 10.0]]), cpu = 1,\
+        returninfo = True)
+
+    seed(0)
+    simulator = Simulator(get_cmaes(), TRProblem(), Generations(20))
+    best = min([simulator._generation() for generation in range(20)])
+
+    assert allclose(result.best_fit, best)
+    assert allclose(fitness(result.best_pos.reshape(2, 1)), best)
+    assert TRProblem().is_feasible(matrix(result.best_pos))
+    assert result.info['count_ffc'] == 200
+    assert result.info['count_cfc'] ==\
+        sum(simulator.logger.all()['count_cfc'])
@@ -0,0 +1,128 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+from numpy import matrix, ones, diag
+from evopy.helper.logger import Logger
+from evopy.strategies.cmaes import CMAES
+from evopy.operators.termination.tolx import TolX
+from evopy.operators.termination.tolfun import TolFun
+from evopy.operators.termination.condition_cov import ConditionCov
+from evopy.operators.termination.no_effect_axis import NoEffectAxis
+from evopy.operators.termination.no_effect_coord import NoEffectCoord
+from evopy.operators.termination.stagnation import Stagnation
+from evopy.operators.termination.evaluations import Evaluations
+
+class LoggedSimulator(object):
+    """ the logs a simulator keeps per generation, for the operators """
+
+    def __init__(self, optimizer = None):
+        self.optimizer = optimizer
+        self._count_ffc, self._count_cfc = 0, 0
+        self._median_fitness = None
+        self.logger = Logger(self)
+        self.logger.add_binding('_count_ffc', 'count_ffc')
+        self.logger.add_binding('_count_cfc', 'count_cfc')
+        self.logger.add_binding('_median_fitness', 'median_fitness')
+
+    def generation(self, ffc = 0, cfc = 0, median_fitness = None):
+        self._count_ffc, self._count_cfc = ffc, cfc
+        self._median_fitness = median_fitness
+        self.logger.log()
+
+def get_simulator(sigma = 1.0):
+    return LoggedSimulator(CMAES(2, 4, matrix([[1.0, 1.0, 1.0]]), sigma))
+
+def tolx_test():
+    assert not TolX(1e-10).terminate(0.0, 1, get_simulator(1.0))
+    assert TolX(1e-10).terminate(0.0, 1, get_simulator(1e-12))
+
+def tolfun_test():
+    condition = TolFun(1e-6, 3)
+    assert not any([condition.terminate(f, 1) for f in [3.0, 2.0, 1.0]])
+    assert not condition.terminate(1.0, 1)
+    assert condition.terminate(1.0, 1)
+
+def condition_cov_test():
+    simulator = get_simulator()
+    assert not ConditionCov(1e14).terminate(0.0, 1, simulator)
+    simulator.optimizer._D = [1.0, 1.0, 1e-8]
+    assert ConditionCov(1e14).terminate(0.0, 1, simulator)
+
+def no_effect_axis_test():
+    assert not NoEffectAxis().terminate(0.0, 1, get_simulator(1.0))
+    assert NoEffectAxis().terminate(0.0, 1, get_simulator(1e-20))
+
+def no_effect_coord_test():
+    simulator = get_simulator()
+    assert not NoEffectCoord().terminate(0.0, 1, simulator)
+    simulator.optimizer._C = diag([1.0, 1.0, 1e-40])
+    assert NoEffectCoord().terminate(0.0, 1, simulator)
+
+def stagnation_test():
+    simulator = LoggedSimulator()
+    condition = Stagnation(10)
+    for median_fitness in range(10, 0, -1):
+        simulator.generation(median_fitness = float(median_fitness))
+        assert not condition.terminate(0.0, 1, simulator)
+    for median_fitness in [10.0] * 5:
+        simulator.generation(median_fitness = median_fitness)
+    assert condition.terminate(0.0, 1, simulator)
+
+def evaluations_test():
+    simulator = LoggedSimulator()
+    condition = Evaluations(100)
+    for generation in range(4):
+        simulator.generation(ffc = 20, cfc = 4)
+        assert not condition.terminate(0.0, generation, simulator)
+    # the generations since the last call are counted as well
+    simulator.generation(ffc = 2, cfc = 1)
+    simulator.generation(ffc = 2, cfc = 0)
+    assert condition.terminate(0.0, 5, simulator)
+
+def shared_termination_test():
+    """ one termination instance for the simulators of a sweep """
+
+    first, second = LoggedSimulator(), LoggedSimulator()
+    evaluations, stagnation = Evaluations(100), Stagnation(10)
+    tolfun = TolFun(1e-6, 3)
+    for generation in range(12):
+        first.generation(ffc = 10, median_fitness = 1.0)
+        evaluations.terminate(0.0, generation, first)
+        stagnation.terminate(0.0, generation, first)
+        tolfun.terminate(1.0, generation, first)
+    assert evaluations.terminate(0.0, 12, first)
+    assert stagnation.terminate(0.0, 12, first)
+    assert tolfun.terminate(1.0, 12, first)
+
+    # the second run starts with its own budget and histories
+    for generation in range(9):
+        second.generation(ffc = 10, median_fitness = 10.0 - generation)
+        assert not evaluations.terminate(0.0, generation, second)
+        assert not stagnation.terminate(0.0, generation, second)
+    second.generation(ffc = 10, median_fitness = 1.0)
+    assert evaluations.terminate(0.0, 9, second)
+    assert not stagnation.terminate(0.0, 9, second)
+    assert not tolfun.terminate(2.0, 1, second)
+
+    # a new simulator at the address of a finished one
+    third = LoggedSimulator()
+    third.generation(ffc = 10, median_fitness = 1.0)
+    evaluations._states[id(third)] = (1000, 50)
+    assert not evaluations.terminate(0.0, 1, third)
@@ -0,0 +1,88 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+
+import os
+import ctypes
+# loads the BLAS library of NumPy
+import numpy
+from evopy.external.playdoh import USERPREF
+from evopy.external.playdoh.threadlimits import THREAD_VARIABLES,\
+    worker_threads, limit_threads, restore_threads, configure_worker,\
+    _loaded_libraries
+from evopy.simulators.executor import Executor
+
+def native_threads():
+    """ thread limits of the loaded BLAS/OpenMP libraries """
+    return [getattr(ctypes.CDLL(path), getter)()\
+        for path, setter, getter in _loaded_libraries()]
+
+def environment(item):
+    return [os.environ.get(variable) for variable in THREAD_VARIABLES]
+
+def worker_threads_test():
+    # the cores are split between the workers, one thread at least
+    assert worker_threads(4, cores = 8) == 2
+    assert worker_threads(3, cores = 8) == 2
+    assert worker_threads(16, cores = 8) == 1
+    assert worker_threads(0, cores = 8) == 8
+
+    # the user preference overrides the split
+    USERPREF['workerthreads'] = 3
+    try:
+        assert worker_threads(4, cores = 8) == 3
+    finally:
+        USERPREF['workerthreads'] = None
+
+def limit_threads_test():
+    before = dict([(variable, os.environ.get(variable))\
+        for variable in THREAD_VARIABLES])
+    libraries = native_threads()
+
+    previous = limit_threads(1)
+    try:
+        for variable in THREAD_VARIABLES:
+            assert os.environ[variable] == '1'
+        # the libraries loaded before are limited at runtime
+        assert native_threads() == [1] * len(libraries)
+    finally:
+        restore_threads(previous)
+
+    assert dict([(variable, os.environ.get(variable))\
+        for variable in THREAD_VARIABLES]) == before
+    assert native_threads() == libraries
+
+def configure_worker_test():
+    previous = limit_threads(2)
+    try:
+        assert configure_worker(0, 1, threads = 1, affinity = False) == 1
+        assert os.environ['OMP_NUM_THREADS'] == '1'
+        assert configure_worker(0, 1, affinity = False) ==\
+            worker_threads(1)
+    finally:
+        restore_threads(previous)
+
+def executor_thread_limits_test():
+    # the workers run with the limit, the process gets its own back
+    before = environment(None)
+    for mode in ['thread', 'fork']:
+        results = Executor(mode, workers = 2, threads = 1).map(environment,\
+            range(4))
+        assert results == [['1'] * len(THREAD_VARIABLES)] * 4
+        assert environment(None) == before
@@ -0,0 +1,69 @@
+''' 
+This file is part of evopy.
+
+Copyright 2012 - 2013, Jendrik Poloczek
+
+evopy is free software: you can redistribute it
+and/or modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+evopy is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+evopy.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import json
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+from cPickle import dumps, loads
+from evopy.helper.timer import Timer
+
+class Model(object):
+    def __init__(self, timer):
+        self.timer = timer
+
+    def train(self, x):
+        self.timer.start('crossvalidate')
+        self.timer.stop()
+        return x + 1
+
+def timer_nested_phases_test():
+    timer = Timer(trace = True)
+    model = Model(timer)
+    timer.instrument(model, ['train', 'predict'])
+
+    timer.start('tell_fitness')
+    assert model.train(1) == 2
+    assert model.train(2) == 3
+    timer.stop()
+    timer.log()
+
+    phases = timer.logger.all()['phase_seconds'][-1]
+    assert sorted(phases.keys()) == ['tell_fitness', 'tell_fitness;train',\
+        'tell_fitness;train;crossvalidate']
+    assert timer._calls['tell_fitness;train'] == 2
+    assert min(timer._self_seconds().values()) >= 0.0
+    assert not hasattr(model, 'predict')
+
+    # instrumented objects still pickle
+    assert loads(dumps(model, -1)).train(3) == 4
+
+    directory = mkdtemp()
+    try:
+        timer.write_folded(join(directory, 'phases.folded'))
+        lines = open(join(directory, 'phases.folded')).read().splitlines()
+        assert [l.split(' ')[0] for l in lines] == ['tell_fitness',\
+            'tell_fitness;train', 'tell_fitness;train;crossvalidate']
+
+        timer.write_chrome_trace(join(directory, 'trace.json'))
+        events = json.load(open(join(directory, 'trace.json')))['traceEvents']
+        assert len(events) == 5
+        assert all([e['ph'] == 'X' and e['dur'] >= 0 for e in events])
+    finally:
+        rmtree(directory)